@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import dataclasses
 import itertools
-from collections.abc import Callable, Iterator, Mapping, Sequence
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
 from contextlib import contextmanager
 from dataclasses import dataclass, field
 from enum import Enum, auto
@@ -13,13 +14,22 @@ from graphql import (
     GraphQLObjectType,
     GraphQLScalarType,
 )
-from sqlalchemy import Column, Select, Table
+from sqlalchemy import Column, ColumnElement, Select, Table
 from sqlalchemy.sql.type_api import TypeEngine
+from sqlalchemy.sql.visitors import iterate
 
+from sqlgraphql._limits import DEFAULT_MAX_DEPTH, RowLimits
 from sqlgraphql._transformers import FieldRules
 from sqlgraphql._utils import CacheDictCM
 from sqlgraphql.exceptions import GQLBuilderException, InvalidOperationException
-from sqlgraphql.model import Link, QueryableNode
+from sqlgraphql.model import (
+    BatchResolver,
+    Expression,
+    Link,
+    LinkHierarchy,
+    LinkStrategy,
+    QueryableNode,
+)
 
 
 @dataclass(slots=True, kw_only=True)
@@ -35,6 +45,8 @@ class AnalyzedField:
     orm_ordinal_position: int
     required: bool
     gql_name: str
+    # declared python type of computed field
+    python_type: type | None = None
     data: FieldData = field(default_factory=FieldData, compare=False)
 
     @property
@@ -46,11 +58,53 @@ class AnalyzedField:
 class JoinPoint:
     kind: Literal["0", "1", "n"]
     joins: Sequence[tuple[Column, Column]]
+    # association table of n..n relation, joins pair source columns with association table
+    # columns, through joins pair association table columns with remote columns
+    through: Table | None = None
+    through_joins: Sequence[tuple[Column, Column]] = ()
+    # custom join condition (instead of join pairs) and source columns it refers to
+    condition: ColumnElement[bool] | None = None
+    condition_columns: Sequence[Column] = ()
 
     def __post_init__(self) -> None:
-        if not self.joins:
+        if not self.joins and self.condition is None:
             raise ValueError("There should be at least one join pair")
 
+    @property
+    def source_columns(self) -> Sequence[Column]:
+        """
+        Columns of source records which determine linked records.
+        """
+        if self.condition is not None:
+            return self.condition_columns
+        return [left for left, _ in self.joins]
+
+    @property
+    def remote_columns(self) -> Sequence[Column]:
+        """
+        Columns of linked records (or of association table) which the join refers to.
+        """
+        if self.condition is not None:
+            return list(
+                dict.fromkeys(
+                    column
+                    for column in iterate(self.condition)
+                    if isinstance(column, Column) and column not in self.condition_columns
+                )
+            )
+        return [remote for _, remote in self.joins]
+
+    def join_through(self, query: Select) -> Select:
+        """
+        Joins association table (if any) to query of remote node.
+        """
+        if self.through is None:
+            return query
+        return query.join(
+            self.through,
+            sqlalchemy.and_(*(column == remote for column, remote in self.through_joins)),
+        )
+
 
 @dataclass(slots=True, kw_only=True)
 class LinkData:
@@ -69,6 +123,12 @@ class AnalyzedLink:
     node_accessor: Callable[[], AnalyzedNode]
     join: JoinPoint
     kind: LinkKind
+    pageable: bool = False
+    limits: RowLimits = RowLimits()
+    estimated_rows: int | None = None
+    strategy: LinkStrategy = LinkStrategy.JOIN
+    hierarchy: LinkHierarchy | None = None
+    max_depth: int | None = None
     data: LinkData = field(default_factory=LinkData, compare=False)
 
     @property
@@ -89,6 +149,8 @@ class AnalyzedNode:
     node: QueryableNode
     fields: Mapping[str, AnalyzedField]
     links: Mapping[str, AnalyzedLink]
+    # fields resolved in python, by GQL name
+    batch_fields: Mapping[str, BatchResolver] = field(default_factory=dict)
     data: NodeData = field(default_factory=NodeData, compare=False)
 
     def __hash__(self) -> int:
@@ -129,27 +191,60 @@ class Analyzer:
             )
 
         analyzed_links = {}
+        batch_fields = {}
         to_process = []
         for name, value in node.extra.items():
             if isinstance(value, QueryableNode):
-                analyzed_links[name] = self._create_link(node, name, value)
+                analyzed_links[name] = self._create_link(node, name, Link(value))
                 to_process.append(value)
             elif isinstance(value, Link):
-                analyzed_links[name] = self._create_link(node, name, value.node)
+                analyzed_links[name] = self._create_link(node, name, value)
                 to_process.append(value.node)
+            elif isinstance(value, Expression):
+                gql_field_name = field_name_converter(name)
+                if gql_field_name in analyzed_fields:
+                    raise GQLBuilderException(
+                        f"Member '{name}' in node '{node.name}' is already selected by query of"
+                        f" the node."
+                    )
+                analyzed_fields[gql_field_name] = AnalyzedField(
+                    orm_name=name,
+                    gql_name=gql_field_name,
+                    orm_field=value.expression.label(name),
+                    orm_ordinal_position=len(analyzed_fields),
+                    required=value.required,
+                    python_type=value.python_type,
+                )
+            elif isinstance(value, BatchResolver):
+                gql_field_name = field_name_converter(name)
+                if gql_field_name in analyzed_fields:
+                    raise GQLBuilderException(
+                        f"Member '{name}' in node '{node.name}' is already selected by query of"
+                        f" the node."
+                    )
+                try:
+                    # mapped attributes of ORM entities are resolved to their columns
+                    requires = [_get_column(column) for column in value.requires]
+                except InvalidOperationException as e:
+                    raise GQLBuilderException(
+                        f"Invalid required columns of member '{name}' in node '{node.name}':\n"
+                        f"  {e}"
+                    )
+                batch_fields[gql_field_name] = dataclasses.replace(value, requires=requires)
             else:
                 raise InvalidOperationException("Unsupported")
 
-        yield AnalyzedNode(node=node, fields=analyzed_fields, links=analyzed_links)
+        yield AnalyzedNode(
+            node=node, fields=analyzed_fields, links=analyzed_links, batch_fields=batch_fields
+        )
 
         for entry in to_process:
             self.get(entry)
 
-    def _create_link(
-        self, node: QueryableNode, name: str, remote_node: QueryableNode
-    ) -> AnalyzedLink:
+    @classmethod
+    def _get_implicit_join_point(cls, node: QueryableNode, name: str, link: Link) -> JoinPoint:
         try:
-            join_point = _get_implicit_relation(node.query, remote_node.query)
+            return _get_implicit_relation(node.query, link.node.query, link.through)
         except InvalidOperationException as e:
             raise GQLBuilderException(
                 f"Failed to determine implicit relation for member '{name}'"
@@ -158,6 +253,35 @@ class Analyzer:
                 f"Relationship should be specified explicitly."
             )
 
+    def _create_link(self, node: QueryableNode, name: str, link: Link) -> AnalyzedLink:
+        remote_node = link.node
+        if link.hierarchy is not None:
+            try:
+                join_point = _get_hierarchy_relation(node.query, remote_node.query, link)
+            except InvalidOperationException as e:
+                raise GQLBuilderException(
+                    f"Invalid hierarchy of member '{name}' in node '{node.name}':\n  {e}"
+                )
+        elif link.on is not None:
+            try:
+                join_point = _get_explicit_relation(node.query, remote_node.query, link)
+            except InvalidOperationException as e:
+                raise GQLBuilderException(
+                    f"Invalid relation of member '{name}' in node '{node.name}':\n  {e}"
+                )
+        elif link.max_depth is not None:
+            raise GQLBuilderException(
+                f"Member '{name}' in node '{node.name}' defines max depth, but it is not"
+                f" hierarchy link."
+            )
+        elif link.kind is not None:
+            raise GQLBuilderException(
+                f"Member '{name}' in node '{node.name}' defines kind of link, but its relation"
+                f" is not specified explicitly."
+            )
+        else:
+            join_point = self._get_implicit_join_point(node, name, link)
+
         match join_point.kind:
             case "0":
                 kind = LinkKind.SINGLE_OPTIONAL
@@ -185,18 +309,85 @@ class Analyzer:
             case _:
                 raise InvalidOperationException("Unknown kind")
 
+        if link.hierarchy is not None:
+            # all records reachable by the relation are linked, regardless of its direction
+            kind = LinkKind.MULTIPLE
+
+        if kind != LinkKind.MULTIPLE and (
+            link.pageable
+            or link.default_limit is not None
+            or link.max_rows is not None
+            or link.estimated_rows is not None
+        ):
+            raise GQLBuilderException(
+                f"Member '{name}' in node '{node.name}' defines list options, but it does not"
+                f" link to multiple records."
+            )
+
+        if kind == LinkKind.MULTIPLE and link.strategy != LinkStrategy.JOIN:
+            raise GQLBuilderException(
+                f"Member '{name}' in node '{node.name}' defines loading strategy, but it does"
+                f" not link to single record."
+            )
+
         return AnalyzedLink(
             gql_name=name,
             node_accessor=lambda: self._analyzed_nodes[remote_node],
             join=join_point,
             kind=kind,
+            pageable=link.pageable,
+            limits=RowLimits(link.default_limit, link.max_rows),
+            estimated_rows=(
+                link.estimated_rows
+                if link.estimated_rows is not None
+                else remote_node.estimated_rows
+            ),
+            strategy=link.strategy,
+            hierarchy=link.hierarchy,
+            max_depth=(
+                (link.max_depth if link.max_depth is not None else DEFAULT_MAX_DEPTH)
+                if link.hierarchy is not None
+                else None
+            ),
+        )
+
+
+def get_primary_key_fields(node: AnalyzedNode) -> Sequence[AnalyzedField]:
+    """
+    Returns fields of primary key columns of the single table node selects from.
+    """
+    tables = [from_ for from_ in node.node.query.get_final_froms() if isinstance(from_, Table)]
+    if len(tables) != 1:
+        raise GQLBuilderException(
+            f"Cannot determine primary key of node '{node.node.name}', it should select"
+            f" from single table."
         )
 
+    fields_by_column = {field.orm_field: field for field in node.fields.values()}
+    key_fields = []
+    for column in tables[0].primary_key.columns:
+        field = fields_by_column.get(column)
+        if field is None:
+            raise GQLBuilderException(
+                f"Primary key column '{column.name}' is not selected by node '{node.node.name}'."
+            )
+        key_fields.append(field)
+    return key_fields
+
 
-def _get_implicit_relation(source_query: Select, remote_query: Select) -> JoinPoint:
+def _get_implicit_relation(
+    source_query: Select, remote_query: Select, through: Table | None = None
+) -> JoinPoint:
     candidate: JoinPoint | None = None
 
-    for entry in _iterate_implicit_relations(source_query, remote_query):
+    if through is not None:
+        relations = _iterate_association_relations(source_query, remote_query, [through])
+    elif any(_iterate_implicit_relations(source_query, remote_query)):
+        relations = _iterate_implicit_relations(source_query, remote_query)
+    else:
+        relations = _iterate_association_relations(source_query, remote_query)
+
+    for entry in relations:
         if candidate is not None:
             raise InvalidOperationException(
                 "Expected single candidate relationship, found more than one."
@@ -209,27 +400,25 @@ def _get_implicit_relation(source_query: Select, remote_query: Select) -> JoinPo
     return candidate
 
 
+def _iterate_tables(query: Select) -> Iterator[Table]:
+    return (from_ for from_ in query.get_final_froms() if isinstance(from_, Table))
+
+
 def _iterate_implicit_relations(source_query: Select, remote_query: Select) -> Iterator[JoinPoint]:
-    source_iter = (
-        source_from
-        for source_from in source_query.get_final_froms()
-        if isinstance(source_from, Table)
-    )
-    remote_iter = (
-        remote_from
-        for remote_from in remote_query.get_final_froms()
-        if isinstance(remote_from, Table)
-    )
-    for source_from, remote_from in itertools.product(source_iter, remote_iter):
+    for source_from, remote_from in itertools.product(
+        _iterate_tables(source_query), _iterate_tables(remote_query)
+    ):
         for fk in source_from.foreign_key_constraints:
             if fk.referred_table is not remote_from:
                 continue
 
             is_optional = any(column.nullable for column in fk.columns)
 
+            # columns are paired by constraint, since referenced columns do not have to be
+            # in order of primary key (or be primary key at all)
             yield JoinPoint(
                 kind="0" if is_optional else "1",
-                joins=tuple(zip(fk.columns, remote_from.primary_key.columns)),
+                joins=tuple((element.parent, element.column) for element in fk.elements),
             )
 
         for fk in remote_from.foreign_key_constraints:
@@ -237,5 +426,145 @@ def _iterate_implicit_relations(source_query: Select, remote_query: Select) -> I
                 continue
 
             yield JoinPoint(
-                kind="n", joins=tuple(zip(source_from.primary_key.columns, fk.columns))
+                kind="n", joins=tuple((element.column, element.parent) for element in fk.elements)
             )
+
+
+def _iterate_association_relations(
+    source_query: Select, remote_query: Select, tables: Iterable[Table] | None = None
+) -> Iterator[JoinPoint]:
+    """
+    Iterates n..n relations via association tables (tables of the same metadata as source
+    table, if not passed) with single foreign key to each of the tables.
+    """
+    for source_from, remote_from in itertools.product(
+        _iterate_tables(source_query), _iterate_tables(remote_query)
+    ):
+        for table in tables if tables is not None else source_from.metadata.tables.values():
+            if table is source_from or table is remote_from:
+                continue
+            source_fks = [
+                fk for fk in table.foreign_key_constraints if fk.referred_table is source_from
+            ]
+            remote_fks = [
+                fk for fk in table.foreign_key_constraints if fk.referred_table is remote_from
+            ]
+            # association of table with itself is ambiguous, both keys refer to the same table
+            if len(source_fks) != 1 or len(remote_fks) != 1 or source_fks[0] is remote_fks[0]:
+                continue
+
+            yield JoinPoint(
+                kind="n",
+                joins=tuple(
+                    (element.column, element.parent) for element in source_fks[0].elements
+                ),
+                through=table,
+                through_joins=tuple(
+                    (element.parent, element.column) for element in remote_fks[0].elements
+                ),
+            )
+
+
+def _get_hierarchy_relation(source_query: Select, remote_query: Select, link: Link) -> JoinPoint:
+    if link.through is not None or link.kind is not None:
+        raise InvalidOperationException(
+            "Hierarchy cannot be combined with association table or kind of link."
+        )
+    if link.pageable:
+        raise InvalidOperationException("Hierarchy link cannot be pageable.")
+    if link.max_depth is not None and link.max_depth <= 0:
+        raise InvalidOperationException("Max depth should be at least 1.")
+
+    if link.on is None:
+        # table refers to itself in both directions, direction is chosen by hierarchy
+        descendants = link.hierarchy == LinkHierarchy.DESCENDANTS
+        candidates = [
+            entry
+            for entry in _iterate_implicit_relations(source_query, remote_query)
+            if _is_self_referencing(entry) and (entry.kind == "n") == descendants
+        ]
+        if len(candidates) != 1:
+            raise InvalidOperationException(
+                f"Expected single self-referencing relationship, found {len(candidates)}."
+            )
+        join_point = candidates[0]
+    elif isinstance(link.on, sqlalchemy.ColumnElement):
+        raise InvalidOperationException("Hierarchy has to be defined by join pairs.")
+    else:
+        join_point = _get_explicit_relation(source_query, remote_query, link)
+        if not _is_self_referencing(join_point):
+            raise InvalidOperationException("Join pairs should be columns of the same table.")
+
+    table = join_point.joins[0][0].table
+    if not isinstance(table, Table) or not table.primary_key:
+        raise InvalidOperationException(f"Table '{table}' should have primary key.")
+    return join_point
+
+
+def _is_self_referencing(join_point: JoinPoint) -> bool:
+    return len({column.table for pair in join_point.joins for column in pair}) == 1
+
+
+def _get_column(column: Column) -> Column:
+    expression = column.expression
+    if not isinstance(expression, Column):
+        raise InvalidOperationException(f"Expression '{column}' is not a table column.")
+    return expression
+
+
+def _get_explicit_relation(source_query: Select, remote_query: Select, link: Link) -> JoinPoint:
+    if link.through is not None:
+        raise InvalidOperationException(
+            "Association table cannot be combined with explicit join condition."
+        )
+
+    source_tables = set(_iterate_tables(source_query))
+    remote_tables = set(_iterate_tables(remote_query))
+    on = link.on
+    if isinstance(on, sqlalchemy.ColumnElement):
+        if link.kind is None:
+            raise InvalidOperationException("Kind of link with join condition has to be set.")
+        if source_tables & remote_tables:
+            raise InvalidOperationException(
+                "Join condition cannot be used if the nodes select from the same table."
+            )
+        condition_columns = list(
+            dict.fromkeys(
+                element
+                for element in iterate(on)
+                if isinstance(element, Column) and element.table in source_tables
+            )
+        )
+        if not condition_columns:
+            raise InvalidOperationException("Join condition does not refer to source columns.")
+        return JoinPoint(
+            kind="0" if link.kind == "single" else "n",
+            joins=(),
+            condition=on,
+            condition_columns=condition_columns,
+        )
+
+    assert on is not None
+    if not on:
+        raise InvalidOperationException("There should be at least one join pair.")
+    # mapped attributes of ORM entities are resolved to their columns
+    on = [(_get_column(source), _get_column(remote)) for source, remote in on]
+    for source, remote in on:
+        if source.table not in source_tables or remote.table not in remote_tables:
+            raise InvalidOperationException(
+                f"Columns '{source}' and '{remote}' are not columns of source and remote node."
+            )
+
+    kind = link.kind
+    if kind is None:
+        # link is single if each source record can match at most one remote record
+        remote_columns = {remote for _, remote in on}
+        kind = (
+            "single"
+            if any(
+                table.primary_key and set(table.primary_key.columns) <= remote_columns
+                for table in remote_tables
+            )
+            else "multiple"
+        )
+    return JoinPoint(kind="0" if kind == "single" else "n", joins=tuple(on))
@@ -1,5 +1,5 @@
 import math
-from collections.abc import Callable, Iterable
+from collections.abc import Callable, Iterable, Sequence
 from dataclasses import InitVar, dataclass, field
 from functools import cached_property
 from typing import Any
@@ -15,14 +15,20 @@ from graphql import (
 )
 
 from sqlgraphql._ast import AnalyzedNode
+from sqlgraphql._cost import ListCardinality, build_cost_extensions
 from sqlgraphql._gql import TypeMap
+from sqlgraphql._limits import DEFAULT_PAGE_SIZE, RowLimits
 from sqlgraphql._resolvers import FieldResolver
-from sqlgraphql._transformers import QueryBuilder, QueryExecutor
+from sqlgraphql._transformers import (
+    ApplyBatchedLinkRule,
+    QueryBuilder,
+    QueryExecutor,
+    RecordBatch,
+    get_link_key,
+)
 from sqlgraphql._utils import CacheDict
 from sqlgraphql.types import TypedResolveContext
 
-DEFAULT_PAGE_SIZE = 50
-
 
 class OffsetPagedArgumentBuilder:
     _TYPE_SUFFIX = "PagedObject"
@@ -55,15 +61,39 @@ class OffsetPagedArgumentBuilder:
         node: AnalyzedNode,
         args: dict[str, GraphQLArgument],
         transformer: QueryBuilder,
+        limits: RowLimits = RowLimits(),
+    ) -> GraphQLField:
+        paged_accessor_object = self._cache[node]
+
+        return GraphQLField(
+            GraphQLNonNull(paged_accessor_object),
+            {**args, "page": GraphQLArgument(GraphQLInt), "pageSize": GraphQLArgument(GraphQLInt)},
+            resolve=PagedListResolver(transformer, limits),
+            extensions=self._build_extensions(node.node.estimated_rows, limits),
+        )
+
+    def build_paged_link_field(
+        self,
+        node: AnalyzedNode,
+        args: dict[str, GraphQLArgument],
+        transformer: QueryBuilder,
+        link_rule: ApplyBatchedLinkRule,
+        limits: RowLimits = RowLimits(),
+        estimated_rows: int | None = None,
     ) -> GraphQLField:
         paged_accessor_object = self._cache[node]
 
         return GraphQLField(
             GraphQLNonNull(paged_accessor_object),
             {**args, "page": GraphQLArgument(GraphQLInt), "pageSize": GraphQLArgument(GraphQLInt)},
-            resolve=PagedListResolver(transformer, DEFAULT_PAGE_SIZE),
+            resolve=PagedLinkResolver(transformer, link_rule, limits),
+            extensions=self._build_extensions(estimated_rows, limits),
         )
 
+    @classmethod
+    def _build_extensions(cls, estimated_rows: int | None, limits: RowLimits) -> dict[str, Any]:
+        return build_cost_extensions(ListCardinality(estimated_rows, limits, "nodes"))
+
     def _construct_offset_paged_accessor_object(self, node: AnalyzedNode) -> GraphQLObjectType:
         gql_type = node.data.gql_type
         assert gql_type is not None
@@ -107,33 +137,136 @@ class OffsetPageInfo:
 
 
 class OffsetPagedResult:
-    def __init__(self, query: QueryExecutor, page: int, page_size: int):
-        self._query = query
+    def __init__(
+        self,
+        get_nodes: Callable[[], Iterable],
+        get_total_count: Callable[[], int],
+        page: int,
+        page_size: int,
+    ):
+        self._get_nodes = get_nodes
+        self._get_total_count = get_total_count
         self._page = page
         self._page_size = page_size
 
+    @classmethod
+    def from_query(cls, query: QueryExecutor, page: int, page_size: int) -> "OffsetPagedResult":
+        return cls(
+            lambda: query.execute_with_pagination(page, page_size),
+            query.record_count,
+            page,
+            page_size,
+        )
+
     @cached_property
-    def nodes(self) -> Iterable:
-        return self._query.execute_with_pagination(self._page, self._page_size)
+    def nodes(self) -> list:
+        # nodes are materialized, since they may be resolved by several aliases
+        return list(self._get_nodes())
 
     @cached_property
     def page_info(self) -> OffsetPageInfo:
-        return OffsetPageInfo(self._query.record_count, self._page, self._page_size)
+        return OffsetPageInfo(self._get_total_count, self._page, self._page_size)
+
+
+class _PartitionedPages:
+    """
+    Pages of linked records for all parents in the batch, loaded with a single windowed query.
+    Counts are loaded lazily with a single grouped query.
+    """
+
+    def __init__(
+        self,
+        query: QueryExecutor | None,
+        partition_by: Sequence[str],
+        page: int,
+        page_size: int,
+    ):
+        self._query = query
+        self._partition_by = partition_by
+        self._page = page
+        self._page_size = page_size
+
+    def get_result(self, key: tuple | None) -> OffsetPagedResult:
+        return OffsetPagedResult(
+            lambda: self._nodes.get(key, []) if key else [],
+            lambda: self._counts.get(key, 0) if key else 0,
+            self._page,
+            self._page_size,
+        )
+
+    @cached_property
+    def _nodes(self) -> dict[tuple, list]:
+        nodes: dict[tuple, list] = {}
+        if self._query is None:
+            return nodes
+
+        for record in self._query.execute_with_partitioned_pagination(
+            self._partition_by, self._page, self._page_size
+        ):
+            key = tuple(record[name] for name in self._partition_by)
+            nodes.setdefault(key, []).append(record)
+        return nodes
+
+    @cached_property
+    def _counts(self) -> dict[tuple, int]:
+        if self._query is None:
+            return {}
+        return self._query.partitioned_record_count(self._partition_by)
+
+
+def _get_page_size(limits: RowLimits, kwargs: dict[str, Any]) -> int:
+    page_size = limits.resolve(kwargs.get("pageSize"), DEFAULT_PAGE_SIZE)
+    assert page_size is not None
+    return page_size
 
 
 class PagedListResolver:
-    __slots__ = ("_transformer", "_default_page_size")
+    __slots__ = ("_transformer", "_limits")
 
-    def __init__(self, transformer: QueryBuilder, default_page_size: int):
+    def __init__(self, transformer: QueryBuilder, limits: RowLimits):
         self._transformer = transformer
-        self._default_page_size = default_page_size
+        self._limits = limits
 
     def __call__(
         self, parent: object | None, info: GraphQLResolveInfo, **kwargs: Any
     ) -> OffsetPagedResult:
+        page = kwargs.get("page", 0)
+        page_size = _get_page_size(self._limits, kwargs)
+
         context: TypedResolveContext = info.context
         query = self._transformer.build(parent, info, kwargs, context["db_session"], ["nodes"])
+        return OffsetPagedResult.from_query(query, page, page_size)
+
+
+class PagedLinkResolver:
+    __slots__ = ("_transformer", "_link_rule", "_limits")
+
+    def __init__(
+        self, transformer: QueryBuilder, link_rule: ApplyBatchedLinkRule, limits: RowLimits
+    ):
+        self._transformer = transformer
+        self._link_rule = link_rule
+        self._limits = limits
+
+    def __call__(
+        self, parent: object, info: GraphQLResolveInfo, **kwargs: Any
+    ) -> OffsetPagedResult:
+        pages = RecordBatch.of(parent).load(
+            (self, info.path.key), lambda records: self._load_pages(records, info, kwargs)
+        )
+        return pages.get_result(get_link_key(parent, self._link_rule.join))
 
+    def _load_pages(
+        self, parents: Sequence[object], info: GraphQLResolveInfo, kwargs: dict[str, Any]
+    ) -> _PartitionedPages:
         page = kwargs.get("page", 0)
-        page_size = kwargs.get("pageSize", self._default_page_size)
-        return OffsetPagedResult(query, page, page_size)
+        page_size = _get_page_size(self._limits, kwargs)
+
+        query: QueryExecutor | None = None
+        if any(get_link_key(parent, self._link_rule.join) for parent in parents):
+            context: TypedResolveContext = info.context
+            query = self._transformer.build(
+                parents, info, kwargs, context["db_session"], ["nodes"]
+            )
+
+        return _PartitionedPages(query, self._link_rule.key_labels, page, page_size)
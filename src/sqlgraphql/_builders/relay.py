@@ -0,0 +1,204 @@
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from graphql import (
+    GraphQLArgument,
+    GraphQLError,
+    GraphQLField,
+    GraphQLID,
+    GraphQLInterfaceType,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLResolveInfo,
+)
+from sqlalchemy import Column
+
+from sqlgraphql._ast import AnalyzedNode, get_primary_key_fields
+from sqlgraphql._gql import TypeMap
+from sqlgraphql._resolvers import coerce_key, load_by_keys
+from sqlgraphql._transformers import (
+    ApplyKeyLookupRule,
+    ApplyLinkRule,
+    LinkDataRule,
+    QueryBuilder,
+    Record,
+)
+from sqlgraphql.cache import ResultCache
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.relay import from_global_id, to_global_id
+
+_TYPE_NAME_KEY = "__node_type"
+
+
+@dataclass(frozen=True, slots=True)
+class _GlobalNode:
+    gql_type: GraphQLObjectType
+    transformer: QueryBuilder
+    lookup_rule: ApplyKeyLookupRule
+    key_types: Sequence[type | None]
+
+
+class NodeInterfaceBuilder:
+    """
+    Builds Relay Node interface (implemented by nodes with global ID) and root fields which
+    resolve nodes by their global IDs.
+    """
+
+    def __init__(
+        self,
+        type_map: TypeMap,
+        id_field: str,
+        result_cache: ResultCache | None,
+        identity_map: bool = False,
+    ):
+        self._type_map = type_map
+        self._id_field = id_field
+        self._result_cache = result_cache
+        self._identity_map = identity_map
+        self._interface: GraphQLInterfaceType | None = None
+        self._nodes: dict[str, _GlobalNode] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._nodes)
+
+    @property
+    def id_field(self) -> str:
+        return self._id_field
+
+    @property
+    def interface(self) -> GraphQLInterfaceType:
+        if self._interface is None:
+            self._interface = self._type_map.add(
+                GraphQLInterfaceType(
+                    "Node",
+                    {self._id_field: GraphQLField(GraphQLNonNull(GraphQLID))},
+                    resolve_type=_resolve_type,
+                )
+            )
+        return self._interface
+
+    def build_id_field(
+        self, node: AnalyzedNode, type_name: str
+    ) -> tuple[GraphQLField, LinkDataRule]:
+        if self._id_field in node.fields or self._id_field in node.links:
+            raise GQLBuilderException(
+                f"Member '{self._id_field}' in node '{node.node.name}' conflicts with global ID"
+                f" field of Node interface. Rename the member or global ID field."
+            )
+
+        key_columns = []
+        for field in get_primary_key_fields(node):
+            assert isinstance(field.orm_field, Column)
+            key_columns.append(field.orm_field)
+
+        return (
+            GraphQLField(
+                GraphQLNonNull(GraphQLID),
+                resolve=GlobalIdResolver(
+                    type_name, [f"__{column.name}" for column in key_columns]
+                ),
+            ),
+            LinkDataRule(selectables=key_columns),
+        )
+
+    def register(self, node: AnalyzedNode, gql_type: GraphQLObjectType) -> None:
+        key_fields = get_primary_key_fields(node)
+        lookup_rule = ApplyKeyLookupRule([field.orm_field for field in key_fields])
+        self._nodes[gql_type.name] = _GlobalNode(
+            gql_type,
+            QueryBuilder.create(node, [lookup_rule], self._result_cache, self._identity_map),
+            lookup_rule,
+            [field.data.python_type for field in key_fields],
+        )
+
+    def build_root_fields(self) -> dict[str, GraphQLField]:
+        return {
+            "node": GraphQLField(
+                self.interface,
+                args={"id": GraphQLArgument(GraphQLNonNull(GraphQLID))},
+                resolve=NodeResolver(self._nodes),
+            ),
+            "nodes": GraphQLField(
+                GraphQLNonNull(GraphQLList(self.interface)),
+                args={
+                    "ids": GraphQLArgument(GraphQLNonNull(GraphQLList(GraphQLNonNull(GraphQLID))))
+                },
+                resolve=NodesResolver(self._nodes),
+            ),
+        }
+
+
+def _resolve_type(value: Record, info: GraphQLResolveInfo, abstract_type: Any) -> str:
+    return value[_TYPE_NAME_KEY]
+
+
+def _load_nodes(
+    nodes: Mapping[str, _GlobalNode], global_ids: Sequence[str], info: GraphQLResolveInfo
+) -> list[Record | None]:
+    """
+    Loads nodes by global IDs, nodes of the same type are loaded by single query.
+    """
+    requested: list[tuple[str, tuple] | None] = []
+    groups: dict[str, dict[tuple, None]] = {}
+    for global_id in global_ids:
+        try:
+            type_name, values = from_global_id(global_id)
+            node = nodes.get(type_name)
+            key = coerce_key(values, node.key_types) if node is not None else None
+        except (ValueError, TypeError, AttributeError):
+            raise GraphQLError(f"Invalid global ID '{global_id}'.")
+
+        if key is None:
+            # not a type implementing node
+            requested.append(None)
+        else:
+            requested.append((type_name, key))
+            groups.setdefault(type_name, {})[key] = None
+
+    loaded = {}
+    for type_name, keys in groups.items():
+        node = nodes[type_name]
+        records = load_by_keys(node.transformer, node.lookup_rule, list(keys), info, node.gql_type)
+        for key, value in records.items():
+            record = value if isinstance(value, Record) else Record.from_row(value)
+            record[_TYPE_NAME_KEY] = type_name
+            loaded[(type_name, key)] = record
+
+    return [loaded.get(entry) if entry is not None else None for entry in requested]
+
+
+class GlobalIdResolver:
+    __slots__ = ("_type_name", "_key_labels")
+
+    def __init__(self, type_name: str, key_labels: Sequence[str]):
+        self._type_name = type_name
+        self._key_labels = key_labels
+
+    def __call__(self, parent: Any, info: GraphQLResolveInfo) -> str:
+        accessor = ApplyLinkRule._get_accessor(parent)
+        return to_global_id(self._type_name, [accessor(label) for label in self._key_labels])
+
+
+class NodeResolver:
+    __slots__ = ("_nodes",)
+
+    def __init__(self, nodes: Mapping[str, _GlobalNode]):
+        self._nodes = nodes
+
+    def __call__(self, parent: object | None, info: GraphQLResolveInfo, id: str) -> Record | None:
+        return _load_nodes(self._nodes, [id], info)[0]
+
+
+class NodesResolver:
+    __slots__ = ("_nodes",)
+
+    def __init__(self, nodes: Mapping[str, _GlobalNode]):
+        self._nodes = nodes
+
+    def __call__(
+        self, parent: object | None, info: GraphQLResolveInfo, ids: Sequence[str]
+    ) -> list[Record | None]:
+        return _load_nodes(self._nodes, ids, info)
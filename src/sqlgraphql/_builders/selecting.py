@@ -1,32 +1,53 @@
 import enum
-from collections.abc import Iterator, Mapping
+from collections.abc import Iterator, Mapping, Sequence
 from contextlib import contextmanager
 
 from graphql import (
+    GraphQLArgument,
     GraphQLEnumType,
     GraphQLField,
+    GraphQLInt,
     GraphQLList,
     GraphQLNonNull,
     GraphQLObjectType,
     GraphQLScalarType,
     ThunkMapping,
 )
+from sqlalchemy import Column
 
 from sqlgraphql._ast import AnalyzedField, AnalyzedLink, AnalyzedNode, LinkKind
 from sqlgraphql._builders.enum import EnumBuilder
+from sqlgraphql._builders.pagination import OffsetPagedArgumentBuilder
+from sqlgraphql._builders.relay import NodeInterfaceBuilder
+from sqlgraphql._cost import ListCardinality, build_cost_extensions
 from sqlgraphql._gql import ScalarTypeRegistry, TypeMap
+from sqlgraphql._limits import RowLimits
 from sqlgraphql._orm import TypeRegistry
-from sqlgraphql._resolvers import DbFieldResolver, ListResolver
+from sqlgraphql._resident import ResidentLinkResolver, ResidentTable
+from sqlgraphql._resolvers import (
+    BatchedListResolver,
+    BatchedObjectResolver,
+    BatchFieldResolver,
+    DbFieldResolver,
+    InlineObjectResolver,
+    ListResolver,
+)
 from sqlgraphql._transformers import (
+    AdaptiveObjectRule,
+    ApplyBatchedLinkRule,
+    ApplyHierarchyLinkRule,
     ApplyLinkRule,
     ColumnSelectRule,
     FieldRules,
     InlineObjectRule,
     LinkDataRule,
+    LinkStatistics,
     QueryBuilder,
 )
-from sqlgraphql._utils import assert_not_none
-from sqlgraphql.exceptions import InvalidOperationException
+from sqlgraphql._utils import CacheDict, assert_not_none
+from sqlgraphql.cache import ResultCache
+from sqlgraphql.exceptions import GQLBuilderException, InvalidOperationException
+from sqlgraphql.model import LinkStrategy
 
 
 class ObjectBuilder:
@@ -36,11 +57,24 @@ class ObjectBuilder:
         enum_builder: EnumBuilder,
         orm_type_registry: TypeRegistry,
         gql_type_registry: ScalarTypeRegistry,
+        offset_paged_builder: OffsetPagedArgumentBuilder,
+        row_limits: RowLimits,
+        node_interface_builder: NodeInterfaceBuilder,
+        result_cache: ResultCache | None = None,
+        identity_map: bool = False,
     ):
         self._type_map = type_map
         self._enum_builder = enum_builder
         self._orm_type_registry = orm_type_registry
         self._gql_type_registry = gql_type_registry
+        self._offset_paged_builder = offset_paged_builder
+        self._row_limits = row_limits
+        self._node_interface_builder = node_interface_builder
+        self._result_cache = result_cache
+        self._identity_map = identity_map
+        self._resident_tables = CacheDict[tuple[AnalyzedNode, Sequence[Column]], ResidentTable](
+            self._create_resident_table
+        )
 
     def build_object(self, node: AnalyzedNode) -> GraphQLObjectType:
         data = node.data
@@ -53,27 +87,67 @@ class ObjectBuilder:
     def _build_gql_object(
         self, node: AnalyzedNode
     ) -> Iterator[tuple[GraphQLObjectType, dict[str, FieldRules]]]:
+        type_name = self._type_map.get_unique_name(node.node.name)
+        implements_node = node.node.implements_node
         fields = {}
         rules: dict[str, FieldRules] = {}
 
+        if implements_node:
+            id_field = self._node_interface_builder.id_field
+            fields[id_field], rules[id_field] = self._node_interface_builder.build_id_field(
+                node, type_name
+            )
+
         for entry in node.fields.values():
             gql_type = self._convert_to_gql_type(entry)
             fields[entry.gql_name] = GraphQLField(
                 GraphQLNonNull(gql_type) if entry.required else gql_type,
-                resolve=DbFieldResolver(entry.gql_name),
+                resolve=DbFieldResolver(),
             )
             rules[entry.gql_name] = ColumnSelectRule(entry.orm_field, entry.orm_ordinal_position)
 
+        for gql_name, batch_field in node.batch_fields.items():
+            scalar_type = self._gql_type_registry.get_scalar_type(batch_field.python_type)
+            fields[gql_name] = GraphQLField(
+                GraphQLNonNull(scalar_type) if batch_field.required else scalar_type,
+                resolve=BatchFieldResolver(batch_field.function, batch_field.requires),
+            )
+            # required columns are selected as link data, so that records are batched
+            rules[gql_name] = LinkDataRule(selectables=batch_field.requires)
+
+        if node.node.memory_resident is not None:
+            self._validate_resident_node(node)
+
         if node.links:
             # we need to process all children
             linked_nodes = [link.node for link in node.links.values()]
             links = [link for link in node.links.values()]
             link_resolvers = {}
+            object_resolvers: dict[str, ResidentLinkResolver | BatchedObjectResolver] = {}
 
             for link in node.links.values():
                 match link.kind:
+                    case LinkKind.SINGLE_OPTIONAL | LinkKind.SINGLE_REQUIRED if (
+                        link.node.node.memory_resident is not None and link.join.condition is None
+                    ):
+                        rules[link.gql_name] = LinkDataRule(selectables=link.join.source_columns)
+                        object_resolvers[link.gql_name] = ResidentLinkResolver(
+                            self._resident_tables[
+                                (link.node, tuple(right for _, right in link.join.joins))
+                            ],
+                            link.join,
+                        )
+                    case LinkKind.SINGLE_OPTIONAL | LinkKind.SINGLE_REQUIRED if (
+                        link.strategy != LinkStrategy.JOIN
+                    ):
+                        (
+                            rules[link.gql_name],
+                            object_resolvers[link.gql_name],
+                        ) = self._create_batched_link(node, link)
                     case LinkKind.SINGLE_OPTIONAL | LinkKind.SINGLE_REQUIRED:
-                        rules[link.gql_name] = InlineObjectRule.create(link.node, link.join)
+                        rules[link.gql_name] = InlineObjectRule.create(
+                            link.node, link.join, link.kind == LinkKind.SINGLE_REQUIRED
+                        )
                     case LinkKind.MULTIPLE:
                         runtime_link, link_resolver = self._create_runtime_link(link)
                         rules[link.gql_name] = runtime_link
@@ -87,19 +161,47 @@ class ObjectBuilder:
                     gql_type: GraphQLObjectType | GraphQLNonNull | GraphQLList = assert_not_none(
                         link.node.data.gql_type
                     )
-                    if link.kind == LinkKind.SINGLE_REQUIRED:
-                        gql_field = GraphQLField(GraphQLNonNull(gql_type))
+                    if link.gql_name in object_resolvers:
+                        gql_field = GraphQLField(
+                            GraphQLNonNull(gql_type)
+                            if link.kind == LinkKind.SINGLE_REQUIRED
+                            else gql_type,
+                            resolve=object_resolvers[link.gql_name],
+                        )
+                    elif link.kind == LinkKind.SINGLE_REQUIRED:
+                        gql_field = GraphQLField(
+                            GraphQLNonNull(gql_type), resolve=InlineObjectResolver()
+                        )
+                    elif link.kind == LinkKind.MULTIPLE and link.pageable:
+                        link_rule = ApplyBatchedLinkRule(link.join)
+                        gql_field = self._offset_paged_builder.build_paged_link_field(
+                            link.node,
+                            {},
+                            QueryBuilder.create(
+                                link.node, [link_rule], self._result_cache, self._identity_map
+                            ),
+                            link_rule,
+                            self._get_link_limits(link),
+                            link.estimated_rows,
+                        )
                     elif link.kind == LinkKind.MULTIPLE:
+                        limits = self._get_link_limits(link)
+                        args = self.build_limit_args(limits)
+                        if link.hierarchy is not None:
+                            args["depth"] = GraphQLArgument(GraphQLInt)
                         gql_field = GraphQLField(
                             GraphQLList(GraphQLNonNull(gql_type)),
-                            # TODO: allow other strategies (such as paginations,
-                            #       anchored filters, etc)
-                            resolve=ListResolver(
-                                QueryBuilder.create(link.node, [link_resolvers[link.gql_name]])
+                            args=args,
+                            # TODO: allow other strategies (such as anchored filters, etc)
+                            resolve=self._create_list_resolver(
+                                link, link_resolvers[link.gql_name], limits
+                            ),
+                            extensions=build_cost_extensions(
+                                ListCardinality(link.estimated_rows, limits)
                             ),
                         )
                     else:
-                        gql_field = GraphQLField(gql_type)
+                        gql_field = GraphQLField(gql_type, resolve=InlineObjectResolver())
                     fields[link.gql_name] = gql_field
 
                 return fields
@@ -109,15 +211,17 @@ class ObjectBuilder:
             field_arg = fields
             linked_nodes = []
 
-        yield (
-            self._type_map.add(
-                GraphQLObjectType(
-                    self._type_map.get_unique_name(node.node.name),
-                    field_arg,
-                )
-            ),
-            rules,
+        object_type = self._type_map.add(
+            GraphQLObjectType(
+                type_name,
+                field_arg,
+                interfaces=[self._node_interface_builder.interface] if implements_node else None,
+            )
         )
+        if implements_node:
+            self._node_interface_builder.register(node, object_type)
+
+        yield object_type, rules
 
         for node in linked_nodes:
             self.build_object(node)
@@ -135,12 +239,85 @@ class ObjectBuilder:
             return enum_type
 
         # Treat as scalar
-        data.python_type = python_type = self._orm_type_registry.get_python_type(field.orm_type)
+        data.python_type = python_type = (
+            field.python_type
+            if field.python_type is not None
+            else self._orm_type_registry.get_python_type(field.orm_type)
+        )
         data.gql_type = self._gql_type_registry.get_scalar_type(python_type)
         return data.gql_type
 
     @classmethod
-    def _create_runtime_link(cls, link: AnalyzedLink) -> tuple[LinkDataRule, ApplyLinkRule]:
-        return LinkDataRule(selectables=[left for left, _ in link.join.joins]), ApplyLinkRule(
-            link.join
+    def build_limit_args(cls, limits: RowLimits) -> dict[str, GraphQLArgument]:
+        return {"limit": GraphQLArgument(GraphQLInt)} if limits.enabled else {}
+
+    def _get_link_limits(self, link: AnalyzedLink) -> RowLimits:
+        return self._row_limits.override(link.limits.default_limit, link.limits.max_rows)
+
+    @classmethod
+    def _validate_resident_node(cls, node: AnalyzedNode) -> None:
+        # records of resident nodes are not joined with anything, only lookups can be resolved
+        for link in node.links.values():
+            if link.kind != LinkKind.MULTIPLE and link.node.node.memory_resident is None:
+                raise GQLBuilderException(
+                    f"Member '{link.gql_name}' in memory-resident node '{node.node.name}' links"
+                    f" to node '{link.node.node.name}', which is not memory-resident."
+                )
+            if link.kind != LinkKind.MULTIPLE and link.join.condition is not None:
+                raise GQLBuilderException(
+                    f"Member '{link.gql_name}' in memory-resident node '{node.node.name}' links"
+                    f" by join condition, records can be looked up only by joined columns."
+                )
+
+    def _create_resident_table(self, key: tuple[AnalyzedNode, Sequence[Column]]) -> ResidentTable:
+        node, key_columns = key
+        return ResidentTable(node, key_columns, self._result_cache)
+
+    def _create_batched_link(
+        self, node: AnalyzedNode, link: AnalyzedLink
+    ) -> tuple[LinkDataRule | AdaptiveObjectRule, BatchedObjectResolver]:
+        link_data = LinkDataRule(selectables=link.join.source_columns)
+        link_rule = ApplyBatchedLinkRule(link.join)
+        statistics = None
+        rule: LinkDataRule | AdaptiveObjectRule = link_data
+        if link.strategy == LinkStrategy.AUTO:
+            statistics = LinkStatistics(node.node.estimated_rows, link.estimated_rows)
+            rule = AdaptiveObjectRule(
+                InlineObjectRule.create(
+                    link.node, link.join, link.kind == LinkKind.SINGLE_REQUIRED
+                ),
+                link_data,
+                statistics,
+            )
+        return rule, BatchedObjectResolver(
+            QueryBuilder.create(link.node, [link_rule], self._result_cache, self._identity_map),
+            link_rule,
+            statistics,
         )
+
+    def _create_list_resolver(
+        self, link: AnalyzedLink, link_rule: ApplyLinkRule, limits: RowLimits
+    ) -> ListResolver | BatchedListResolver:
+        if link.join.through is not None or link.hierarchy is not None:
+            # records of all parents are loaded by single join of association and remote table
+            # (or by single recursive query)
+            batched_rule = (
+                ApplyBatchedLinkRule(link.join)
+                if link.hierarchy is None
+                else ApplyHierarchyLinkRule(link.join, assert_not_none(link.max_depth))
+            )
+            return BatchedListResolver(
+                QueryBuilder.create(
+                    link.node, [batched_rule], self._result_cache, self._identity_map
+                ),
+                batched_rule,
+                limits,
+            )
+        return ListResolver(
+            QueryBuilder.create(link.node, [link_rule], self._result_cache, self._identity_map),
+            limits,
+        )
+
+    @classmethod
+    def _create_runtime_link(cls, link: AnalyzedLink) -> tuple[LinkDataRule, ApplyLinkRule]:
+        return LinkDataRule(selectables=link.join.source_columns), ApplyLinkRule(link.join)
@@ -1,4 +1,5 @@
 import enum
+from collections.abc import Sequence
 from typing import Any
 
 from graphql import (
@@ -9,7 +10,7 @@ from graphql import (
     GraphQLList,
     GraphQLResolveInfo,
 )
-from sqlalchemy import Select
+from sqlalchemy import ColumnElement, Select
 
 from sqlgraphql._ast import AnalyzedNode
 from sqlgraphql._builders.util import GQLFieldModifiers
@@ -65,11 +66,21 @@ class _TransformSortableQuery(ArgumentRule):
     def apply(
         self, query: Select, root: Any, info: GraphQLResolveInfo, args: dict[str, Any]
     ) -> Select:
-        sort: list[dict[str, SortDirection]] = args.pop("sort", [])
+        # records are ordered once all rules apply
+        return query
+
+    def get_order_by(
+        self, query: Select, order_by: Sequence[ColumnElement], args: dict[str, Any]
+    ) -> Sequence[ColumnElement]:
+        sort: list[dict[str, SortDirection]] = args.get("sort") or []
+        if not sort:
+            return order_by
+
+        sort_by = []
         for part in sort:
             field_name, direction = get_single_key_value(part)
             field = self._node.fields[field_name]
-            query = query.order_by(
+            sort_by.append(
                 field.orm_field.asc() if direction == SortDirection.ASC else field.orm_field.desc()
             )
-        return query
+        return [*order_by, *sort_by]
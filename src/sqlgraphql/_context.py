@@ -0,0 +1,47 @@
+from collections.abc import Callable, Hashable, MutableMapping
+from typing import Any, TypeVar
+
+from sqlgraphql._identity import IdentityMap
+
+_STATE_KEY = "_sqlgraphql"
+
+T = TypeVar("T")
+
+
+class RequestState:
+    """
+    State shared between resolvers while executing single GQL request. Execution is
+    identified by its coerced variable values, which graphql-core creates for each execution.
+    """
+
+    __slots__ = ("variable_values", "extensions", "identity_map", "_loaded")
+
+    def __init__(self, variable_values: dict[str, Any]) -> None:
+        # reference keeps the values alive, so that identity of other execution cannot match
+        self.variable_values = variable_values
+        self.extensions: dict[str, Any] = {}
+        self.identity_map = IdentityMap()
+        self._loaded: dict[Hashable, Any] = {}
+
+    def load(self, key: Hashable, loader: Callable[[], T]) -> T:
+        """
+        Loads value once per request, so that it can be shared by multiple resolvers.
+        """
+        try:
+            return self._loaded[key]
+        except KeyError:
+            value = self._loaded[key] = loader()
+            return value
+
+
+def get_request_state(
+    context: MutableMapping[str, Any], variable_values: dict[str, Any]
+) -> RequestState:
+    """
+    Returns state of the execution stored in its context. Context may be reused for several
+    executions, state of previous execution is replaced, so that it never leaks to others.
+    """
+    state = context.get(_STATE_KEY)
+    if state is None or state.variable_values is not variable_values:
+        state = context[_STATE_KEY] = RequestState(variable_values)
+    return state
@@ -0,0 +1,237 @@
+from collections.abc import Callable, Mapping, MutableMapping
+from dataclasses import dataclass
+from typing import Any
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    GraphQLError,
+    GraphQLField,
+    GraphQLList,
+    GraphQLNonNull,
+    GraphQLObjectType,
+    GraphQLOutputType,
+    GraphQLResolveInfo,
+    GraphQLSchema,
+    GraphQLUnionType,
+    OperationDefinitionNode,
+    get_named_type,
+)
+from graphql.execution.values import get_argument_values
+
+from sqlgraphql._context import get_request_state
+from sqlgraphql._limits import DEFAULT_PAGE_SIZE, RowLimits
+from sqlgraphql._selection import SelectedField, Selection, SelectionIndex
+
+COST_EXTENSION = "sqlgraphql_cost"
+QUERY_COST_EXTENSION = "queryCost"
+_STATE_KEY = "query_cost"
+
+
+@dataclass(frozen=True, slots=True)
+class ListCardinality:
+    """
+    Describes how many records list field is expected to return. Estimate is bounded by
+    requested number of rows (if list is limited or paged).
+    """
+
+    estimated_rows: int | None
+    limits: RowLimits
+    items_field: str | None = None
+
+    def resolve(self, args: Mapping[str, Any], default: int) -> int:
+        if self.items_field is not None:
+            bound = self.limits.resolve(args.get("pageSize"), DEFAULT_PAGE_SIZE)
+        else:
+            bound = self.limits.resolve(args.get("limit"))
+
+        candidates = [value for value in (bound, self.estimated_rows) if value is not None]
+        return min(candidates) if candidates else default
+
+
+def build_cost_extensions(cardinality: ListCardinality) -> dict[str, Any]:
+    return {COST_EXTENSION: cardinality}
+
+
+@dataclass(frozen=True, slots=True)
+class QueryCostAnalyzer:
+    """
+    Estimates cost of the operation before it is executed. Every selected field costs as much
+    as is the estimated number of records it is selected for, which means that lists multiply
+    cost of their selections by their estimated cardinality.
+    """
+
+    max_cost: int
+    default_cardinality: int
+
+    def estimate(
+        self,
+        schema: GraphQLSchema,
+        fragments: dict[str, FragmentDefinitionNode],
+        variable_values: dict[str, Any],
+        operation: OperationDefinitionNode,
+        index: SelectionIndex | None = None,
+    ) -> int:
+        root_type = schema.get_root_type(operation.operation)
+        if root_type is None:
+            return 0
+
+        if index is None:
+            index = SelectionIndex(schema, fragments, variable_values)
+        walker = _CostWalker(index, variable_values, self.default_cardinality)
+        return walker.fields_cost(
+            root_type, index.get_operation_selection(operation, root_type), 1
+        )
+
+    def check(
+        self,
+        context: Any,
+        schema: GraphQLSchema,
+        fragments: dict[str, FragmentDefinitionNode],
+        variable_values: dict[str, Any],
+        operation: OperationDefinitionNode,
+    ) -> None:
+        """
+        Rejects operation whose estimated cost exceeds maximum cost. Cost is estimated once per
+        execution and reported in extensions (if context is mapping).
+        """
+        if isinstance(context, MutableMapping):
+            state = get_request_state(context, variable_values)
+            cost = state.load(
+                _STATE_KEY,
+                lambda: self.estimate(
+                    schema,
+                    fragments,
+                    variable_values,
+                    operation,
+                    # selections normalized for estimation are reused by resolvers
+                    SelectionIndex.of_request(context, schema, fragments, variable_values),
+                ),
+            )
+            state.extensions[QUERY_COST_EXTENSION] = {"estimated": cost, "maximum": self.max_cost}
+        else:
+            cost = self.estimate(schema, fragments, variable_values, operation)
+
+        if cost > self.max_cost:
+            raise GraphQLError(
+                f"Estimated query cost {cost} exceeds maximum allowed cost {self.max_cost}.",
+                operation,
+            )
+
+
+class CostLimitedResolver:
+    """
+    Resolver of root field checking cost of the operation first, so that maximum cost is
+    enforced even if operation is not executed by GQLExecutionContext (which rejects it
+    before execution).
+    """
+
+    __slots__ = ("_analyzer", "_resolver")
+
+    def __init__(self, analyzer: QueryCostAnalyzer, resolver: Callable[..., Any]):
+        self._analyzer = analyzer
+        self._resolver = resolver
+
+    def __call__(self, parent: Any, info: GraphQLResolveInfo, **kwargs: Any) -> Any:
+        self._analyzer.check(
+            info.context, info.schema, info.fragments, info.variable_values, info.operation
+        )
+        return self._resolver(parent, info, **kwargs)
+
+
+class _CostWalker:
+    __slots__ = ("_index", "_variable_values", "_default_cardinality")
+
+    def __init__(
+        self,
+        index: SelectionIndex,
+        variable_values: dict[str, Any],
+        default_cardinality: int,
+    ):
+        self._index = index
+        self._variable_values = variable_values
+        self._default_cardinality = default_cardinality
+
+    def fields_cost(
+        self,
+        parent_type: GraphQLObjectType,
+        selection: Selection,
+        multiplier: int,
+        item_multipliers: Mapping[str, int] | None = None,
+    ) -> int:
+        cost = 0
+        for response_key, field in selection.fields.items():
+            field_def = parent_type.fields.get(field.name)
+            if field_def is None:
+                # meta fields (such as __typename)
+                continue
+
+            field_multiplier = multiplier
+            cardinality = self._get_cardinality(field_def)
+            if item_multipliers is not None and response_key in item_multipliers:
+                # items of the list, whose cardinality was determined by parent
+                field_multiplier *= item_multipliers[response_key]
+                cardinality = None
+
+            cost += field_multiplier
+            return_type = get_named_type(field_def.type)
+            if isinstance(return_type, GraphQLUnionType):
+                # each record is of one of the member types, the most expensive one is assumed
+                cost += max(
+                    self._object_cost(member_type, field, field_def, cardinality, field_multiplier)
+                    for member_type in return_type.types
+                )
+            elif isinstance(return_type, GraphQLObjectType):
+                cost += self._object_cost(
+                    return_type, field, field_def, cardinality, field_multiplier
+                )
+
+        return cost
+
+    def _object_cost(
+        self,
+        return_type: GraphQLObjectType,
+        field: SelectedField,
+        field_def: GraphQLField,
+        cardinality: ListCardinality | None,
+        multiplier: int,
+    ) -> int:
+        sub_fields = self._index.get_selection(field.nodes, return_type)
+        if cardinality is None:
+            return self.fields_cost(return_type, sub_fields, multiplier)
+        elif cardinality.items_field is not None:
+            return self.fields_cost(
+                return_type,
+                sub_fields,
+                multiplier,
+                {
+                    key: self._resolve(cardinality, field_def, field.nodes[0])
+                    for key, sub_field in sub_fields.fields.items()
+                    if sub_field.name == cardinality.items_field
+                },
+            )
+        else:
+            return self.fields_cost(
+                return_type,
+                sub_fields,
+                multiplier * self._resolve(cardinality, field_def, field.nodes[0]),
+            )
+
+    @classmethod
+    def _get_cardinality(cls, field_def: GraphQLField) -> ListCardinality | None:
+        cardinality = (field_def.extensions or {}).get(COST_EXTENSION)
+        if cardinality is None and _is_list(field_def.type):
+            return ListCardinality(None, RowLimits())
+        return cardinality
+
+    def _resolve(
+        self, cardinality: ListCardinality, field_def: GraphQLField, field_node: FieldNode
+    ) -> int:
+        args = get_argument_values(field_def, field_node, self._variable_values)
+        return cardinality.resolve(args, self._default_cardinality)
+
+
+def _is_list(gql_type: GraphQLOutputType) -> bool:
+    if isinstance(gql_type, GraphQLNonNull):
+        gql_type = gql_type.of_type
+    return isinstance(gql_type, GraphQLList)
@@ -0,0 +1,61 @@
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+
+class IdentityMap:
+    """
+    Entities materialized while executing single GQL request, identified by table and primary
+    key. Entity holds values of all its columns selected by any query of the request so far.
+    """
+
+    __slots__ = ("_entities",)
+
+    def __init__(self) -> None:
+        self._entities: dict[tuple[str, tuple], dict[str, Any]] = {}
+
+    def add(self, table: str, key: tuple, values: Mapping[str, Any]) -> None:
+        entity = self._entities.get((table, key))
+        if entity is None:
+            self._entities[(table, key)] = dict(values)
+        else:
+            entity.update(values)
+
+    def get(self, table: str, key: tuple, columns: Iterable[str]) -> Mapping[str, Any] | None:
+        """
+        Returns entity if it was materialized with (at least) all given columns.
+        """
+        entity = self._entities.get((table, key))
+        if entity is None or any(column not in entity for column in columns):
+            return None
+        return entity
+
+
+@dataclass(frozen=True, slots=True)
+class EntityMapper:
+    """
+    Locates entity of a table in records of query result. Column labels map labels of records
+    to column names (key columns included).
+    """
+
+    table: str
+    key_labels: Sequence[str]
+    column_labels: Mapping[str, str]
+
+    def register(self, record: Mapping[Any, Any], identity_map: IdentityMap) -> None:
+        key = tuple(record[label] for label in self.key_labels)
+        if any(value is None for value in key):
+            # entity is not present in record (such as not joined optional link)
+            return
+
+        identity_map.add(
+            self.table,
+            key,
+            {column: record[label] for label, column in self.column_labels.items()},
+        )
+
+    def lookup(self, key: tuple, identity_map: IdentityMap) -> dict[str, Any] | None:
+        entity = identity_map.get(self.table, key, self.column_labels.values())
+        if entity is None:
+            return None
+        return {label: entity[column] for label, column in self.column_labels.items()}
@@ -0,0 +1,66 @@
+from collections.abc import MutableMapping
+from dataclasses import dataclass
+from typing import Any
+
+from graphql import GraphQLError, GraphQLResolveInfo
+
+from sqlgraphql._context import get_request_state
+
+TRUNCATED_EXTENSION = "truncated"
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_DEPTH = 100
+
+
+@dataclass(frozen=True, slots=True)
+class RowLimits:
+    default_limit: int | None = None
+    max_rows: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.default_limit is not None and self.default_limit <= 0:
+            raise ValueError("Default limit should be at least 1")
+        if self.max_rows is not None and self.max_rows <= 0:
+            raise ValueError("Max rows should be at least 1")
+        if (
+            self.default_limit is not None
+            and self.max_rows is not None
+            and self.default_limit > self.max_rows
+        ):
+            raise ValueError("Default limit should not be greater than max rows")
+
+    @property
+    def enabled(self) -> bool:
+        return self.default_limit is not None or self.max_rows is not None
+
+    def override(self, default_limit: int | None, max_rows: int | None) -> "RowLimits":
+        return RowLimits(
+            default_limit=default_limit if default_limit is not None else self.default_limit,
+            max_rows=max_rows if max_rows is not None else self.max_rows,
+        )
+
+    def resolve(self, requested: int | None, fallback: int | None = None) -> int | None:
+        """
+        Returns number of rows which should be returned for requested limit. If limit is not
+        requested, default limit is used (or fallback, if there is no default limit).
+        """
+        if requested is None:
+            limit = self.default_limit if self.default_limit is not None else fallback
+            if limit is None:
+                return self.max_rows
+            return min(limit, self.max_rows) if self.max_rows is not None else limit
+
+        if requested <= 0:
+            raise GraphQLError(f"Requested number of rows should be at least 1, got {requested}")
+        if self.max_rows is not None and requested > self.max_rows:
+            raise GraphQLError(
+                f"Requested {requested} rows, but at most {self.max_rows} rows are allowed"
+            )
+        return requested
+
+
+def report_truncation(info: GraphQLResolveInfo, limit: int) -> None:
+    context: MutableMapping[str, Any] = info.context
+    extensions = get_request_state(context, info.variable_values).extensions
+    extensions.setdefault(TRUNCATED_EXTENSION, []).append(
+        {"path": info.path.as_list(), "limit": limit}
+    )
@@ -0,0 +1,171 @@
+from collections.abc import Iterable, Iterator, Mapping, Sequence
+from typing import Any
+
+from graphql import GraphQLAbstractType, GraphQLObjectType, GraphQLResolveInfo
+from sqlalchemy import ColumnElement, Label, Row, Select, literal, null, select, union_all
+from sqlalchemy.orm import Session
+
+from sqlgraphql._transformers import CachePolicy, QueryBuilder, QueryExecutor, Record
+
+TYPE_LABEL = "__type"
+_ORDER_PREFIX = "__order_"
+
+
+def resolve_member_type(
+    value: Record, info: GraphQLResolveInfo, abstract_type: GraphQLAbstractType
+) -> str:
+    return value[TYPE_LABEL]
+
+
+class PolymorphicQueryBuilder:
+    """
+    Builds UNION ALL query of member nodes. Each member (branch) selects fields requested for
+    its object type (fragments with type condition of other types do not apply) under labels
+    prefixed by index of the member, labels of other members are padded with NULL. Name of
+    the type is selected as discriminator of records.
+
+    Union is cached only if all members are (for the shortest TTL of them).
+    """
+
+    __slots__ = ("_members", "_descending", "_cache_policy")
+
+    def __init__(
+        self,
+        members: Sequence[tuple[GraphQLObjectType, QueryBuilder, Sequence[ColumnElement]]],
+        descending: bool = False,
+    ):
+        # object type, builder of member query and columns records are ordered by
+        self._members = members
+        self._descending = descending
+        self._cache_policy: CachePolicy | None = None
+        policies = [
+            builder.cache_policy for _, builder, _ in members if builder.cache_policy is not None
+        ]
+        if len(policies) == len(members):
+            self._cache_policy = CachePolicy(
+                policies[0].cache, min(policy.ttl for policy in policies)
+            )
+
+    def build(
+        self, root: Any, info: GraphQLResolveInfo, args: dict[str, Any], session: Session
+    ) -> "PolymorphicQueryExecutor":
+        branch_queries = []
+        branches = {}
+        for idx, (gql_type, builder, order_columns) in enumerate(self._members):
+            executor = builder.build(
+                root, info, args, session, gql_type=gql_type, keep_columns=False
+            )
+            query = executor.query.order_by(None).add_columns(
+                *(
+                    column.label(f"{_ORDER_PREFIX}{order_idx}")
+                    for order_idx, column in enumerate(order_columns)
+                )
+            )
+            if builder.limited:
+                # limited member query cannot be part of compound select
+                query = select(*query.subquery().columns)
+
+            prefix = f"__m{idx}_"
+            labels = [
+                (f"{prefix}{label}", label)
+                for label in query.selected_columns.keys()
+                if not label.startswith(_ORDER_PREFIX)
+            ]
+            branch_queries.append((gql_type, query, labels))
+            branches[gql_type.name] = (executor, labels)
+
+        all_labels = [selected for _, _, labels in branch_queries for selected, _ in labels]
+        order_labels = [
+            f"{_ORDER_PREFIX}{order_idx}" for order_idx in range(len(self._members[0][2]))
+        ]
+        selects = []
+        for gql_type, query, labels in branch_queries:
+            own = {selected: query.selected_columns[label] for selected, label in labels}
+            selects.append(
+                query.with_only_columns(
+                    literal(gql_type.name).label(TYPE_LABEL),
+                    *(
+                        _unlabel(own[label]).label(label) if label in own else null().label(label)
+                        for label in all_labels
+                    ),
+                    *(query.selected_columns[label] for label in order_labels),
+                    maintain_column_froms=True,
+                )
+            )
+
+        union = union_all(*selects).subquery()
+        return PolymorphicQueryExecutor(
+            select(*(union.columns[label] for label in [TYPE_LABEL, *all_labels])).order_by(
+                *(
+                    union.columns[label].desc() if self._descending else union.columns[label]
+                    for label in order_labels
+                )
+            ),
+            session,
+            branches,
+            self._cache_policy,
+        )
+
+
+def _unlabel(column: ColumnElement) -> ColumnElement:
+    return column.element if isinstance(column, Label) else column
+
+
+class PolymorphicQueryExecutor:
+    """
+    Executes union of member queries, records are materialized by executors of their members
+    (records of each member are batched together) and keep order of the union.
+    """
+
+    __slots__ = ("_query", "_session", "_branches", "_cache_policy")
+
+    def __init__(
+        self,
+        query: Select,
+        session: Session,
+        branches: Mapping[str, tuple[QueryExecutor, Sequence[tuple[str, str]]]],
+        cache_policy: CachePolicy | None = None,
+    ):
+        self._query = query
+        self._session = session
+        # executor of member query and its labels (selected label, label of the member)
+        self._branches = branches
+        self._cache_policy = cache_policy
+
+    def execute(self) -> Iterator[Record]:
+        yield from self._materialize(self._execute(self._query))
+
+    def execute_with_limit(self, limit: int) -> tuple[Iterable[Record], bool]:
+        """
+        Executes query returning at most limit records, see QueryExecutor.execute_with_limit.
+        """
+        rows = list(self._execute(self._query.limit(limit + 1)))
+        return self._materialize(rows[:limit]), len(rows) > limit
+
+    def _execute(self, query: Select) -> Iterable[Row]:
+        if self._cache_policy is None:
+            return self._session.execute(query)
+        return self._cache_policy.execute(query, self._session)
+
+    def _materialize(self, rows: Iterable[Row]) -> list[Record]:
+        type_names = []
+        records_by_type: dict[str, list[Record]] = {}
+        for row in rows:
+            mapping = row._mapping
+            type_name = mapping[TYPE_LABEL]
+            _, labels = self._branches[type_name]
+            type_names.append(type_name)
+            records_by_type.setdefault(type_name, []).append(
+                Record((label, mapping[selected]) for selected, label in labels)
+            )
+
+        materialized = {
+            type_name: iter(self._branches[type_name][0].materialize(records))
+            for type_name, records in records_by_type.items()
+        }
+        result = []
+        for type_name in type_names:
+            record = next(materialized[type_name])
+            record[TYPE_LABEL] = type_name
+            result.append(record)
+        return result
@@ -0,0 +1,187 @@
+import math
+import threading
+import time
+from collections.abc import Callable, Iterable, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from graphql import GraphQLObjectType, GraphQLResolveInfo, get_named_type
+from sqlalchemy import Column, Row, Select, Table
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+from sqlgraphql._ast import AnalyzedNode, JoinPoint, get_primary_key_fields
+from sqlgraphql._selection import SelectionIndex
+from sqlgraphql._snapshot import SnapshotFile
+from sqlgraphql._transformers import Record, RecordBatch, get_link_key
+from sqlgraphql.cache import ResultCache
+from sqlgraphql.types import TypedResolveContext
+
+_KEY_PREFIX = "__key_"
+
+
+class ResidentTable:
+    """
+    In-memory copy of all records of memory-resident node, indexed by key columns. Records
+    are loaded on first access and reloaded once they expire or once any of the node tables
+    is invalidated in result cache.
+
+    With snapshot file, records loaded by any process (or before restart) are reused by all
+    processes until they expire. Invalidation in result cache makes the process reload records
+    and replace the snapshot for all others.
+    """
+
+    def __init__(
+        self,
+        node: AnalyzedNode,
+        key_columns: Sequence[Column],
+        result_cache: ResultCache | None = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        residency = node.node.memory_resident
+        assert residency is not None
+        self._ttl = residency.ttl
+        self._result_cache = result_cache
+        self._clock = clock
+        self._key_size = len(key_columns)
+        self._query = self._build_query(node, key_columns)
+        self._tables = {
+            table.fullname
+            for table in find_tables(self._query, check_columns=True)
+            if isinstance(table, Table)
+        }
+        self._snapshot_file = (
+            SnapshotFile(
+                Path(residency.snapshot_dir).joinpath(
+                    "_".join([node.node.name, *(column.name for column in key_columns)])
+                ),
+                [(column.name, column.type) for column in self._query.selected_columns],
+                len(key_columns),
+            )
+            if residency.snapshot_dir is not None
+            else None
+        )
+        self._lock = threading.Lock()
+        self._index: Mapping[tuple, Record] | None = None
+        self._versions: Mapping[str, int] | None = None
+        self._expires_at = math.inf
+
+    def get_index(self, session: Session) -> Mapping[tuple, Record]:
+        cache = self._result_cache
+        if cache is not None and cache.has_pending_changes(session, self._tables):
+            # session has to see its own modifications, don't share them with others
+            return self._index_rows(session.execute(self._query))
+
+        with self._lock:
+            # versions need to be retrieved before loading, see CachePolicy
+            versions = cache.get_versions(self._tables) if cache is not None else {}
+            invalidated = self._versions is not None and self._versions != versions
+            snapshot_file = self._snapshot_file
+            if (
+                self._index is not None
+                and not invalidated
+                and self._expires_at > self._clock()
+                and (snapshot_file is None or not snapshot_file.changed())
+            ):
+                return self._index
+
+            index: Mapping[tuple, Record] | None = None
+            if snapshot_file is not None and not invalidated:
+                # records may have been loaded by other process
+                snapshot = snapshot_file.open()
+                if snapshot is not None and self._get_expiration(snapshot.created_at) > (
+                    self._clock()
+                ):
+                    index, loaded_at = snapshot, snapshot.created_at
+
+            if index is None:
+                loaded_at = self._clock()
+                rows = session.execute(self._query).all()
+                if snapshot_file is not None:
+                    index = snapshot_file.write(rows, loaded_at)
+                else:
+                    index = self._index_rows(rows)
+
+            self._index = index
+            self._versions = versions
+            self._expires_at = self._get_expiration(loaded_at)
+            return index
+
+    def _get_expiration(self, loaded_at: float) -> float:
+        return loaded_at + self._ttl if self._ttl is not None else math.inf
+
+    def _index_rows(self, rows: Iterable[Row]) -> dict[tuple, Record]:
+        index = {}
+        for row in rows:
+            record = Record.from_row(row)
+            key = tuple(record.pop(f"{_KEY_PREFIX}{idx}") for idx in range(self._key_size))
+            index[key] = record
+        return index
+
+    @classmethod
+    def _build_query(cls, node: AnalyzedNode, key_columns: Sequence[Column]) -> Select:
+        # records should be usable as parents of all node links (and of global ID)
+        link_columns = dict.fromkeys(
+            column for link in node.links.values() for column in link.join.source_columns
+        )
+        for batch_field in node.batch_fields.values():
+            link_columns.update(dict.fromkeys(batch_field.requires))
+        if node.node.implements_node:
+            for field in get_primary_key_fields(node):
+                assert isinstance(field.orm_field, Column)
+                link_columns[field.orm_field] = None
+        return node.node.query.with_only_columns(
+            *(
+                field.orm_field
+                if field.orm_name == field.gql_name
+                else field.orm_field.label(field.gql_name)
+                for field in node.fields.values()
+            ),
+            *(column.label(f"__{column.name}") for column in link_columns),
+            *(column.label(f"{_KEY_PREFIX}{idx}") for idx, column in enumerate(key_columns)),
+            maintain_column_froms=True,
+        )
+
+
+class ResidentLinkResolver:
+    __slots__ = ("_table", "_join")
+
+    def __init__(self, table: ResidentTable, join: JoinPoint):
+        self._table = table
+        self._join = join
+
+    def __call__(self, parent: Any, info: GraphQLResolveInfo) -> Record | None:
+        key = get_link_key(parent, self._join)
+        if key is None:
+            return None
+
+        context: TypedResolveContext = info.context
+        batch = RecordBatch.of(parent)
+        # validity of records is checked once for all parents in the batch
+        index = batch.load(self, lambda _: self._table.get_index(context["db_session"]))
+        record = index.get(key)
+        if record is None:
+            return None
+
+        aliases = batch.load((self, info.path.key), lambda _: self._get_aliases(info))
+        if not aliases:
+            return record
+
+        # records are keyed by field names, fields resolve values by response keys
+        projected = Record(record)
+        for response_key, name in aliases:
+            if name in record:
+                projected[response_key] = record[name]
+        return projected
+
+    @classmethod
+    def _get_aliases(cls, info: GraphQLResolveInfo) -> list[tuple[str, str]]:
+        object_type = get_named_type(info.return_type)
+        selection = SelectionIndex.of(info).get_selection(
+            info.field_nodes, object_type if isinstance(object_type, GraphQLObjectType) else None
+        )
+        return [
+            (field.response_key, field.name)
+            for field in selection.fields.values()
+            if field.response_key != field.name
+        ]
@@ -1,35 +1,379 @@
-from collections.abc import Iterable
-from typing import Any
+import enum
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import Any, cast
 
-from graphql import GraphQLResolveInfo
-from sqlalchemy import Row
+from graphql import FieldNode, GraphQLObjectType, GraphQLResolveInfo, print_ast
+from graphql.execution.values import get_argument_values
+from sqlalchemy import Column, Row
 
-from sqlgraphql._transformers import QueryBuilder, Record
+from sqlgraphql._context import get_request_state
+from sqlgraphql._limits import RowLimits, report_truncation
+from sqlgraphql._polymorphic import PolymorphicQueryBuilder
+from sqlgraphql._selection import SelectionIndex
+from sqlgraphql._transformers import (
+    ApplyBatchedLinkRule,
+    ApplyKeyLookupRule,
+    ApplyLinkRule,
+    LinkStatistics,
+    QueryBuilder,
+    QueryExecutor,
+    Record,
+    RecordBatch,
+    get_link_key,
+)
 from sqlgraphql.types import TypedResolveContext
 
 
 class DbFieldResolver:
-    __slots__ = ("_field_name",)
+    """
+    Resolves column of the record. Columns are labelled by response keys of fields, so that
+    the same field can be selected under different aliases.
+    """
 
-    def __init__(self, field_name: str):
-        self._field_name = field_name
+    __slots__ = ()
 
     def __call__(self, parent: Row | Record, info: GraphQLResolveInfo) -> Any:
+        # path of a field always ends with its response key
+        key = cast(str, info.path.key)
         if type(parent) is Record:
-            return parent[self._field_name]
+            return parent[key]
         else:
-            return getattr(parent, self._field_name)
+            return getattr(parent, key)
+
+
+class InlineObjectResolver:
+    """
+    Resolves object selected together with its parent record (stored under response key of
+    the field), missing object means that parent is not linked to any.
+    """
+
+    __slots__ = ()
+
+    def __call__(self, parent: Record, info: GraphQLResolveInfo) -> Record | None:
+        return parent.get(cast(str, info.path.key))
+
+
+class BatchedObjectResolver:
+    """
+    Resolves n-1 link whose records are loaded by single query for all parents of the batch,
+    distinct link keys are looked up at once. Object joined to parent record (see
+    AdaptiveObjectRule) is used as it is. If link key is primary key of linked records,
+    records already materialized in the request (if identity map is enabled) are not loaded.
+    """
+
+    __slots__ = ("_transformer", "_link_rule", "_statistics")
+
+    def __init__(
+        self,
+        transformer: QueryBuilder,
+        link_rule: ApplyBatchedLinkRule,
+        statistics: LinkStatistics | None = None,
+    ):
+        self._transformer = transformer
+        self._link_rule = link_rule
+        self._statistics = statistics
+
+    def __call__(self, parent: object, info: GraphQLResolveInfo) -> Any:
+        batch = RecordBatch.of(parent)
+        if self._statistics is not None:
+            batch.load(self._statistics, self._observe)
+
+        response_key = cast(str, info.path.key)
+        if isinstance(parent, Record) and response_key in parent:
+            return parent[response_key]
+
+        key = get_link_key(parent, self._link_rule.join)
+        if key is None:
+            return None
+        records = batch.load((self, response_key), lambda parents: self._load(parents, info))
+        return records.get(key)
+
+    def _observe(self, parents: Sequence[object]) -> None:
+        assert self._statistics is not None
+        keys = {get_link_key(parent, self._link_rule.join) for parent in parents}
+        keys.discard(None)
+        self._statistics.observe(len(parents), len(keys))
+
+    def _load(self, parents: Sequence[object], info: GraphQLResolveInfo) -> Mapping[tuple, Any]:
+        if not any(get_link_key(parent, self._link_rule.join) for parent in parents):
+            return {}
+
+        context: TypedResolveContext = info.context
+        session = context["db_session"]
+        query = self._transformer.build(parents, info, {}, session)
+        records = self._lookup_materialized(parents, query)
+        if records:
+            parents = [
+                parent
+                for parent in parents
+                if get_link_key(parent, self._link_rule.join) not in records
+            ]
+            if not any(get_link_key(parent, self._link_rule.join) for parent in parents):
+                RecordBatch.attach(list(records.values()))
+                return records
+            query = self._transformer.build(parents, info, {}, session)
+
+        key_labels = self._link_rule.key_labels
+        loaded = {}
+        for record in query.execute():
+            accessor = ApplyLinkRule._get_accessor(record)
+            loaded[tuple(accessor(label) for label in key_labels)] = record
+        if records:
+            # links of materialized and loaded records are resolved together (rows are loaded
+            # as they are only if there are no links)
+            records.update(loaded)
+            RecordBatch.attach([record for record in records.values() if type(record) is Record])
+            return records
+        return loaded
+
+    def _lookup_materialized(
+        self, parents: Sequence[object], query: QueryExecutor
+    ) -> dict[tuple, Record]:
+        positions = self._link_rule.primary_key_positions
+        if positions is None:
+            return {}
+
+        keys = {
+            key: tuple(key[idx] for idx in positions)
+            for key in (get_link_key(parent, self._link_rule.join) for parent in parents)
+            if key is not None
+        }
+        materialized = query.lookup_materialized(list(keys.values()))
+        return {
+            key: materialized[primary_key]
+            for key, primary_key in keys.items()
+            if primary_key in materialized
+        }
+
+
+class BatchFieldResolver:
+    """
+    Resolves field computed in python for all records of the batch at once. Function receives
+    values of required columns of each record and returns values in the same order.
+    """
+
+    __slots__ = ("_function", "_columns")
+
+    def __init__(
+        self,
+        function: Callable[[Sequence[Mapping[str, Any]]], Sequence[Any]],
+        columns: Sequence[Column],
+    ):
+        self._function = function
+        self._columns = columns
+
+    def __call__(self, parent: object, info: GraphQLResolveInfo) -> Any:
+        values = RecordBatch.of(parent).load(self, self._compute)
+        return values[id(parent)]
+
+    def _compute(self, parents: Sequence[object]) -> dict[int, Any]:
+        inputs = []
+        for parent in parents:
+            accessor = ApplyLinkRule._get_accessor(parent)
+            inputs.append({column.name: accessor(f"__{column.name}") for column in self._columns})
+        results = self._function(inputs)
+        if len(results) != len(parents):
+            raise ValueError(
+                f"Batch resolver returned {len(results)} values for {len(parents)} records"
+            )
+        # records are identified by identity, they live as long as their batch
+        return {id(parent): result for parent, result in zip(parents, results)}
 
 
 class ListResolver:
-    __slots__ = ("_transformer",)
+    __slots__ = ("_transformer", "_limits")
 
-    def __init__(self, transformer: QueryBuilder):
+    def __init__(
+        self,
+        transformer: QueryBuilder | PolymorphicQueryBuilder,
+        limits: RowLimits = RowLimits(),
+    ):
         self._transformer = transformer
+        self._limits = limits
 
     def __call__(self, parent: object | None, info: GraphQLResolveInfo, **kwargs: Any) -> Iterable:
         context: TypedResolveContext = info.context
-        return self._transformer.build(parent, info, kwargs, context["db_session"]).execute()
+        limit = self._limits.resolve(kwargs.pop("limit", None))
+        query = self._transformer.build(parent, info, kwargs, context["db_session"])
+        if limit is None:
+            return query.execute()
+
+        records, truncated = query.execute_with_limit(limit)
+        if truncated:
+            report_truncation(info, limit)
+        return records
+
+
+class BatchedListResolver:
+    """
+    Resolves list link for all parents of the batch by single query, records are partitioned
+    per parent by link key. Limit applies to records of each parent.
+    """
+
+    __slots__ = ("_transformer", "_link_rule", "_limits")
+
+    def __init__(
+        self,
+        transformer: QueryBuilder,
+        link_rule: ApplyBatchedLinkRule,
+        limits: RowLimits = RowLimits(),
+    ):
+        self._transformer = transformer
+        self._link_rule = link_rule
+        self._limits = limits
+
+    def __call__(self, parent: object, info: GraphQLResolveInfo, **kwargs: Any) -> Iterable:
+        limit = self._limits.resolve(kwargs.pop("limit", None))
+        partitions, truncated = RecordBatch.of(parent).load(
+            (self, info.path.key), lambda parents: self._load(parents, info, kwargs, limit)
+        )
+        key = get_link_key(parent, self._link_rule.join)
+        if key is None:
+            return []
+        if key in truncated:
+            assert limit is not None
+            report_truncation(info, limit)
+        return partitions.get(key, [])
+
+    def _load(
+        self,
+        parents: Sequence[object],
+        info: GraphQLResolveInfo,
+        kwargs: dict[str, Any],
+        limit: int | None,
+    ) -> tuple[Mapping[tuple, list], set[tuple]]:
+        """
+        Returns records partitioned by link key, and link keys whose records were truncated.
+        """
+        if not any(get_link_key(parent, self._link_rule.join) for parent in parents):
+            return {}, set()
+
+        context: TypedResolveContext = info.context
+        query = self._transformer.build(parents, info, kwargs, context["db_session"])
+        key_labels = self._link_rule.key_labels
+        records: Iterable
+        truncated: set[tuple] = set()
+        if limit is None:
+            records = query.execute()
+        else:
+            records, truncated = query.execute_with_partitioned_limit(key_labels, limit)
+        partitions: dict[tuple, list] = {}
+        for record in records:
+            accessor = ApplyLinkRule._get_accessor(record)
+            partitions.setdefault(tuple(accessor(label) for label in key_labels), []).append(
+                record
+            )
+        return partitions, truncated
+
+
+def coerce_key(values: Sequence[Any], python_types: Sequence[type | None]) -> tuple:
+    """
+    Converts key values received in request into python types of key fields, since GQL scalar
+    may represent value differently (for example UUID as ID).
+    """
+    key = []
+    for value, python_type in zip(values, python_types, strict=True):
+        if (
+            python_type is not None
+            and python_type is not enum.Enum
+            and not isinstance(value, python_type)
+        ):
+            value = python_type(value)
+        key.append(value)
+    return tuple(key)
+
+
+def load_by_keys(
+    transformer: QueryBuilder,
+    lookup_rule: ApplyKeyLookupRule,
+    keys: Sequence[tuple],
+    info: GraphQLResolveInfo,
+    gql_type: GraphQLObjectType | None = None,
+) -> dict[tuple, Any]:
+    """
+    Loads records with given keys by single query (transformer has to apply lookup rule).
+    Records already materialized in the request (if identity map is enabled) are not loaded.
+    """
+    context: TypedResolveContext = info.context
+    session = context["db_session"]
+    query = transformer.build(keys, info, {}, session, gql_type=gql_type)
+    result: dict[tuple, Any] = query.lookup_materialized(keys)
+    if result:
+        keys = [key for key in keys if key not in result]
+        if not keys:
+            return result
+        query = transformer.build(keys, info, {}, session, gql_type=gql_type)
+
+    records = query.execute()
+    if len(keys) == 1:
+        result.update((keys[0], record) for record in records)
+        return result
+
+    labels = lookup_rule.key_labels
+    for record in records:
+        accessor = ApplyLinkRule._get_accessor(record)
+        result[tuple(accessor(label) for label in labels)] = record
+    return result
+
+
+class SingleResolver:
+    """
+    Resolves single record of root field by its key. Lookups of the same field with the same
+    selection in the operation (such as aliased lookups of different keys) are loaded with
+    a single query.
+    """
+
+    __slots__ = ("_transformer", "_lookup_rule", "_key_names", "_key_types")
+
+    def __init__(
+        self,
+        transformer: QueryBuilder,
+        lookup_rule: ApplyKeyLookupRule,
+        key_names: Sequence[str],
+        key_types: Sequence[type | None],
+    ):
+        self._transformer = transformer
+        self._lookup_rule = lookup_rule
+        self._key_names = key_names
+        self._key_types = key_types
+
+    def __call__(self, parent: object | None, info: GraphQLResolveInfo, **kwargs: Any) -> Any:
+        signature = self._get_signature(info.field_nodes)
+        records = get_request_state(info.context, info.variable_values).load(
+            (self, signature),
+            lambda: load_by_keys(
+                self._transformer,
+                self._lookup_rule,
+                # resolver is used by root fields only, current field is one of the siblings
+                list(dict.fromkeys(self._iterate_sibling_keys(info, signature))),
+                info,
+            ),
+        )
+        return records.get(self._get_key(kwargs))
+
+    def _get_key(self, args: dict[str, Any]) -> tuple:
+        return coerce_key([args[name] for name in self._key_names], self._key_types)
+
+    def _iterate_sibling_keys(self, info: GraphQLResolveInfo, signature: str) -> Iterator[tuple]:
+        field_def = info.parent_type.fields[info.field_name]
+        selection = SelectionIndex.of(info).get_operation_selection(
+            info.operation, info.parent_type
+        )
+        for field in selection.fields.values():
+            if field.name == info.field_name and signature == self._get_signature(field.nodes):
+                # merged occurrences of the field have the same arguments
+                yield self._get_key(
+                    get_argument_values(field_def, field.nodes[0], info.variable_values)
+                )
+
+    @classmethod
+    def _get_signature(cls, nodes: Sequence[FieldNode]) -> str:
+        """
+        Returns selection of the field (merged from all its occurrences) printed as text.
+        """
+        return "\n".join(
+            print_ast(node.selection_set) for node in nodes if node.selection_set is not None
+        )
 
 
 class FieldResolver:
@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, MutableMapping, Sequence
+from typing import Any, cast
+
+from graphql import (
+    FieldNode,
+    FragmentDefinitionNode,
+    FragmentSpreadNode,
+    GraphQLAbstractType,
+    GraphQLObjectType,
+    GraphQLResolveInfo,
+    GraphQLSchema,
+    InlineFragmentNode,
+    NamedTypeNode,
+    Node,
+    OperationDefinitionNode,
+    SelectionSetNode,
+    is_abstract_type,
+)
+from graphql.execution.collect_fields import should_include_node
+
+from sqlgraphql._context import get_request_state
+
+_STATE_KEY = "selection_index"
+
+
+class SelectedField:
+    """
+    Field of normalized selection, all occurrences of the field with the same response key
+    are merged.
+    """
+
+    __slots__ = ("response_key", "name", "nodes")
+
+    def __init__(self, response_key: str, nodes: Sequence[FieldNode]):
+        self.response_key = response_key
+        self.name = nodes[0].name.value
+        self.nodes = nodes
+
+
+class Selection:
+    """
+    Normalized selection set of an object, fields are indexed by response key (in order of
+    selection) and by name.
+    """
+
+    __slots__ = ("fields", "_by_name")
+
+    def __init__(self, fields: Mapping[str, SelectedField]):
+        self.fields = fields
+        self._by_name: dict[str, list[SelectedField]] = {}
+        for field in fields.values():
+            self._by_name.setdefault(field.name, []).append(field)
+
+    def get_all(self, name: str) -> Sequence[SelectedField]:
+        """
+        Returns fields selecting member with given name (under any response key).
+        """
+        return self._by_name.get(name, [])
+
+
+class SelectionIndex:
+    """
+    Normalized selections of executed operation. Fragments are inlined (unless excluded by
+    @skip or @include directives or by type condition not applying to known object type) and
+    fields are merged by response key. Selection of each field is built once per object type
+    and shared by all resolvers of the request.
+    """
+
+    __slots__ = ("_schema", "_fragments", "_variable_values", "_selections")
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        fragments: dict[str, FragmentDefinitionNode],
+        variable_values: dict[str, Any],
+    ):
+        self._schema = schema
+        self._fragments = fragments
+        self._variable_values = variable_values
+        # AST nodes are identified by their identity, they live as long as executed operation
+        self._selections: dict[tuple[tuple[int, ...], GraphQLObjectType | None], Selection] = {}
+
+    @classmethod
+    def of(cls, info: GraphQLResolveInfo) -> SelectionIndex:
+        return cls.of_request(info.context, info.schema, info.fragments, info.variable_values)
+
+    @classmethod
+    def of_request(
+        cls,
+        context: MutableMapping[str, Any],
+        schema: GraphQLSchema,
+        fragments: dict[str, FragmentDefinitionNode],
+        variable_values: dict[str, Any],
+    ) -> SelectionIndex:
+        return get_request_state(context, variable_values).load(
+            _STATE_KEY, lambda: cls(schema, fragments, variable_values)
+        )
+
+    def get_operation_selection(
+        self, operation: OperationDefinitionNode, root_type: GraphQLObjectType
+    ) -> Selection:
+        return self._get_selection([operation], [operation.selection_set], root_type)
+
+    def get_selection(
+        self, nodes: Sequence[FieldNode], gql_type: GraphQLObjectType | None
+    ) -> Selection:
+        """
+        Returns selection of the field (nodes of all its occurrences). If type of the field is
+        not known, all fragments are considered to apply to it.
+        """
+        return self._get_selection(
+            nodes,
+            [node.selection_set for node in nodes if node.selection_set is not None],
+            gql_type,
+        )
+
+    def _get_selection(
+        self,
+        nodes: Sequence[Node],
+        selection_sets: Iterable[SelectionSetNode],
+        gql_type: GraphQLObjectType | None,
+    ) -> Selection:
+        key = (tuple(id(node) for node in nodes), gql_type)
+        selection = self._selections.get(key)
+        if selection is None:
+            fields: dict[str, list[FieldNode]] = {}
+            visited_fragments: set[str] = set()
+            for selection_set in selection_sets:
+                self._collect(selection_set, gql_type, fields, visited_fragments)
+            selection = self._selections[key] = Selection(
+                {
+                    response_key: SelectedField(response_key, field_nodes)
+                    for response_key, field_nodes in fields.items()
+                }
+            )
+        return selection
+
+    def _collect(
+        self,
+        selection_set: SelectionSetNode,
+        gql_type: GraphQLObjectType | None,
+        fields: dict[str, list[FieldNode]],
+        visited_fragments: set[str],
+    ) -> None:
+        for node in selection_set.selections:
+            if isinstance(node, FieldNode):
+                if should_include_node(self._variable_values, node):
+                    response_key = node.alias.value if node.alias else node.name.value
+                    fields.setdefault(response_key, []).append(node)
+            elif isinstance(node, InlineFragmentNode):
+                if should_include_node(self._variable_values, node) and self._fragment_applies(
+                    node.type_condition, gql_type
+                ):
+                    self._collect(node.selection_set, gql_type, fields, visited_fragments)
+            elif isinstance(node, FragmentSpreadNode):
+                name = node.name.value
+                if name in visited_fragments or not should_include_node(
+                    self._variable_values, node
+                ):
+                    continue
+                visited_fragments.add(name)
+                fragment = self._fragments.get(name)
+                if fragment is not None and self._fragment_applies(
+                    fragment.type_condition, gql_type
+                ):
+                    self._collect(fragment.selection_set, gql_type, fields, visited_fragments)
+            else:
+                raise ValueError(f"Unknown SelectionNode type: {type(node)!r}")
+
+    def _fragment_applies(
+        self, type_condition: NamedTypeNode | None, gql_type: GraphQLObjectType | None
+    ) -> bool:
+        if type_condition is None or gql_type is None:
+            return True
+
+        conditional_type = self._schema.get_type(type_condition.name.value)
+        if conditional_type is gql_type:
+            return True
+        return is_abstract_type(conditional_type) and self._schema.is_sub_type(
+            cast(GraphQLAbstractType, conditional_type), gql_type
+        )
@@ -0,0 +1,260 @@
+import bisect
+import json
+import mmap
+import os
+import pickle
+import struct
+import tempfile
+from array import array
+from collections.abc import Iterator, Mapping, Sequence
+from pathlib import Path
+from typing import Any
+
+from sqlalchemy.sql.type_api import TypeEngine
+
+from sqlgraphql._transformers import Record
+
+_MAGIC = b"SQLGQLS1"
+_PREFIX = struct.Struct("<8sI")
+_ALIGNMENT = 8
+
+# codecs of column values
+_INT = "q"
+_FLOAT = "d"
+_BOOL = "?"
+_STR = "s"
+_PICKLE = "p"
+
+
+def _align(offset: int) -> int:
+    return -(-offset // _ALIGNMENT) * _ALIGNMENT
+
+
+def _get_codec(sql_type: TypeEngine) -> str:
+    try:
+        python_type = sql_type.python_type
+    except NotImplementedError:
+        return _PICKLE
+
+    if python_type is bool:
+        return _BOOL
+    elif python_type is int:
+        return _INT
+    elif python_type is float:
+        return _FLOAT
+    elif python_type is str:
+        return _STR
+    else:
+        return _PICKLE
+
+
+def _encode(codec: str, values: Sequence[Any]) -> list[bytes]:
+    nulls = bytes(value is None for value in values)
+    match codec:
+        case "q" | "d":
+            return [
+                nulls,
+                array(codec, (0 if value is None else value for value in values)).tobytes(),
+            ]
+        case "?":
+            if not all(value is None or isinstance(value, bool) for value in values):
+                raise TypeError("Expected boolean values")
+            return [nulls, bytes(bool(value) for value in values)]
+        case "s":
+            blobs = [b"" if value is None else value.encode() for value in values]
+        case _:
+            blobs = [b"" if value is None else pickle.dumps(value) for value in values]
+
+    offsets = array("Q", [0])
+    for blob in blobs:
+        offsets.append(offsets[-1] + len(blob))
+    return [nulls, offsets.tobytes(), b"".join(blobs)]
+
+
+class _ColumnReader:
+    __slots__ = ("_codec", "_nulls", "_values", "_offsets", "_data")
+
+    def __init__(self, codec: str, segments: Sequence[memoryview]):
+        self._codec = codec
+        self._nulls = segments[0]
+        if codec in (_INT, _FLOAT):
+            self._values = segments[1].cast(codec)
+        elif codec == _BOOL:
+            self._values = segments[1]
+        else:
+            self._offsets = segments[1].cast("Q")
+            self._data = segments[2]
+
+    def get(self, idx: int) -> Any:
+        if self._nulls[idx]:
+            return None
+
+        match self._codec:
+            case "q" | "d":
+                return self._values[idx]
+            case "?":
+                return bool(self._values[idx])
+            case "s":
+                return str(self._data[self._offsets[idx] : self._offsets[idx + 1]], "utf-8")
+            case _:
+                return pickle.loads(  # noqa: S301 (snapshot file is trusted)
+                    self._data[self._offsets[idx] : self._offsets[idx + 1]]
+                )
+
+
+class _KeyView(Sequence[tuple]):
+    __slots__ = ("_columns", "_size")
+
+    def __init__(self, columns: Sequence[_ColumnReader], size: int):
+        self._columns = columns
+        self._size = size
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __getitem__(self, idx: int) -> tuple:  # type: ignore[override]
+        if not 0 <= idx < self._size:
+            raise IndexError(idx)
+        return tuple(column.get(idx) for column in self._columns)
+
+
+class Snapshot(Mapping[tuple, Record]):
+    """
+    Records stored in memory-mapped snapshot file, sorted by key columns. Values are decoded
+    only when record is looked up, so memory of the file is shared by all processes mapping it.
+    """
+
+    def __init__(self, buffer: mmap.mmap, names: Sequence[str], key_size: int):
+        magic, header_size = _PREFIX.unpack_from(buffer, 0)
+        if magic != _MAGIC:
+            raise ValueError("Not a snapshot file")
+        header = json.loads(buffer[_PREFIX.size : _PREFIX.size + header_size])
+        if header["key_size"] != key_size or [
+            column["name"] for column in header["columns"]
+        ] != list(names):
+            raise ValueError("Snapshot has incompatible layout")
+
+        data = memoryview(buffer)[_align(_PREFIX.size + header_size) :]
+        self.created_at: float = header["created_at"]
+        self._size: int = header["rows"]
+        self._names = names[: len(names) - key_size]
+        columns = [
+            _ColumnReader(
+                column["codec"],
+                [data[offset : offset + length] for offset, length in column["segments"]],
+            )
+            for column in header["columns"]
+        ]
+        self._columns = columns[: len(columns) - key_size]
+        self._keys = _KeyView(columns[len(columns) - key_size :], self._size)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[tuple]:
+        return iter(self._keys)
+
+    def __getitem__(self, key: tuple) -> Record:
+        idx = bisect.bisect_left(self._keys, key)
+        if idx == self._size or self._keys[idx] != key:
+            raise KeyError(key)
+
+        record = Record()
+        for name, column in zip(self._names, self._columns):
+            record[name] = column.get(idx)
+        return record
+
+
+class SnapshotFile:
+    """
+    Read-only columnar file with records of memory-resident node, shared by all processes.
+    Key columns are the last columns of the layout. File is never modified in place, new
+    version atomically replaces the old one, while processes still mapping the old one can
+    continue to use it.
+    """
+
+    def __init__(
+        self, path: str | os.PathLike[str], layout: Sequence[tuple[str, TypeEngine]], key_size: int
+    ):
+        self._path = Path(path)
+        self._names = [name for name, _ in layout]
+        self._codecs = [_get_codec(sql_type) for _, sql_type in layout]
+        self._key_size = key_size
+        self._identity: tuple[int, int] | None = None
+
+    def changed(self) -> bool:
+        """
+        Returns True if file was replaced since it was opened (or written) by this process.
+        """
+        try:
+            stat = self._path.stat()
+        except FileNotFoundError:
+            return False
+        return (stat.st_dev, stat.st_ino) != self._identity
+
+    def open(self) -> Snapshot | None:
+        try:
+            with self._path.open("rb") as file:
+                stat = os.fstat(file.fileno())
+                buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            return None
+
+        try:
+            snapshot = Snapshot(buffer, self._names, self._key_size)
+        except (ValueError, KeyError, struct.error):
+            # file was written by incompatible version, it will be replaced
+            return None
+
+        self._identity = (stat.st_dev, stat.st_ino)
+        return snapshot
+
+    def write(self, rows: Sequence[Sequence[Any]], created_at: float) -> Snapshot:
+        key_size = self._key_size
+        rows = sorted(rows, key=lambda row: tuple(row[len(row) - key_size :]))
+
+        data = bytearray()
+        columns = []
+        for idx, (name, codec) in enumerate(zip(self._names, self._codecs)):
+            values = [row[idx] for row in rows]
+            try:
+                segments = _encode(codec, values)
+            except (TypeError, OverflowError, AttributeError):
+                # values do not match declared column type
+                codec = _PICKLE
+                segments = _encode(codec, values)
+
+            locations = []
+            for segment in segments:
+                data.extend(bytes(_align(len(data)) - len(data)))
+                locations.append((len(data), len(segment)))
+                data.extend(segment)
+            columns.append({"name": name, "codec": codec, "segments": locations})
+
+        header = json.dumps(
+            {
+                "rows": len(rows),
+                "created_at": created_at,
+                "key_size": key_size,
+                "columns": columns,
+            }
+        ).encode()
+        prefix = _PREFIX.pack(_MAGIC, len(header)) + header
+        prefix += bytes(_align(len(prefix)) - len(prefix))
+
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=self._path.parent, prefix=f".{self._path.name}.")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(prefix)
+                file.write(data)
+                file.flush()
+                os.fsync(file.fileno())
+            os.replace(temp_path, self._path)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        snapshot = self.open()
+        assert snapshot is not None
+        return snapshot
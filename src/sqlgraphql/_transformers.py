@@ -2,39 +2,79 @@ from __future__ import annotations
 
 from abc import ABC, abstractmethod
 from collections import deque
-from collections.abc import Callable, Iterator, Mapping, Sequence
+from collections.abc import Callable, Hashable, Iterable, Iterator, Mapping, Sequence
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Any, Literal, NamedTuple, TypeAlias
+from typing import TYPE_CHECKING, Any, Literal, TypeAlias, TypeVar
 
 from graphql import (
     FieldNode,
-    FragmentSpreadNode,
+    GraphQLError,
+    GraphQLObjectType,
     GraphQLResolveInfo,
-    InlineFragmentNode,
-    SelectionNode,
+    OperationType,
+    get_named_type,
 )
-from sqlalchemy import Column, FromClause, Row, Select, Subquery, func
+from sqlalchemy import (
+    Column,
+    ColumnClause,
+    FromClause,
+    Row,
+    Select,
+    SelectBase,
+    Subquery,
+    Table,
+    and_,
+    false,
+    func,
+    or_,
+    select,
+    tuple_,
+    union_all,
+)
+from sqlalchemy.engine import Dialect
 from sqlalchemy.orm import Session
 from sqlalchemy.sql.elements import ColumnElement, literal
+from sqlalchemy.sql.util import find_tables
+from sqlalchemy.sql.visitors import iterate, replacement_traverse
 
+from sqlgraphql._context import get_request_state
+from sqlgraphql._identity import EntityMapper, IdentityMap
+from sqlgraphql._selection import SelectedField, Selection, SelectionIndex
 from sqlgraphql._utils import assert_not_none
+from sqlgraphql.cache import ResultCache
 from sqlgraphql.exceptions import InvalidOperationException
+from sqlgraphql.types import TypedResolveContext
 
 if TYPE_CHECKING:
     from sqlgraphql._ast import AnalyzedNode, JoinPoint
 
+T = TypeVar("T")
 
-class _FieldInfo(NamedTuple):
-    name: str
-    node: FieldNode
+LINK_KEY_PREFIX = "__link_"
+LOOKUP_KEY_PREFIX = "__lookup_"
+_ROW_NUMBER_LABEL = "__row_number"
+_DEPTH_LABEL = "__depth"
+# overhead of separate query expressed in number of transferred values
+BATCH_QUERY_COST = 1000
 
 
 class _FieldWalker:
-    __slots__ = ("_info", "_node_stack", "_current_relative_path")
+    """
+    Walks normalized selection of the field (see SelectionIndex). If type of the field is
+    known, fragments with type condition which does not apply to it are skipped.
+    """
+
+    __slots__ = ("_index", "_selection_stack", "_type_stack", "_current_relative_path")
 
-    def __init__(self, node: FieldNode, info: GraphQLResolveInfo):
-        self._info = info
-        self._node_stack = [node]
+    def __init__(
+        self,
+        nodes: Sequence[FieldNode],
+        info: GraphQLResolveInfo,
+        gql_type: GraphQLObjectType | None = None,
+    ):
+        self._index = SelectionIndex.of(info)
+        self._selection_stack = [self._index.get_selection(nodes, gql_type)]
+        self._type_stack = [gql_type]
         self._current_relative_path: list[str] = []
 
     @property
@@ -42,49 +82,60 @@ class _FieldWalker:
         return self._current_relative_path
 
     def descend(self, member: str, raise_: bool = False) -> bool:
-        for child in self.children():
-            if child.name == member:
-                break
-        else:
+        """
+        Descends into member, selections of all its aliases are merged (records are shared by
+        them), path is extended by name of the member.
+        """
+        children = self._selection_stack[-1].get_all(member)
+        if not children:
             if raise_:
                 raise ValueError(f"No child with name '{member}'")
             else:
                 return False
 
-        self._node_stack.append(child.node)
-        self._current_relative_path.append(child.name)
+        child_type = self._get_child_type(member)
+        nodes = [node for child in children for node in child.nodes]
+        self._selection_stack.append(self._index.get_selection(nodes, child_type))
+        self._type_stack.append(child_type)
+        self._current_relative_path.append(member)
         return True
 
+    def descend_field(self, field: SelectedField) -> None:
+        """
+        Descends into selected field, path is extended by its response key.
+        """
+        child_type = self._get_child_type(field.name)
+        self._selection_stack.append(self._index.get_selection(field.nodes, child_type))
+        self._type_stack.append(child_type)
+        self._current_relative_path.append(field.response_key)
+
     def ascend(self, raise_: bool = False) -> bool:
         if not self._current_relative_path:
             if raise_:
                 raise InvalidOperationException("We are already at the root")
             else:
                 return False
-        self._node_stack.pop()
-        assert self._node_stack
+        self._selection_stack.pop()
+        self._type_stack.pop()
+        self._current_relative_path.pop()
+        assert self._selection_stack
         return True
 
-    def children(self) -> Iterator[_FieldInfo]:
-        node = self._node_stack[-1]
-        if node.selection_set is None:
-            return
-
-        for selection in node.selection_set.selections:
-            yield from self._materialize_children(selection)
-
-    def _materialize_children(self, node: SelectionNode) -> Iterator[_FieldInfo]:
-        if isinstance(node, FieldNode):
-            yield _FieldInfo(node.name.value, node)
-        elif isinstance(node, FragmentSpreadNode):
-            fragment = self._info.fragments[node.name.value]
-            for selection in fragment.selection_set.selections:
-                yield from self._materialize_children(selection)
-        elif isinstance(node, InlineFragmentNode):
-            for selection in node.selection_set.selections:
-                yield from self._materialize_children(selection)
-        else:
-            raise ValueError(f"Unknown SelectionNode type: {type(node)!r}")
+    def children(self) -> Iterable[SelectedField]:
+        return self._selection_stack[-1].fields.values()
+
+    def get_selection(self, field: SelectedField) -> Selection:
+        return self._index.get_selection(field.nodes, self._get_child_type(field.name))
+
+    def _get_child_type(self, member: str) -> GraphQLObjectType | None:
+        current_type = self._type_stack[-1]
+        if current_type is None:
+            return None
+        field_def = current_type.fields.get(member)
+        if field_def is None:
+            return None
+        child_type = get_named_type(field_def.type)
+        return child_type if isinstance(child_type, GraphQLObjectType) else None
 
 
 @dataclass(frozen=True, slots=True)
@@ -98,15 +149,20 @@ class InlineObjectRule:
     base_query: Select
     join: JoinPoint | None
     fields_accessor: Mapping[str, FieldRules] | Callable[[], Mapping[str, FieldRules]]
+    # each parent is linked to an object (see LinkKind.SINGLE_REQUIRED)
+    required: bool = False
 
     @classmethod
-    def create(cls, node: AnalyzedNode, join: JoinPoint | None) -> InlineObjectRule:
+    def create(
+        cls, node: AnalyzedNode, join: JoinPoint | None, required: bool = False
+    ) -> InlineObjectRule:
         return cls(
             node.node.query,
             join,
             node.data.field_rules
             if node.data.field_rules is not None
             else lambda: assert_not_none(node.data.field_rules),
+            required,
         )
 
     @property
@@ -118,13 +174,57 @@ class InlineObjectRule:
             object.__setattr__(self, "fields_accessor", fields)
             return fields
 
-    def reduce_select(self) -> FromClause | None:
-        if self.base_query.whereclause is None:
-            resolved_froms = self.base_query.get_final_froms()
-            if len(resolved_froms) == 1:
-                return resolved_froms[0]
-
-        return None
+    @property
+    def link_columns(self) -> Sequence[Column]:
+        """
+        Columns of the object which links of its fields are joined or loaded by.
+        """
+        columns: dict[Column, None] = {}
+        for rule in self.fields.values():
+            if isinstance(rule, AdaptiveObjectRule):
+                columns.update(dict.fromkeys(rule.link_data.selectables))
+                rule = rule.inline
+            if isinstance(rule, LinkDataRule):
+                columns.update(dict.fromkeys(rule.selectables))
+            elif isinstance(rule, InlineObjectRule) and rule.join is not None:
+                columns.update(dict.fromkeys(rule.join.source_columns))
+        return list(columns)
+
+    def reduce_select(self) -> tuple[FromClause, ColumnElement | None] | None:
+        """
+        Returns the only FROM of base query together with its filter, if joining it with
+        filter added to join condition is equivalent to joining base query as subquery.
+        """
+        query = self.base_query
+        if (
+            query._group_by_clauses
+            or query._having_criteria
+            or query._distinct
+            or query._limit_clause is not None
+            or query._offset_clause is not None
+        ):
+            return None
+
+        resolved_froms = query.get_final_froms()
+        if len(resolved_froms) != 1:
+            return None
+        target_from = resolved_froms[0]
+        whereclause = query.whereclause
+        if whereclause is not None and not _filters_only(whereclause, target_from):
+            return None
+        return target_from, whereclause
+
+
+def _filters_only(clause: ColumnElement, target_from: FromClause) -> bool:
+    """
+    Returns True if clause refers only to columns of the FROM (no subqueries).
+    """
+    for element in iterate(clause):
+        if isinstance(element, SelectBase):
+            return False
+        if isinstance(element, ColumnClause) and element.table is not target_from:
+            return False
+    return True
 
 
 @dataclass(frozen=True, slots=True)
@@ -132,7 +232,60 @@ class LinkDataRule:
     selectables: Sequence[Column]
 
 
-FieldRules: TypeAlias = ColumnSelectRule | InlineObjectRule | LinkDataRule
+class LinkStatistics:
+    """
+    Numbers of parent records in a batch and of distinct records linked to them. Initially
+    derived from estimated rows of the nodes, replaced by moving averages of observed batches
+    once link is resolved.
+    """
+
+    __slots__ = ("parent_rows", "distinct_rows", "_observed")
+
+    _SMOOTHING = 0.2
+
+    def __init__(self, parent_rows: int | None, remote_rows: int | None):
+        self.parent_rows: float | None = parent_rows
+        self.distinct_rows: float | None = (
+            min(parent_rows, remote_rows)
+            if parent_rows is not None and remote_rows is not None
+            else remote_rows
+        )
+        self._observed = False
+
+    def observe(self, parent_rows: int, distinct_rows: int) -> None:
+        if not self._observed or self.parent_rows is None or self.distinct_rows is None:
+            self.parent_rows, self.distinct_rows = parent_rows, distinct_rows
+            self._observed = True
+        else:
+            self.parent_rows += self._SMOOTHING * (parent_rows - self.parent_rows)
+            self.distinct_rows += self._SMOOTHING * (distinct_rows - self.distinct_rows)
+
+    def prefer_batch(self, width: int) -> bool:
+        """
+        Returns True if linked records with given number of selected columns should be loaded
+        by separate query rather than joined to parent records.
+        """
+        parent_rows = self.parent_rows
+        if parent_rows is None:
+            return False
+        distinct_rows = self.distinct_rows if self.distinct_rows is not None else parent_rows
+        # joined columns are repeated for each parent, separate query returns each record once
+        return (parent_rows - distinct_rows) * width > BATCH_QUERY_COST
+
+
+@dataclass(frozen=True, slots=True)
+class AdaptiveObjectRule:
+    """
+    Linked object which is either joined to parent query or loaded by separate batched query,
+    link columns are selected in both cases.
+    """
+
+    inline: InlineObjectRule
+    link_data: LinkDataRule
+    statistics: LinkStatistics
+
+
+FieldRules: TypeAlias = ColumnSelectRule | InlineObjectRule | LinkDataRule | AdaptiveObjectRule
 
 
 class ArgumentRule(ABC):
@@ -142,6 +295,15 @@ class ArgumentRule(ABC):
     ) -> Select:
         raise NotImplementedError()
 
+    def get_order_by(
+        self, query: Select, order_by: Sequence[ColumnElement], args: dict[str, Any]
+    ) -> Sequence[ColumnElement]:
+        """
+        Returns ordering of records of the query (returned by apply), given ordering before
+        the rule was applied. Query is ordered by the final ordering once all rules apply.
+        """
+        return order_by
+
 
 class ApplyLinkRule(ArgumentRule):
     __slots__ = ("_join",)
@@ -153,12 +315,17 @@ class ApplyLinkRule(ArgumentRule):
         self, query: Select, root: Any, info: GraphQLResolveInfo, args: dict[str, Any]
     ) -> Select:
         accessor = self._get_accessor(root)
-        left, right = self._join.joins[0]
-        condition = right == accessor(f"__{left.name}")
-        for left, right in self._join.joins[1:]:
-            condition = condition and right == accessor(f"__{left.name}")
-
-        return query.where(condition)
+        join = self._join
+        if join.condition is not None:
+            # source columns are replaced by values of the parent
+            values = {
+                column: literal(accessor(f"__{column.name}"), column.type)
+                for column in join.condition_columns
+            }
+            return query.where(_replace_columns(join.condition, values))
+        return join.join_through(query).where(
+            *(right == accessor(f"__{left.name}") for left, right in join.joins)
+        )
 
     @classmethod
     def _get_accessor(cls, root: Any) -> Callable[[str], Any]:
@@ -168,7 +335,300 @@ class ApplyLinkRule(ArgumentRule):
             return lambda key: getattr(root, key)
 
 
+class ApplyBatchedLinkRule(ArgumentRule):
+    """
+    Restricts query to records linked to any of the parent records (passed as root) and
+    exposes remote join columns under link key labels, so that results can be partitioned
+    per parent.
+    """
+
+    __slots__ = ("join",)
+
+    def __init__(self, join: JoinPoint):
+        self.join = join
+
+    @property
+    def key_labels(self) -> Sequence[str]:
+        return [f"{LINK_KEY_PREFIX}{idx}" for idx in range(len(self.join.source_columns))]
+
+    @property
+    def primary_key_positions(self) -> Sequence[int] | None:
+        """
+        Returns positions of link key values in primary key of the remote table, or None if
+        remote columns are not its primary key (linked records cannot be identified by key).
+        """
+        join = self.join
+        if join.condition is not None or join.through is not None:
+            return None
+        remote_columns = [right for _, right in join.joins]
+        table = remote_columns[0].table
+        if not isinstance(table, Table):
+            return None
+        primary_key = list(table.primary_key.columns)
+        if len(primary_key) != len(remote_columns) or any(
+            column not in remote_columns for column in primary_key
+        ):
+            return None
+        return [remote_columns.index(column) for column in primary_key]
+
+    def apply(
+        self, query: Select, root: Any, info: GraphQLResolveInfo, args: dict[str, Any]
+    ) -> Select:
+        # keys are deduplicated in order of parents, so that the same query is built for them
+        keys = dict.fromkeys(
+            key for key in (get_link_key(record, self.join) for record in root) if key
+        )
+        if self.join.condition is not None:
+            return self._apply_condition(query, list(keys))
+
+        remote_columns = [right for _, right in self.join.joins]
+        return (
+            self.join.join_through(query)
+            .add_columns(
+                *(column.label(label) for column, label in zip(remote_columns, self.key_labels))
+            )
+            .where(match_keys(remote_columns, list(keys), _get_dialect(info)))
+        )
+
+    def _apply_condition(self, query: Select, keys: list[tuple]) -> Select:
+        """
+        Joins keys of parents as derived table on join condition (in place of source columns),
+        so that each record is exposed with keys of all parents it is linked to.
+        """
+        if not keys:
+            return query.where(false())
+
+        source_columns = self.join.source_columns
+        key_selects = [
+            select(
+                *(
+                    literal(value, column.type).label(f"key_{idx}")
+                    for idx, (column, value) in enumerate(zip(source_columns, key))
+                )
+            )
+            for key in keys
+        ]
+        keys_from = (
+            key_selects[0] if len(key_selects) == 1 else union_all(*key_selects)
+        ).subquery()
+        key_columns = [keys_from.columns[f"key_{idx}"] for idx in range(len(source_columns))]
+        assert self.join.condition is not None
+        condition = _replace_columns(self.join.condition, dict(zip(source_columns, key_columns)))
+        return query.join(keys_from, condition).add_columns(
+            *(column.label(label) for column, label in zip(key_columns, self.key_labels))
+        )
+
+
+def _replace_columns(
+    clause: ColumnElement, replacements: Mapping[Column, ColumnElement]
+) -> ColumnElement:
+    def replace(element: Any, **kw: Any) -> ColumnElement | None:
+        return replacements.get(element) if isinstance(element, Column) else None
+
+    options: dict[str, Any] = {}
+    return replacement_traverse(clause, options, replace)
+
+
+class ApplyHierarchyLinkRule(ApplyBatchedLinkRule):
+    """
+    Restricts query to records reachable from any of the parent records by repeatedly
+    following self-referencing link (up to depth passed in args, at most max depth).
+    Reachable records are found by recursive CTE, which carries keys of the parents (exposed
+    as by ApplyBatchedLinkRule) and distance from them (exposed under depth label). Records
+    are ordered by the distance first. Recursion is always bounded, since hierarchy may
+    contain cycles.
+    """
+
+    __slots__ = ("max_depth",)
+
+    def __init__(self, join: JoinPoint, max_depth: int):
+        super().__init__(join)
+        self.max_depth = max_depth
+
+    def apply(
+        self, query: Select, root: Any, info: GraphQLResolveInfo, args: dict[str, Any]
+    ) -> Select:
+        depth = args.get("depth")
+        if depth is not None and depth <= 0:
+            raise GraphQLError(f"Requested depth should be at least 1, got {depth}")
+        if depth is not None and depth > self.max_depth:
+            raise GraphQLError(
+                f"Requested depth {depth}, but at most {self.max_depth} levels are allowed"
+            )
+
+        keys = list(
+            dict.fromkeys(
+                key for key in (get_link_key(record, self.join) for record in root) if key
+            )
+        )
+        if not keys:
+            return query.where(false())
+
+        joins = self.join.joins
+        table = joins[0][0].table
+        assert isinstance(table, Table)
+        primary_key = list(table.primary_key.columns)
+        remote_columns = [right for _, right in joins]
+        anchor = select(
+            *(column.label(f"root_{idx}") for idx, column in enumerate(remote_columns)),
+            *(column.label(f"pk_{idx}") for idx, column in enumerate(primary_key)),
+            *(left.label(f"next_{idx}") for idx, (left, _) in enumerate(joins)),
+            literal(1).label("depth"),
+        ).where(match_keys(remote_columns, keys, _get_dialect(info)))
+        tree = anchor.cte("hierarchy", recursive=True)
+        step = select(
+            *(tree.columns[f"root_{idx}"] for idx in range(len(joins))),
+            *(column.label(f"pk_{idx}") for idx, column in enumerate(primary_key)),
+            *(left.label(f"next_{idx}") for idx, (left, _) in enumerate(joins)),
+            (tree.columns.depth + 1).label("depth"),
+        ).join_from(
+            table,
+            tree,
+            and_(*(right == tree.columns[f"next_{idx}"] for idx, (_, right) in enumerate(joins))),
+        )
+        step = step.where(tree.columns.depth < (depth if depth is not None else self.max_depth))
+        tree = tree.union_all(step)
+
+        return query.join(
+            tree,
+            and_(*(column == tree.columns[f"pk_{idx}"] for idx, column in enumerate(primary_key))),
+        ).add_columns(
+            *(
+                tree.columns[f"root_{idx}"].label(label)
+                for idx, label in enumerate(self.key_labels)
+            ),
+            tree.columns.depth.label(_DEPTH_LABEL),
+        )
+
+    def get_order_by(
+        self, query: Select, order_by: Sequence[ColumnElement], args: dict[str, Any]
+    ) -> Sequence[ColumnElement]:
+        return [query.selected_columns[_DEPTH_LABEL], *order_by]
+
+
+def _adapt_to_subquery(clause: ColumnElement, subquery: Subquery) -> ColumnElement:
+    replacements: dict[Column, ColumnElement] = {}
+    for column in iterate(clause):
+        if isinstance(column, Column):
+            corresponding = subquery.corresponding_column(column)
+            if corresponding is None:
+                raise InvalidOperationException(
+                    f"Column '{column}' of expression is not selected by subquery"
+                )
+            replacements[column] = corresponding
+    return _replace_columns(clause, replacements)
+
+
+class ApplyKeyLookupRule(ArgumentRule):
+    """
+    Restricts query to records with any of the keys (passed as root). If there are more keys,
+    key columns are exposed under lookup key labels, so that records can be matched with keys.
+    Lookup of single key is limited to single record.
+    """
+
+    __slots__ = ("columns",)
+
+    def __init__(self, columns: Sequence[ColumnElement]):
+        self.columns = columns
+
+    @property
+    def key_labels(self) -> Sequence[str]:
+        return [f"{LOOKUP_KEY_PREFIX}{idx}" for idx in range(len(self.columns))]
+
+    def apply(
+        self, query: Select, root: Any, info: GraphQLResolveInfo, args: dict[str, Any]
+    ) -> Select:
+        keys: Sequence[tuple] = root
+        columns = self.columns
+        if len(keys) == 1:
+            return query.where(
+                *(column == value for column, value in zip(columns, keys[0]))
+            ).limit(1)
+
+        return query.add_columns(
+            *(column.label(label) for column, label in zip(columns, self.key_labels))
+        ).where(match_keys(columns, keys, _get_dialect(info)))
+
+
+def match_keys(
+    columns: Sequence[ColumnElement], keys: Sequence[tuple], dialect: Dialect
+) -> ColumnElement:
+    """
+    Returns condition matching rows with any of the keys. Composite keys are compared as row
+    values (tuple IN), or as OR of key comparisons if dialect does not support row values.
+    """
+    if not keys:
+        return false()
+    if len(columns) == 1:
+        return columns[0].in_([key[0] for key in keys])
+    if _supports_row_values(dialect):
+        return tuple_(*columns).in_(keys)
+    return or_(*(and_(*(column == value for column, value in zip(columns, key))) for key in keys))
+
+
+def _supports_row_values(dialect: Dialect) -> bool:
+    match dialect.name:
+        case "mssql":
+            return False
+        case "sqlite":
+            # row values are supported since SQLite 3.15
+            return getattr(dialect.dbapi, "sqlite_version_info", (3, 15)) >= (3, 15)
+        case _:
+            return True
+
+
+def _get_dialect(info: GraphQLResolveInfo) -> Dialect:
+    context: TypedResolveContext = info.context
+    return context["db_session"].get_bind().dialect
+
+
+def get_link_key(parent: Any, join: JoinPoint) -> tuple | None:
+    """
+    Returns values of link columns selected on the parent record, or None if any of them is
+    NULL (such parent cannot be linked to any record).
+    """
+    accessor = ApplyLinkRule._get_accessor(parent)
+    key = tuple(accessor(f"__{column.name}") for column in join.source_columns)
+    return None if any(value is None for value in key) else key
+
+
+class RecordBatch:
+    """
+    Records materialized on the same level of a single query result. Links of these
+    records can be loaded for all of them at once and reused by each record.
+    """
+
+    __slots__ = ("records", "_loaded")
+
+    def __init__(self, records: Sequence[Record]):
+        self.records = records
+        self._loaded: dict[Hashable, Any] = {}
+
+    @classmethod
+    def attach(cls, records: Sequence[Record]) -> None:
+        batch = cls(records)
+        for record in records:
+            record.batch = batch
+
+    @classmethod
+    def of(cls, parent: Any) -> RecordBatch:
+        batch = getattr(parent, "batch", None)
+        if batch is None:
+            # parent was not materialized in batch, treat it as batch of its own
+            batch = cls([parent])
+        return batch
+
+    def load(self, key: Hashable, loader: Callable[[Sequence[Record]], T]) -> T:
+        try:
+            return self._loaded[key]
+        except KeyError:
+            value = self._loaded[key] = loader(self.records)
+            return value
+
+
 class Record(dict[str, Any]):
+    batch: RecordBatch | None = None
+
     @classmethod
     def from_row(cls, row: Row) -> Record:
         record = Record()
@@ -182,30 +642,178 @@ class Record(dict[str, Any]):
 class _Mapper:
     prefix: str
     path: Sequence[str]
+    # inner joined entity always exists, there is no presence column
+    required: bool = False
 
 
-class QueryExecutor:
-    __slots__ = ("_query", "_session", "_mappers")
+@dataclass(frozen=True, slots=True)
+class CachePolicy:
+    cache: ResultCache
+    ttl: float
+
+    def execute(self, query: Select, session: Session) -> Sequence[Row]:
+        tables = {
+            table.fullname
+            for table in find_tables(query, check_columns=True)
+            if isinstance(table, Table)
+        }
+        if self.cache.has_pending_changes(session, tables):
+            return session.execute(query).all()
+
+        bind = session.get_bind()
+        compiled = query.compile(bind)
+        # the same query returns different rows from different databases; password is left
+        # out, so that it is not stored by the cache backend
+        url = bind.engine.url.render_as_string(hide_password=True)
+        key = f"{url}\n{compiled}\n{compiled.params!r}"
+        rows = self.cache.get(key)
+        if rows is None:
+            # versions need to be retrieved before execution, so that modifications done while
+            # query is executing are not missed
+            versions = self.cache.get_versions(tables)
+            rows = session.execute(query).all()
+            self.cache.set(key, rows, versions, self.ttl)
+        return rows
+
 
-    def __init__(self, query: Select, session: Session, mappers: Sequence[_Mapper]):
+class QueryExecutor:
+    __slots__ = (
+        "_query",
+        "_session",
+        "_mappers",
+        "_batched",
+        "_cache_policy",
+        "_identity_map",
+        "_entity_mappers",
+        "_lookup_mapper",
+        "_aliases",
+        "_order_by",
+    )
+
+    def __init__(
+        self,
+        query: Select,
+        session: Session,
+        mappers: Sequence[_Mapper],
+        batched: bool = False,
+        cache_policy: CachePolicy | None = None,
+        identity_map: IdentityMap | None = None,
+        entity_mappers: Sequence[EntityMapper] = (),
+        lookup_mapper: EntityMapper | None = None,
+        aliases: Sequence[tuple[str, str]] = (),
+        order_by: Sequence[ColumnElement] = (),
+    ):
         self._query = query
         self._session = session
         self._mappers = mappers
+        self._batched = batched
+        self._cache_policy = cache_policy
+        self._identity_map = identity_map
+        self._entity_mappers = entity_mappers
+        self._lookup_mapper = lookup_mapper
+        # labels of deduplicated columns (alias, selected label)
+        self._aliases = aliases
+        # ordering of the query completed by primary key, so that order of records is unique
+        self._order_by = order_by
+
+    @property
+    def query(self) -> Select:
+        return self._query
 
     def execute(self) -> Iterator:
-        if not self._mappers:
-            yield from self._session.execute(self._query).__iter__()
-        else:
-            for row in self._session.execute(self._query):
-                yield self._map_child_entities(row)
+        yield from self._materialize(self._execute(self._query))
+
+    def execute_with_limit(self, limit: int) -> tuple[Iterable, bool]:
+        """
+        Executes query returning at most limit records, together with flag whether query has
+        more of them. One additional row is fetched to detect it, but it is not materialized
+        (so that it is not part of the batch of returned records).
+        """
+        rows = list(self._execute(self._query.limit(limit + 1)))
+        return self._materialize(rows[:limit]), len(rows) > limit
 
     def execute_with_pagination(self, page: int, page_size: int) -> Iterator:
         paged_query = self._query.limit(page_size).offset(page * page_size)
-        if not self._mappers:
-            yield from self._session.execute(paged_query).__iter__()
-        else:
-            for row in self._session.execute(self._query):
-                yield self._map_child_entities(row)
+        yield from self._materialize(self._execute(paged_query))
+
+    def execute_with_partitioned_pagination(
+        self, partition_by: Sequence[str], page: int, page_size: int
+    ) -> Iterator:
+        """
+        Executes query returning at most a single page of records for each distinct value of
+        partition columns. Records are returned ordered by partition (and by order of the
+        query within partition, so that pages are stable across requests).
+        """
+        windowed = self._get_windowed_query(partition_by)
+        row_number = windowed.columns[_ROW_NUMBER_LABEL]
+        paged_query = (
+            select(*(column for column in windowed.columns if column is not row_number))
+            .where(row_number > page * page_size, row_number <= (page + 1) * page_size)
+            .order_by(*(windowed.columns[name] for name in partition_by), row_number)
+        )
+        yield from self._materialize(self._execute(paged_query), as_records=True)
+
+    def execute_with_partitioned_limit(
+        self, partition_by: Sequence[str], limit: int
+    ) -> tuple[Iterable, set[tuple]]:
+        """
+        Executes query returning at most limit records for each distinct value of partition
+        columns, together with values of partitions which have more of them (detected as by
+        execute_with_limit).
+        """
+        windowed = self._get_windowed_query(partition_by)
+        row_number = windowed.columns[_ROW_NUMBER_LABEL]
+        limited_query = (
+            select(*windowed.columns)
+            .where(row_number <= limit + 1)
+            .order_by(*(windowed.columns[name] for name in partition_by), row_number)
+        )
+        rows = []
+        truncated = set()
+        for row in self._execute(limited_query):
+            mapping = row._mapping
+            if mapping[_ROW_NUMBER_LABEL] > limit:
+                truncated.add(tuple(mapping[name] for name in partition_by))
+            else:
+                rows.append(row)
+        records = list(self._materialize(rows, as_records=True))
+        for record in records:
+            del record[_ROW_NUMBER_LABEL]
+        return records, truncated
+
+    def _get_windowed_query(self, partition_by: Sequence[str]) -> Subquery:
+        """
+        Returns query numbering its records within partitions (in order of the query).
+        """
+        query = self._query
+        partition_columns = [query.selected_columns[name] for name in partition_by]
+        return (
+            query.add_columns(
+                func.row_number()
+                .over(partition_by=partition_columns, order_by=self._order_by)
+                .label(_ROW_NUMBER_LABEL)
+            )
+            .order_by(None)
+            .subquery()
+        )
+
+    def lookup_materialized(self, keys: Sequence[tuple]) -> dict[tuple, Record]:
+        """
+        Returns records with given primary keys, which were already materialized in the
+        request with all requested fields (records are not looked up if query joins
+        anything or node does not select all rows of the table).
+        """
+        identity_map = self._identity_map
+        mapper = self._lookup_mapper
+        if identity_map is None or mapper is None:
+            return {}
+
+        records = {}
+        for key in keys:
+            values = mapper.lookup(key, identity_map)
+            if values is not None:
+                records[key] = self._add_aliases(Record(values))
+        return records
 
     def record_count(self) -> int:
         page_info_query = self._query.with_only_columns(
@@ -213,45 +821,255 @@ class QueryExecutor:
         ).order_by(None)
         # alternative
         # page_info_query = select(func.count()).select_from(self._query.order_by(None).subquery())
-        return self._session.execute(page_info_query).scalar_one()
+        return next(iter(self._execute(page_info_query)))[0]
+
+    def partitioned_record_count(self, partition_by: Sequence[str]) -> dict[tuple, int]:
+        partition_columns = [self._query.selected_columns[name].element for name in partition_by]
+        count_query = (
+            self._query.with_only_columns(
+                *partition_columns, func.count(), maintain_column_froms=True
+            )
+            .group_by(*partition_columns)
+            .order_by(None)
+        )
+        return {tuple(row[:-1]): row[-1] for row in self._execute(count_query)}
+
+    def materialize(self, records: Iterable[Record]) -> list[Record]:
+        """
+        Maps records of rows selected by the query as part of other query (such as branch of
+        union). Records of each level are batched together.
+        """
+        if self._identity_map is not None and self._entity_mappers:
+            records = list(records)
+            for record in records:
+                for mapper in self._entity_mappers:
+                    mapper.register(record, self._identity_map)
+
+        levels: dict[str, list[Record]] = {mapper.prefix: [] for mapper in self._mappers}
+        result = [self._map_child_entities(record, levels) for record in records]
+        RecordBatch.attach(result)
+        for level_records in levels.values():
+            RecordBatch.attach(level_records)
+        return result
+
+    def _execute(self, query: Select) -> Iterable[Row]:
+        if self._cache_policy is None:
+            return self._session.execute(query)
+        return self._cache_policy.execute(query, self._session)
+
+    def _register_entities(
+        self, result: Iterable[Row], identity_map: IdentityMap
+    ) -> Iterator[Row]:
+        for row in result:
+            mapping = row._mapping
+            for mapper in self._entity_mappers:
+                mapper.register(mapping, identity_map)
+            yield row
+
+    def _materialize(self, result: Iterable[Row], as_records: bool = False) -> Iterable:
+        if self._identity_map is not None and self._entity_mappers:
+            result = self._register_entities(result, self._identity_map)
+
+        if self._batched:
+            levels: dict[str, list[Record]] = {mapper.prefix: [] for mapper in self._mappers}
+            records = [self._map_child_entities(Record.from_row(row), levels) for row in result]
+            RecordBatch.attach(records)
+            for level_records in levels.values():
+                RecordBatch.attach(level_records)
+            return records
+        elif not self._mappers and not self._aliases and not as_records:
+            return result
+        else:
+            return (self._map_child_entities(Record.from_row(row)) for row in result)
+
+    def _add_aliases(self, record: Record) -> Record:
+        for alias, label in self._aliases:
+            record[alias] = record[label]
+        return record
 
-    def _map_child_entities(self, row: Row) -> Record:
-        record = Record.from_row(row)
+    def _map_child_entities(
+        self, record: Record, levels: dict[str, list[Record]] | None = None
+    ) -> Record:
+        record = self._add_aliases(record)
         for mapper in self._mappers:
             child_record = Record()
-            entity_exists = False
+            entity_exists = mapper.required
             for name, value in record.items():
                 if name == mapper.prefix:
                     entity_exists = bool(value)
                 elif name.startswith(mapper.prefix):
                     child_record[name[len(mapper.prefix) :]] = value
 
-            if not entity_exists or len(child_record) == 0:
-                continue
-
             base_record = record
             for path_segment in mapper.path[:-1]:
                 seg_record = base_record.get(path_segment)
                 if seg_record is None:
+                    if not entity_exists:
+                        break
                     seg_record = base_record[path_segment] = Record()
                 base_record = seg_record
-
-            base_record[mapper.path[-1]] = child_record
+            else:
+                # missing entity is stored as well, so that it is known to be joined
+                base_record[mapper.path[-1]] = child_record if entity_exists else None
+                if levels is not None and entity_exists:
+                    levels[mapper.prefix].append(child_record)
         return record
 
 
-class QueryBuilder:
-    __slots__ = ("_root_rule", "_arg_rules")
+def _get_entity_table(query: Select) -> Table | None:
+    """
+    Returns table if each row selected by query is a row of that table.
+    """
+    if query._group_by_clauses or query._having_criteria or query._distinct:
+        return None
+
+    froms = query.get_final_froms()
+    if len(froms) == 1 and isinstance(froms[0], Table) and froms[0].primary_key:
+        return froms[0]
+    return None
+
+
+class _EntityCollector:
+    """
+    Collects labels of table columns selected for entities of query result (root records and
+    inline objects), so that entities can be registered in identity map. Root entity is
+    complete if all requested fields of root records are its columns.
+    """
+
+    __slots__ = ("_entities", "complete")
+
+    def __init__(self, root_table: Table | None):
+        self._entities: dict[str, tuple[Table, dict[str, str]]] = {}
+        self.complete = root_table is not None
+        if root_table is not None:
+            self._entities[""] = (root_table, {})
+
+    def enter(self, prefix: str, table: Table) -> None:
+        self._entities[prefix] = (table, {})
+
+    def add(self, prefix: str, label: str, selectable: ColumnElement) -> None:
+        entity = self._entities.get(prefix)
+        if entity is not None and isinstance(selectable, Column) and selectable.table is entity[0]:
+            entity[1][label] = selectable.name
+        elif not prefix:
+            self.complete = False
+
+    def build(self, projection: _Projection) -> dict[str, EntityMapper]:
+        """
+        Builds mappers of collected entities, primary key columns which were not requested
+        are added to projection.
+        """
+        mappers = {}
+        for prefix, (table, column_labels) in self._entities.items():
+            labels_by_column = {column: label for label, column in column_labels.items()}
+            key_labels = []
+            for column in table.primary_key.columns:
+                label = labels_by_column.get(column.name)
+                if label is None:
+                    label = projection.add(column, f"{prefix}__{column.name}")
+                    column_labels[label] = column.name
+                key_labels.append(label)
+            mappers[prefix] = EntityMapper(table.fullname, key_labels, column_labels)
+        return mappers
+
+
+class _Projection:
+    """
+    Selected columns deduplicated by identity. Each column is selected once (under the label
+    it was first requested with), other labels requested for it are aliases of that label.
+    """
+
+    __slots__ = ("_labels", "aliases")
+
+    def __init__(self) -> None:
+        self._labels: dict[ColumnElement, str] = {}
+        self.aliases: list[tuple[str, str]] = []
+
+    def __bool__(self) -> bool:
+        return bool(self._labels)
+
+    def add(self, selectable: ColumnElement, label: str) -> str:
+        """
+        Requests column under given label, returns label under which it is selected.
+        """
+        selected_label = self._labels.setdefault(selectable, label)
+        if selected_label != label and (label, selected_label) not in self.aliases:
+            self.aliases.append((label, selected_label))
+        return selected_label
+
+    def get_columns(self) -> list[ColumnElement]:
+        return [
+            selectable if getattr(selectable, "name", None) == label else selectable.label(label)
+            for selectable, label in self._labels.items()
+        ]
 
-    def __init__(self, root_rule: InlineObjectRule, arg_rules: Sequence[ArgumentRule] = ()):
+
+class QueryBuilder:
+    __slots__ = (
+        "_root_rule",
+        "_arg_rules",
+        "_cache_policy",
+        "_root_table",
+        "_lookup_table",
+        "_limited",
+        "_order_by",
+        "_primary_key",
+    )
+
+    def __init__(
+        self,
+        root_rule: InlineObjectRule,
+        arg_rules: Sequence[ArgumentRule] = (),
+        cache_policy: CachePolicy | None = None,
+        identity_map: bool = False,
+    ):
         self._root_rule = root_rule
         self._arg_rules = arg_rules
+        self._cache_policy = cache_policy
+        base_query = root_rule.base_query
+        entity_table = _get_entity_table(base_query)
+        self._root_table = entity_table if identity_map else None
+        self._limited = (
+            base_query._limit_clause is not None or base_query._offset_clause is not None
+        )
+        # records can be looked up in identity map only if node selects all rows of the table
+        self._lookup_table = (
+            self._root_table if base_query.whereclause is None and not self._limited else None
+        )
+        # ordering is kept, so that it can be extended by rules and reproduced by executor
+        self._order_by: Sequence[ColumnElement] = base_query._order_by_clauses
+        self._primary_key = (
+            list(entity_table.primary_key.columns) if entity_table is not None else []
+        )
 
     @classmethod
     def create(
-        cls, node: AnalyzedNode, arg_transformers: Sequence[ArgumentRule] = ()
+        cls,
+        node: AnalyzedNode,
+        arg_transformers: Sequence[ArgumentRule] = (),
+        result_cache: ResultCache | None = None,
+        identity_map: bool = False,
     ) -> QueryBuilder:
-        return cls(InlineObjectRule.create(node, None), arg_transformers)
+        cache_ttl = node.node.cache_ttl
+        return cls(
+            InlineObjectRule.create(node, None),
+            arg_transformers,
+            CachePolicy(result_cache, cache_ttl)
+            if result_cache is not None and cache_ttl is not None
+            else None,
+            identity_map,
+        )
+
+    @property
+    def cache_policy(self) -> CachePolicy | None:
+        return self._cache_policy
+
+    @property
+    def limited(self) -> bool:
+        """
+        Whether node query is limited (or offset), such query cannot be part of compound select.
+        """
+        return self._limited
 
     def build(
         self,
@@ -260,23 +1078,53 @@ class QueryBuilder:
         args: dict[str, Any],
         session: Session,
         sub_path: Sequence[str] = (),
+        gql_type: GraphQLObjectType | None = None,
+        keep_columns: bool = True,
     ) -> QueryExecutor:
+        """
+        Builds query selecting requested fields. Type of selected objects (if not passed)
+        is determined by return type of the field. If no field is requested, query keeps
+        columns of the node unless keep_columns is False.
+        """
         query = self._root_rule.base_query
 
-        assert len(info.field_nodes) == 1
-        walker = _FieldWalker(info.field_nodes[0], info)
-        requested_fields: list[ColumnElement] = []
+        if gql_type is None:
+            return_type = get_named_type(info.return_type)
+            if isinstance(return_type, GraphQLObjectType):
+                gql_type = return_type
+        walker = _FieldWalker(info.field_nodes, info, gql_type)
+        projection = _Projection()
         mappers: list[_Mapper] = []
+        batched = False
+        identity_map = self._get_identity_map(info)
+        entities = _EntityCollector(self._root_table) if identity_map is not None else None
         for segment in sub_path:
             if not walker.descend(segment):
                 # We may have paged request without actually going into field selection
                 break
         else:
-            processing_queue: deque[_FieldInfo | Literal[-1]] = deque(walker.children())
-            context_queue: deque[tuple[InlineObjectRule, str, Subquery | None]] = deque()
-            context_queue.append((self._root_rule, "", None))
+            processing_queue: deque[SelectedField | Literal[-1]] = deque(walker.children())
+            # context is inner joined if all objects on its path are required
+            context_queue: deque[tuple[InlineObjectRule, str, Subquery | None, bool]] = deque()
+            context_queue.append((self._root_rule, "", None, True))
+            joined_froms: set[FromClause] = set(find_tables(query))
             entity_counter = 1
 
+            def select_link_data(
+                rule: LinkDataRule, alias_prefix: str, current_subquery: Subquery | None
+            ) -> None:
+                for column in rule.selectables:
+                    label = projection.add(
+                        (
+                            assert_not_none(current_subquery.corresponding_column(column))
+                            if current_subquery is not None
+                            else column
+                        ),
+                        f"{alias_prefix}__{column.name}",
+                    )
+                    if entities is not None:
+                        entities.add(alias_prefix, label, column)
+
             return_cmd: Literal[-1] = -1
 
             while processing_queue:
@@ -286,8 +1134,25 @@ class QueryBuilder:
                     context_queue.pop()
                     continue
 
-                current_rule, alias_prefix, current_subquery = context_queue[-1]
+                if field.name.startswith("__"):
+                    # meta fields (such as __typename) are resolved without data
+                    continue
+
+                current_rule, alias_prefix, current_subquery, current_inner = context_queue[-1]
                 transformer = current_rule.fields.get(field.name)
+                if isinstance(transformer, AdaptiveObjectRule):
+                    # link columns are selected even if object is joined, so that distinct
+                    # linked records can be counted
+                    batched = True
+                    select_link_data(transformer.link_data, alias_prefix, current_subquery)
+                    width = sum(
+                        not child.name.startswith("__")
+                        for child in walker.get_selection(field).fields.values()
+                    )
+                    if transformer.statistics.prefer_batch(width):
+                        continue
+                    transformer = transformer.inline
+
                 match transformer:
                     case None:
                         raise InvalidOperationException(
@@ -301,27 +1166,34 @@ class QueryBuilder:
                                 raise InvalidOperationException(
                                     "Cannot select over non named column via subquery"
                                 )
-                            selectable = current_subquery.columns[sql_name]
-                        if sql_name != field.name or alias_prefix:
-                            selectable = selectable.label(f"{alias_prefix}{field.name}")
-                        requested_fields.append(selectable)
-                    case LinkDataRule():
-                        # TODO: determine if columns are already selected and don't reselect
-                        for selectable in transformer.selectables:
-                            sql_name = selectable.name
-                            if current_subquery is not None:
+                            if sql_name in current_subquery.columns:
                                 selectable = current_subquery.columns[sql_name]
-                            requested_fields.append(
-                                selectable.label(f"{alias_prefix}__{sql_name}")
-                            )
+                            else:
+                                # computed field is evaluated over columns of the subquery
+                                selectable = _adapt_to_subquery(selectable, current_subquery)
+                        label = projection.add(selectable, f"{alias_prefix}{field.response_key}")
+                        if entities is not None:
+                            entities.add(alias_prefix, label, transformer.selectable)
+                    case LinkDataRule():
+                        batched = True
+                        select_link_data(transformer, alias_prefix, current_subquery)
                     case InlineObjectRule():
                         alias_prefix = f"__e{entity_counter}_"
                         entity_counter += 1
-
-                        target_from = transformer.reduce_select()
-                        if target_from is not None:
+                        # inner join would drop parents, which are missing themselves
+                        inner = transformer.required and current_inner
+
+                        reduced = transformer.reduce_select()
+                        target_from, join_filter = reduced if reduced is not None else (None, None)
+                        if target_from in joined_froms:
+                            # the same table cannot be joined twice without alias (such as
+                            # aliases of the same link), join it via subquery
+                            target_from = None
+                        presence_column = None
+                        if target_from is not None and not inner:
                             for column in transformer.base_query.selected_columns:
                                 if isinstance(column, Column) and not column.nullable:
+                                    presence_column = column
                                     break
                             else:
                                 # couldn't find column via which we will determine if
@@ -330,59 +1202,148 @@ class QueryBuilder:
 
                         if target_from is not None:
                             subquery = None
-                            requested_fields.append(column.is_not(None).label(alias_prefix))
-                            query = query.outerjoin(
-                                target_from, self._construct_join_clause(transformer.join)
+                            joined_froms.add(target_from)
+                            if presence_column is not None:
+                                projection.add(presence_column.is_not(None), alias_prefix)
+                            entity_table = _get_entity_table(transformer.base_query)
+                            if entities is not None and entity_table is not None:
+                                entities.enter(alias_prefix, entity_table)
+                            condition = self._construct_join_clause(
+                                transformer.join, source_subquery=current_subquery
                             )
+                            if join_filter is not None:
+                                # filter of outer joined table has to be part of join condition
+                                condition = and_(condition, join_filter)
+                            query = query.join(target_from, condition, isouter=not inner)
                         else:
-                            subquery = transformer.base_query.add_columns(
-                                literal(True).label(alias_prefix)
-                            ).alias()
-                            requested_fields.append(subquery.columns[alias_prefix])
-                            query = query.outerjoin(
-                                subquery, self._construct_join_clause(transformer.join, subquery)
+                            target_query = transformer.base_query
+                            assert transformer.join is not None
+                            # columns the object is joined by (and its links are joined or
+                            # loaded by) have to be selected by subquery even if the node
+                            # doesn't select them
+                            join_columns = [
+                                column
+                                for column in dict.fromkeys(
+                                    [
+                                        *transformer.join.remote_columns,
+                                        *transformer.link_columns,
+                                    ]
+                                )
+                                if target_query.selected_columns.corresponding_column(column)
+                                is None
+                            ]
+                            if join_columns:
+                                target_query = target_query.add_columns(*join_columns)
+                            if not inner:
+                                target_query = target_query.add_columns(
+                                    literal(True).label(alias_prefix)
+                                )
+                            subquery = target_query.alias()
+                            if not inner:
+                                projection.add(subquery.columns[alias_prefix], alias_prefix)
+                            query = query.join(
+                                subquery,
+                                self._construct_join_clause(
+                                    transformer.join, subquery, current_subquery
+                                ),
+                                isouter=not inner,
                             )
 
                         # descend into field
-                        walker.descend(field.name)
+                        walker.descend_field(field)
                         processing_queue.appendleft(return_cmd)
                         processing_queue.extendleft(reversed(list(walker.children())))
-                        context_queue.append((transformer, alias_prefix, subquery))
+                        context_queue.append((transformer, alias_prefix, subquery, inner))
 
                         # store mapper for this object
                         mappers.append(
-                            _Mapper(alias_prefix, walker.current_relative_path[len(sub_path) :])
+                            _Mapper(
+                                alias_prefix,
+                                walker.current_relative_path[len(sub_path) :],
+                                inner,
+                            )
                         )
                     case _:
                         raise NotImplementedError(
                             f"Application of transformer '{type(transformer)!r}' is not supported"
                         )
 
-        if requested_fields:
+        entity_mappers: dict[str, EntityMapper] = {}
+        if projection:
+            if entities is not None:
+                entity_mappers = entities.build(projection)
             # Select only requested fields. Otherwise keep selection as is, since we require at
             # least single field (and we may want to do filter on top of it)
-            query = query.with_only_columns(*requested_fields)
+            query = query.with_only_columns(*projection.get_columns())
+        elif not keep_columns:
+            query = query.with_only_columns(maintain_column_froms=True)
 
+        order_by = self._order_by
         for rule in self._arg_rules:
             query = rule.apply(query, root, info, args)
+            order_by = rule.get_order_by(query, order_by, args)
+        if order_by is not self._order_by:
+            query = query.order_by(None).order_by(*order_by)
+
+        return QueryExecutor(
+            query,
+            session,
+            mappers,
+            batched,
+            self._cache_policy,
+            identity_map,
+            list(entity_mappers.values()),
+            entity_mappers.get("")
+            if entities is not None
+            and entities.complete
+            and not mappers
+            and self._lookup_table is not None
+            else None,
+            projection.aliases,
+            [
+                *order_by,
+                *(
+                    column
+                    for column in self._primary_key
+                    if not any(column is ordered for ordered in order_by)
+                ),
+            ],
+        )
 
-        return QueryExecutor(query, session, mappers)
+    def _get_identity_map(self, info: GraphQLResolveInfo) -> IdentityMap | None:
+        # modifications done by mutations would not be visible in materialized entities
+        if self._root_table is None or info.operation.operation != OperationType.QUERY:
+            return None
+        return get_request_state(info.context, info.variable_values).identity_map
 
     @classmethod
     def _construct_join_clause(
-        cls, join: JoinPoint | None, target_subquery: Subquery | None = None
+        cls,
+        join: JoinPoint | None,
+        target_subquery: Subquery | None = None,
+        source_subquery: Subquery | None = None,
     ) -> ColumnElement:
         if join is None:
             raise ValueError("Cannot construct join clause without join point")
 
-        joins = join.joins
+        if join.condition is not None:
+            replacements: dict[Column, ColumnElement] = {}
+            for column in iterate(join.condition):
+                if not isinstance(column, Column):
+                    continue
+                subquery = source_subquery if column in join.condition_columns else target_subquery
+                if subquery is not None:
+                    replacements[column] = assert_not_none(subquery.corresponding_column(column))
+            return _replace_columns(join.condition, replacements)
+
+        conditions = []
+        source: ColumnElement
         target: ColumnElement
-        source, target = joins[0]
-        if target_subquery is not None:
-            target = target_subquery.columns[target.name]
-        condition = source == target
-        for source, target in joins[1:]:
+        for left, right in join.joins:
+            source, target = left, right
+            if source_subquery is not None:
+                source = assert_not_none(source_subquery.corresponding_column(left))
             if target_subquery is not None:
-                target = target_subquery.columns[target.name]
-            condition = condition and (source == target)
-        return condition
+                target = assert_not_none(target_subquery.corresponding_column(right))
+            conditions.append(source == target)
+        return and_(*conditions)
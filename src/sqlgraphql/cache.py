@@ -0,0 +1,451 @@
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from collections.abc import Callable, Collection, Iterable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any
+
+from sqlalchemy import Connection, Engine, Table, event
+from sqlalchemy.orm import Session, UOWTransaction, object_mapper, sessionmaker
+from sqlalchemy.sql.dml import UpdateBase
+
+
+@dataclass(frozen=True, slots=True)
+class CacheEntry:
+    rows: Sequence[Any]
+    versions: Mapping[str, int]
+    expires_at: float
+
+
+class CacheBackend(ABC):
+    """
+    Storage of cached results and of versions of tables which results were read from.
+    Implementations should be safe to use from multiple threads.
+    """
+
+    @abstractmethod
+    def __len__(self) -> int:
+        pass
+
+    @abstractmethod
+    def get(self, key: str) -> CacheEntry | None:
+        """
+        Returns entry and marks it as recently used. Entries read from outdated versions of
+        tables are removed instead.
+        """
+
+    @abstractmethod
+    def set(self, key: str, entry: CacheEntry) -> None:
+        """
+        Stores entry unless it was read from outdated versions of tables. Least recently used
+        entries are evicted once the backend is full.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        pass
+
+    @abstractmethod
+    def clear(self) -> None:
+        pass
+
+    @abstractmethod
+    def get_versions(self, tables: Collection[str]) -> Mapping[str, int]:
+        pass
+
+    @abstractmethod
+    def bump_versions(self, tables: Collection[str]) -> None:
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """
+    Keeps entries in process memory, up to max_entries entries.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        if max_entries <= 0:
+            raise ValueError("Cache should allow at least single entry")
+        self._max_entries = max_entries
+        self._entries: OrderedDict[str, CacheEntry] = OrderedDict()
+        self._keys_by_table: dict[str, set[str]] = {}
+        self._table_versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> CacheEntry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if not self._is_current(entry.versions):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        with self._lock:
+            if not self._is_current(entry.versions):
+                return
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = entry
+            for table in entry.versions:
+                self._keys_by_table.setdefault(table, set()).add(key)
+
+            while len(self._entries) > self._max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_table.clear()
+
+    def get_versions(self, tables: Collection[str]) -> Mapping[str, int]:
+        with self._lock:
+            return {table: self._table_versions.get(table, 0) for table in tables}
+
+    def bump_versions(self, tables: Collection[str]) -> None:
+        with self._lock:
+            for table in tables:
+                self._table_versions[table] = self._table_versions.get(table, 0) + 1
+                for key in list(self._keys_by_table.get(table, ())):
+                    self._remove(key)
+
+    def _is_current(self, versions: Mapping[str, int]) -> bool:
+        table_versions = self._table_versions
+        return all(table_versions.get(table, 0) == version for table, version in versions.items())
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        for table in entry.versions:
+            keys = self._keys_by_table[table]
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_table[table]
+
+
+class SQLiteCacheBackend(CacheBackend):
+    """
+    Keeps entries in SQLite file, so that cache survives restarts and can be shared by worker
+    processes on the same host. Entries are keyed by fingerprint of the query, their rows are
+    pickled and compressed. Least recently used entries are evicted once total size of stored
+    rows exceeds max_size bytes.
+
+    Versions of tables are stored in the same file, so invalidation done by one process is
+    visible to all others. Since rows are unpickled, the file should never be writable by
+    untrusted parties.
+    """
+
+    _SCHEMA = """
+        CREATE TABLE IF NOT EXISTS cache_entries (
+            fingerprint BLOB PRIMARY KEY,
+            data BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            versions TEXT NOT NULL,
+            expires_at REAL NOT NULL,
+            accessed_at INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS cache_entries_accessed_at ON cache_entries (accessed_at);
+        CREATE TABLE IF NOT EXISTS cache_table_versions (
+            name TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        max_size: int = 64 * 1024 * 1024,
+        compression_level: int = 6,
+        timeout: float = 5.0,
+    ):
+        if max_size <= 0:
+            raise ValueError("Cache should allow at least single byte")
+        self._max_size = max_size
+        self._compression_level = compression_level
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(
+            path, timeout=timeout, isolation_level=None, check_same_thread=False
+        )
+        with self._lock:
+            self._connection.executescript(self._SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            (count,) = self._connection.execute("SELECT COUNT(*) FROM cache_entries").fetchone()
+            return count
+
+    def get(self, key: str) -> CacheEntry | None:
+        fingerprint = self._fingerprint(key)
+        with self._lock, self._transaction() as connection:
+            row = connection.execute(
+                "SELECT data, versions, expires_at FROM cache_entries WHERE fingerprint = ?",
+                (fingerprint,),
+            ).fetchone()
+            if row is None:
+                return None
+
+            data, versions, expires_at = row
+            versions = json.loads(versions)
+            if not self._is_current(connection, versions):
+                connection.execute(
+                    "DELETE FROM cache_entries WHERE fingerprint = ?", (fingerprint,)
+                )
+                return None
+
+            connection.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE fingerprint = ?",
+                (self._next_access(connection), fingerprint),
+            )
+
+        rows = pickle.loads(zlib.decompress(data))  # noqa: S301 (file is trusted, see above)
+        return CacheEntry(rows, versions, expires_at)
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        data = zlib.compress(
+            pickle.dumps(list(entry.rows), pickle.HIGHEST_PROTOCOL), self._compression_level
+        )
+        if len(data) > self._max_size:
+            return
+
+        fingerprint = self._fingerprint(key)
+        with self._lock, self._transaction() as connection:
+            if not self._is_current(connection, entry.versions):
+                return
+
+            connection.execute(
+                "INSERT OR REPLACE INTO cache_entries VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    fingerprint,
+                    data,
+                    len(data),
+                    json.dumps(dict(entry.versions)),
+                    entry.expires_at,
+                    self._next_access(connection),
+                ),
+            )
+            self._evict(connection)
+
+    def delete(self, key: str) -> None:
+        with self._lock, self._transaction() as connection:
+            connection.execute(
+                "DELETE FROM cache_entries WHERE fingerprint = ?", (self._fingerprint(key),)
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._transaction() as connection:
+            connection.execute("DELETE FROM cache_entries")
+
+    def get_versions(self, tables: Collection[str]) -> Mapping[str, int]:
+        with self._lock:
+            return self._get_versions(self._connection, tables)
+
+    def bump_versions(self, tables: Collection[str]) -> None:
+        # entries of bumped tables are left to be removed on access or by eviction
+        with self._lock, self._transaction() as connection:
+            connection.executemany(
+                "INSERT INTO cache_table_versions VALUES (?, 1) "
+                "ON CONFLICT (name) DO UPDATE SET version = version + 1",
+                [(table,) for table in tables],
+            )
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        connection = self._connection
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield connection
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        else:
+            connection.execute("COMMIT")
+
+    @classmethod
+    def _fingerprint(cls, key: str) -> bytes:
+        return hashlib.sha256(key.encode()).digest()
+
+    @classmethod
+    def _next_access(cls, connection: sqlite3.Connection) -> int:
+        (last_access,) = connection.execute(
+            "SELECT MAX(accessed_at) FROM cache_entries"
+        ).fetchone()
+        return (last_access or 0) + 1
+
+    @classmethod
+    def _get_versions(
+        cls, connection: sqlite3.Connection, tables: Collection[str]
+    ) -> dict[str, int]:
+        versions = dict.fromkeys(tables, 0)
+        if versions:
+            versions.update(
+                connection.execute(
+                    "SELECT name, version FROM cache_table_versions WHERE name IN "  # noqa: S608
+                    f"({', '.join('?' * len(versions))})",
+                    list(versions),
+                ).fetchall()
+            )
+        return versions
+
+    @classmethod
+    def _is_current(cls, connection: sqlite3.Connection, versions: Mapping[str, int]) -> bool:
+        return cls._get_versions(connection, versions.keys()) == versions
+
+    def _evict(self, connection: sqlite3.Connection) -> None:
+        (total_size,) = connection.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+        if total_size <= self._max_size:
+            return
+
+        evicted = []
+        for fingerprint, size in connection.execute(
+            "SELECT fingerprint, size FROM cache_entries ORDER BY accessed_at"
+        ):
+            evicted.append((fingerprint,))
+            total_size -= size
+            if total_size <= self._max_size:
+                break
+        connection.executemany("DELETE FROM cache_entries WHERE fingerprint = ?", evicted)
+
+
+class ResultCache:
+    """
+    Cache of query results shared between requests. Results are cached only for nodes which
+    define cache TTL. Entries are stored by the backend (in process memory by default).
+
+    Every entry is tagged with versions of tables which it was read from. Entry is stale once
+    version of any of its tables is bumped, either by explicit invalidation or by tracked
+    sessions and engines which modify the table.
+    """
+
+    def __init__(
+        self, backend: CacheBackend | None = None, clock: Callable[[], float] = time.time
+    ):
+        self._backend = backend if backend is not None else MemoryCacheBackend()
+        self._clock = clock
+
+    def __len__(self) -> int:
+        return len(self._backend)
+
+    def get_versions(self, tables: Collection[str]) -> Mapping[str, int]:
+        return self._backend.get_versions(tables)
+
+    def get(self, key: str) -> Sequence[Any] | None:
+        entry = self._backend.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= self._clock():
+            self._backend.delete(key)
+            return None
+        return entry.rows
+
+    def set(self, key: str, rows: Sequence[Any], versions: Mapping[str, int], ttl: float) -> None:
+        """
+        Stores rows which were read when tables were at given versions (versions should be
+        retrieved before query is executed). Outdated rows are not stored.
+        """
+        self._backend.set(key, CacheEntry(rows, dict(versions), self._clock() + ttl))
+
+    def invalidate(self, *tables: Table | str) -> None:
+        self._backend.bump_versions(
+            [table.fullname if isinstance(table, Table) else table for table in tables]
+        )
+
+    def has_pending_changes(self, session: Session, tables: Collection[str]) -> bool:
+        """
+        Returns True if session modified any of the tables in its current transaction. Such
+        session should not read from or write to the cache, since it sees uncommitted data.
+        """
+        pending = session.info.get(self, set()) | (
+            session.connection().info.get(self, set()) if session.in_transaction() else set()
+        )
+        return not pending.isdisjoint(tables)
+
+    def clear(self) -> None:
+        self._backend.clear()
+
+    def track_session(self, target: Session | sessionmaker | type[Session]) -> None:
+        """
+        Invalidates tables of entities which were flushed by the session. Tables are
+        invalidated on flush (so that session does not read its own stale data) and again
+        after commit (so that data read by others during transaction is not kept).
+        """
+        event.listen(target, "after_flush", self._on_after_flush)
+        event.listen(target, "after_commit", self._on_after_commit)
+        event.listen(target, "after_rollback", self._on_after_rollback)
+
+    def track_engine(self, target: Engine | Connection) -> None:
+        """
+        Invalidates tables modified by DML statements executed on the engine. Tables are
+        invalidated on execution and again on commit.
+        """
+        event.listen(target, "after_execute", self._on_after_execute)
+        event.listen(target, "commit", self._on_commit)
+        event.listen(target, "rollback", self._on_rollback)
+
+    def _add_pending(self, info: dict, tables: Iterable[str]) -> None:
+        pending: set[str] = info.setdefault(self, set())
+        pending.update(tables)
+        self.invalidate(*tables)
+
+    def _flush_pending(self, info: dict) -> None:
+        pending = info.pop(self, None)
+        if pending:
+            self.invalidate(*pending)
+
+    def _on_after_flush(self, session: Session, flush_context: UOWTransaction) -> None:
+        tables = {
+            table.fullname
+            for instance in (*session.new, *session.dirty, *session.deleted)
+            for table in object_mapper(instance).tables
+        }
+        if tables:
+            self._add_pending(session.info, tables)
+
+    def _on_after_commit(self, session: Session) -> None:
+        self._flush_pending(session.info)
+
+    def _on_after_rollback(self, session: Session) -> None:
+        session.info.pop(self, None)
+
+    def _on_after_execute(
+        self,
+        conn: Connection,
+        clauseelement: Any,
+        multiparams: Any,
+        params: Any,
+        execution_options: Any,
+        result: Any,
+    ) -> None:
+        if isinstance(clauseelement, UpdateBase) and isinstance(clauseelement.table, Table):
+            self._add_pending(conn.info, [clauseelement.table.fullname])
+
+    def _on_commit(self, conn: Connection) -> None:
+        self._flush_pending(conn.info)
+
+    def _on_rollback(self, conn: Connection) -> None:
+        conn.info.pop(self, None)
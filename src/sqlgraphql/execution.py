@@ -0,0 +1,37 @@
+from collections.abc import MutableMapping
+from typing import Any
+
+from graphql import ExecutionContext, ExecutionResult, GraphQLError, OperationDefinitionNode
+
+from sqlgraphql._context import get_request_state
+from sqlgraphql._cost import COST_EXTENSION, QueryCostAnalyzer
+
+
+class GQLExecutionContext(ExecutionContext):
+    """
+    Execution context which reports data collected by resolvers (such as truncated lists) in
+    extensions of the execution result. If schema defines maximum query cost, operations are
+    rejected before execution when their estimated cost exceeds it (otherwise root fields
+    reject them when resolved). It should be passed as `execution_context_class` to `graphql`
+    or `graphql_sync`.
+    """
+
+    def execute_operation(self, operation: OperationDefinitionNode, root_value: Any) -> Any:
+        cost_analyzer = (self.schema.extensions or {}).get(COST_EXTENSION)
+        if isinstance(cost_analyzer, QueryCostAnalyzer):
+            cost_analyzer.check(
+                self.context_value, self.schema, self.fragments, self.variable_values, operation
+            )
+
+        return super().execute_operation(operation, root_value)
+
+    # Base implementation is static method, but it is always called on bound instance.
+    def build_response(  # type: ignore[override]
+        self, data: dict[str, Any] | None, errors: list[GraphQLError]
+    ) -> ExecutionResult:
+        result = ExecutionContext.build_response(data, errors)
+        if isinstance(self.context_value, MutableMapping):
+            extensions = get_request_state(self.context_value, self.variable_values).extensions
+            if extensions:
+                result.extensions = {**(result.extensions or {}), **extensions}
+        return result
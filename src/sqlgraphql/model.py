@@ -1,14 +1,118 @@
 from __future__ import annotations
 
-from collections.abc import Mapping
+import enum
+import os
+from collections.abc import Callable, Mapping, Sequence
 from dataclasses import dataclass, field
+from typing import Any, Literal
 
-from sqlalchemy import Select
+from sqlalchemy import Column, ColumnElement, Select, Table
+
+
+@dataclass(frozen=True)
+class MemoryResidency:
+    """
+    Marks node as small reference table whose records are kept in memory. Links pointing to
+    such node are resolved by key lookup instead of SQL join. Records are reloaded after ttl
+    seconds (if set) or once any of the node tables is invalidated in result cache.
+
+    If snapshot_dir is set, records are stored in memory-mapped snapshot file in that directory
+    shared by all processes (and kept between restarts) instead of private memory of each
+    process. Process reloading records atomically replaces the file, other processes switch
+    to the new file on next access. TTL is required with snapshot file, since invalidations
+    done before restart are not known to restarted processes.
+    """
+
+    ttl: float | None = None
+    snapshot_dir: str | os.PathLike[str] | None = None
+
+    def __post_init__(self) -> None:
+        if self.ttl is not None and self.ttl <= 0:
+            raise ValueError("TTL of memory-resident records should be positive")
+        if self.snapshot_dir is not None and self.ttl is None:
+            raise ValueError("TTL of memory-resident records is required with snapshot file")
+
+
+class LinkStrategy(enum.Enum):
+    """
+    How records of n-1 link are loaded. JOIN joins them to query of parent records, BATCH
+    loads them by separate query for all parents of the batch (distinct link keys are looked
+    up by IN), so that columns of linked record are not repeated for each parent. AUTO
+    decides for each query from numbers of parent and distinct linked records (estimated rows
+    of the nodes, later observed results) and number of selected columns.
+    """
+
+    JOIN = "join"
+    BATCH = "batch"
+    AUTO = "auto"
+
+
+class LinkHierarchy(enum.Enum):
+    """
+    Turns self-referencing link into list of all records reachable by repeatedly following it
+    (up to requested depth). DESCENDANTS follows link to child records, ANCESTORS link to
+    parent record. Records of all parents are loaded by single recursive query.
+    """
+
+    DESCENDANTS = "descendants"
+    ANCESTORS = "ancestors"
 
 
 @dataclass(frozen=True, eq=False)
 class Link:
+    """
+    Link to records of the node. Relation is determined from foreign keys between tables of
+    the nodes, or of association table linking them (through, which is auto-detected among
+    tables of the same metadata if there is no direct relation).
+
+    Custom relation is defined by pairs of joined columns (source column, remote column) or by
+    arbitrary join condition (on). Link is single if the pairs cover primary key of remote
+    table, unless kind is set. Kind of link with join condition has to be set.
+
+    Hierarchy link walks self-referencing relation of the table recursively up to requested
+    depth, which cannot exceed max_depth (100 levels if not set), so that cycles in the data
+    don't make the query recurse forever.
+    """
+
     node: QueryableNode
+    pageable: bool = False
+    default_limit: int | None = None
+    max_rows: int | None = None
+    estimated_rows: int | None = None
+    strategy: LinkStrategy = LinkStrategy.JOIN
+    through: Table | None = None
+    on: Sequence[tuple[Column, Column]] | ColumnElement[bool] | None = None
+    kind: Literal["single", "multiple"] | None = None
+    hierarchy: LinkHierarchy | None = None
+    max_depth: int | None = None
+
+
+@dataclass(frozen=True, eq=False)
+class Expression:
+    """
+    Field computed by SQL expression over columns of the node query. Expression is selected
+    only if the field is requested and it can be filtered and sorted by as any other field.
+    GQL type of the field is determined by python type (or by SQL type of the expression).
+    """
+
+    expression: ColumnElement
+    python_type: type | None = None
+    required: bool = False
+
+
+@dataclass(frozen=True, eq=False)
+class BatchResolver:
+    """
+    Field resolved in python for all records of the same level at once (such as by model
+    scoring the whole batch). Function receives values of required columns of each record
+    (mapped by column names) and returns values of the field in the same order. Required
+    columns are selected whenever the field is requested.
+    """
+
+    function: Callable[[Sequence[Mapping[str, Any]]], Sequence[Any]]
+    python_type: type
+    requires: Sequence[Column]
+    required: bool = False
 
 
 @dataclass(frozen=True, eq=False)
@@ -16,6 +120,10 @@ class QueryableNode:
     name: str
     query: Select
     extra: Mapping[str, Extra] = field(default_factory=dict)
+    estimated_rows: int | None = None
+    cache_ttl: float | None = None
+    memory_resident: MemoryResidency | None = None
+    implements_node: bool = False
 
     def define_field(self, name: str, data: Extra) -> None:
         extra = dict(self.extra)
@@ -23,5 +131,25 @@ class QueryableNode:
         object.__setattr__(self, "extra", extra)
 
 
+@dataclass(frozen=True, eq=False)
+class PolymorphicNode:
+    """
+    Union of records of several nodes (such as feed of different items). Records of all
+    members are loaded by single UNION ALL query, each member selects only columns requested
+    for its type. Records are ordered by columns in order_by (names of columns selected by
+    each member query), if set.
+    """
+
+    name: str
+    members: Sequence[QueryableNode]
+    order_by: Sequence[str] = ()
+    descending: bool = False
+    estimated_rows: int | None = None
+
+    def __post_init__(self) -> None:
+        if not self.members:
+            raise ValueError("Polymorphic node should have at least one member")
+
+
 LinkType = QueryableNode | Link
-Extra = LinkType
+Extra = LinkType | Expression | BatchResolver
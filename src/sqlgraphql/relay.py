@@ -0,0 +1,26 @@
+import base64
+import json
+from collections.abc import Sequence
+from typing import Any
+
+
+def to_global_id(type_name: str, key: Sequence[Any]) -> str:
+    """
+    Encodes name of GQL type and values of primary key into opaque global ID.
+    """
+    payload = json.dumps([type_name, *key], default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def from_global_id(global_id: str) -> tuple[str, Sequence[Any]]:
+    """
+    Decodes global ID into name of GQL type and values of primary key.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(global_id.encode()))
+    except ValueError:
+        payload = None
+
+    if not isinstance(payload, list) or not payload or not isinstance(payload[0], str):
+        raise ValueError(f"Invalid global ID '{global_id}'")
+    return payload[0], payload[1:]
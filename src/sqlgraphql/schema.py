@@ -1,27 +1,44 @@
 from __future__ import annotations
 
+import copy
 from collections.abc import Callable
 
 from graphql import (
     GraphQLArgument,
     GraphQLField,
     GraphQLList,
+    GraphQLNonNull,
     GraphQLObjectType,
     GraphQLSchema,
+    GraphQLUnionType,
+    default_field_resolver,
 )
 from graphql.pyutils import snake_to_camel
 
-from sqlgraphql._ast import Analyzer
+from sqlgraphql._ast import Analyzer, get_primary_key_fields
 from sqlgraphql._builders.enum import EnumBuilder
 from sqlgraphql._builders.filtering.builder import FilteringArgumentBuilder
 from sqlgraphql._builders.pagination import OffsetPagedArgumentBuilder
+from sqlgraphql._builders.relay import NodeInterfaceBuilder
 from sqlgraphql._builders.selecting import ObjectBuilder
 from sqlgraphql._builders.sorting import SortableArgumentBuilder
+from sqlgraphql._cost import (
+    COST_EXTENSION,
+    CostLimitedResolver,
+    ListCardinality,
+    QueryCostAnalyzer,
+    build_cost_extensions,
+)
 from sqlgraphql._gql import ScalarTypeRegistry, TypeMap
+from sqlgraphql._limits import RowLimits
 from sqlgraphql._orm import TypeRegistry
-from sqlgraphql._resolvers import ListResolver
-from sqlgraphql._transformers import QueryBuilder
-from sqlgraphql.model import QueryableNode
+from sqlgraphql._polymorphic import PolymorphicQueryBuilder, resolve_member_type
+from sqlgraphql._resolvers import ListResolver, SingleResolver
+from sqlgraphql._transformers import ApplyKeyLookupRule, QueryBuilder
+from sqlgraphql._utils import assert_not_none
+from sqlgraphql.cache import ResultCache
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import PolymorphicNode, QueryableNode
 
 
 def _snake_to_camel_case(value: str) -> str:
@@ -29,19 +46,49 @@ def _snake_to_camel_case(value: str) -> str:
 
 
 class SchemaBuilder:
-    def __init__(self, field_name_converter: Callable[[str], str] = _snake_to_camel_case):
+    def __init__(
+        self,
+        field_name_converter: Callable[[str], str] = _snake_to_camel_case,
+        *,
+        default_limit: int | None = None,
+        max_rows: int | None = None,
+        max_query_cost: int | None = None,
+        default_cardinality: int = 100,
+        result_cache: ResultCache | None = None,
+        node_id_field: str = "id",
+        identity_map: bool = False,
+    ):
+        self._result_cache = result_cache
+        self._identity_map = identity_map
+        self._row_limits = RowLimits(default_limit, max_rows)
+        self._cost_analyzer = (
+            QueryCostAnalyzer(max_query_cost, default_cardinality)
+            if max_query_cost is not None
+            else None
+        )
         self._analyzer = Analyzer(field_name_converter)
         self._query_root_members: dict[str, GraphQLField] = {}
         self._type_map = TypeMap()
         self._orm_type_registry = TypeRegistry()
         self._gql_type_registry = ScalarTypeRegistry(self._type_map)
         self._enum_builder = EnumBuilder(self._type_map)
+        self._offset_paged_builder = OffsetPagedArgumentBuilder(self._type_map)
+        self._node_interface_builder = NodeInterfaceBuilder(
+            self._type_map, node_id_field, result_cache, identity_map
+        )
         self._object_builder = ObjectBuilder(
-            self._type_map, self._enum_builder, self._orm_type_registry, self._gql_type_registry
+            self._type_map,
+            self._enum_builder,
+            self._orm_type_registry,
+            self._gql_type_registry,
+            self._offset_paged_builder,
+            self._row_limits,
+            self._node_interface_builder,
+            result_cache,
+            identity_map,
         )
         self._sortable_builder = SortableArgumentBuilder(self._type_map)
         self._filter_builder = FilteringArgumentBuilder(self._type_map)
-        self._offset_paged_builder = OffsetPagedArgumentBuilder(self._type_map)
 
     def add_root_list(
         self,
@@ -51,6 +98,8 @@ class SchemaBuilder:
         sortable: bool = False,
         filterable: bool = False,
         pageable: bool = False,
+        default_limit: int | None = None,
+        max_rows: int | None = None,
     ) -> SchemaBuilder:
         if name in self._query_root_members:
             raise ValueError(f"Name '{name}' has already been used")
@@ -71,25 +120,134 @@ class SchemaBuilder:
             args.update(filterable_config.args)
             transformers.append(filterable_config.transformer)
 
-        transformer = QueryBuilder.create(analyzed_node, transformers)
+        transformer = QueryBuilder.create(
+            analyzed_node, transformers, self._result_cache, self._identity_map
+        )
+        limits = self._row_limits.override(default_limit, max_rows)
 
         if pageable:
             field = self._offset_paged_builder.build_paged_list_field(
-                analyzed_node, args, transformer
+                analyzed_node, args, transformer, limits
             )
         else:
             field = GraphQLField(
                 GraphQLList(object_type),
-                args=args,
-                resolve=ListResolver(transformer),
+                args={**args, **self._object_builder.build_limit_args(limits)},
+                resolve=ListResolver(transformer, limits),
+                extensions=build_cost_extensions(ListCardinality(node.estimated_rows, limits)),
             )
 
         self._query_root_members[name] = field
         return self
 
+    def add_root_single(self, name: str, node: QueryableNode) -> SchemaBuilder:
+        """
+        Adds root field returning single record of the node by its primary key. Primary key
+        columns (of the single table node selects from) have to be selected by the node.
+        """
+        if name in self._query_root_members:
+            raise ValueError(f"Name '{name}' has already been used")
+
+        analyzed_node = self._analyzer.get(node)
+        object_type = self._object_builder.build_object(analyzed_node)
+        key_fields = get_primary_key_fields(analyzed_node)
+
+        lookup_rule = ApplyKeyLookupRule([field.orm_field for field in key_fields])
+        self._query_root_members[name] = GraphQLField(
+            object_type,
+            args={
+                field.gql_name: GraphQLArgument(
+                    GraphQLNonNull(assert_not_none(field.data.gql_type))
+                )
+                for field in key_fields
+            },
+            resolve=SingleResolver(
+                QueryBuilder.create(
+                    analyzed_node, [lookup_rule], self._result_cache, self._identity_map
+                ),
+                lookup_rule,
+                [field.gql_name for field in key_fields],
+                [field.data.python_type for field in key_fields],
+            ),
+        )
+        return self
+
+    def add_root_union(
+        self,
+        name: str,
+        node: PolymorphicNode,
+        *,
+        default_limit: int | None = None,
+        max_rows: int | None = None,
+    ) -> SchemaBuilder:
+        """
+        Adds root field returning list of records of all member nodes, typed as union of
+        their object types. Records are loaded by single UNION ALL query.
+        """
+        if name in self._query_root_members:
+            raise ValueError(f"Name '{name}' has already been used")
+
+        members = []
+        for member in node.members:
+            analyzed_node = self._analyzer.get(member)
+            order_columns = []
+            for column_name in node.order_by:
+                column = member.query.selected_columns.get(column_name)
+                if column is None:
+                    raise GQLBuilderException(
+                        f"Member '{member.name}' of polymorphic node '{node.name}' does not"
+                        f" select column '{column_name}'."
+                    )
+                order_columns.append(column)
+            members.append(
+                (
+                    self._object_builder.build_object(analyzed_node),
+                    QueryBuilder.create(analyzed_node, (), self._result_cache, self._identity_map),
+                    order_columns,
+                )
+            )
+
+        union_type = self._type_map.add(
+            GraphQLUnionType(
+                self._type_map.get_unique_name(node.name),
+                [gql_type for gql_type, _, _ in members],
+                resolve_type=resolve_member_type,
+            )
+        )
+        limits = self._row_limits.override(default_limit, max_rows)
+        self._query_root_members[name] = GraphQLField(
+            GraphQLList(GraphQLNonNull(union_type)),
+            args=self._object_builder.build_limit_args(limits),
+            resolve=ListResolver(PolymorphicQueryBuilder(members, node.descending), limits),
+            extensions=build_cost_extensions(ListCardinality(node.estimated_rows, limits)),
+        )
+        return self
+
     def build(self) -> GraphQLSchema:
-        query_type = GraphQLObjectType(
-            "Query",
-            self._query_root_members,
+        root_members = dict(self._query_root_members)
+        if self._node_interface_builder.enabled:
+            for name, field in self._node_interface_builder.build_root_fields().items():
+                if name in root_members:
+                    raise ValueError(f"Name '{name}' has already been used")
+                root_members[name] = field
+
+        if self._cost_analyzer is not None:
+            # cost is checked even if operation is not executed by GQLExecutionContext
+            root_members = {
+                name: self._limit_cost(field, self._cost_analyzer)
+                for name, field in root_members.items()
+            }
+
+        query_type = GraphQLObjectType("Query", root_members)
+        return GraphQLSchema(
+            query_type,
+            extensions=(
+                {COST_EXTENSION: self._cost_analyzer} if self._cost_analyzer is not None else None
+            ),
         )
-        return GraphQLSchema(query_type)
+
+    @classmethod
+    def _limit_cost(cls, field: GraphQLField, analyzer: QueryCostAnalyzer) -> GraphQLField:
+        limited = copy.copy(field)
+        limited.resolve = CostLimitedResolver(analyzer, field.resolve or default_field_resolver)
+        return limited
@@ -20,6 +20,7 @@ from sqlalchemy.orm import (
     sessionmaker,
 )
 
+from sqlgraphql.execution import GQLExecutionContext
 from sqlgraphql.types import TypedResolveContext
 
 if TYPE_CHECKING:
@@ -106,13 +107,20 @@ def executor(session_factory):
         schema: GraphQLSchema,
         query: str,
         variables: dict[str, Any] | None = None,
+        context: TypedResolveContext | None = None,
     ) -> ExecutionResult:
         with session_factory.begin() as session:
+            # context may be reused by several executions (with new session each time)
+            if context is None:
+                context = TypedResolveContext(db_session=session)
+            else:
+                context["db_session"] = session
             return graphql_sync(
                 schema,
                 query,
                 variable_values=variables,
-                context_value=TypedResolveContext(db_session=session),
+                context_value=context,
+                execution_context_class=GQLExecutionContext,
             )
 
     return executor
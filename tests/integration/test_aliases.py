@@ -0,0 +1,127 @@
+import pytest
+from sqlalchemy import select
+
+from sqlgraphql.model import Link, MemoryResidency, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestAliases:
+    @pytest.fixture()
+    def schema(self):
+        user_node = QueryableNode("User", query=select(UserDB))
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 100"])),
+            extra={"user": user_node},
+        )
+        return SchemaBuilder().add_root_list("posts", post_node).build()
+
+    def test_aliased_columns(self, schema, executor, query_watcher):
+        result = executor(schema, "query { posts { header: userId userId: header h: header } }")
+        assert not result.errors
+        assert result.data == {
+            "posts": [
+                {"header": 1, "userId": "Post 001", "h": "Post 001"},
+                {"header": 2, "userId": "Post 100", "h": "Post 100"},
+            ]
+        }
+        assert query_watcher.executed_queries == [
+            'SELECT posts.user_id AS header, posts.header AS "userId" FROM posts WHERE '
+            "posts.header IN (?, ?)"
+        ]
+
+    def test_aliased_links(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            "query { posts { author: user { id } user { n: name } owner: user { name } } }",
+        )
+        assert not result.errors
+        assert result.data == {
+            "posts": [
+                {"author": {"id": 1}, "user": {"n": "user1"}, "owner": {"name": "user1"}},
+                {"author": {"id": 2}, "user": {"n": "user2"}, "owner": {"name": "user2"}},
+            ]
+        }
+        assert query_watcher.executed_queries == [
+            "SELECT users.id AS __e1_id, anon_1.name AS __e2_n, anon_2.name AS __e3_name FROM "
+            "posts JOIN users ON posts.user_id = users.id JOIN (SELECT users.id AS id, "
+            "users.name AS name, users.registration_date AS registration_date FROM users) AS "
+            "anon_1 ON posts.user_id = anon_1.id JOIN (SELECT users.id AS id, users.name AS "
+            "name, users.registration_date AS registration_date FROM users) AS anon_2 ON "
+            "posts.user_id = anon_2.id WHERE posts.header IN (?, ?)"
+        ]
+
+
+class TestAliasedLists:
+    @pytest.fixture()
+    def schema(self):
+        post_node = QueryableNode("Post", query=select(PostDB).order_by(PostDB.header))
+        user_node = QueryableNode(
+            "User",
+            query=select(UserDB).where(UserDB.id == 2),
+            extra={"posts": Link(post_node, default_limit=1)},
+        )
+        return SchemaBuilder().add_root_list("users", user_node).build()
+
+    def test_aliased_lists_are_queried_separately(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            "query { users { first: posts { header } recent: posts(limit: 2) { h: header } } }",
+        )
+        assert not result.errors
+        assert result.data == {
+            "users": [
+                {
+                    "first": [{"header": "Post 076"}],
+                    "recent": [{"h": "Post 076"}, {"h": "Post 077"}],
+                }
+            ]
+        }
+        assert query_watcher.executed_queries_with_args == [
+            ("SELECT users.id AS __id FROM users WHERE users.id = ?", (2,)),
+            (
+                "SELECT posts.header FROM posts WHERE posts.user_id = ? ORDER BY posts.header "
+                "LIMIT ? OFFSET ?",
+                (2, 2, 0),
+            ),
+            (
+                "SELECT posts.header AS h FROM posts WHERE posts.user_id = ? ORDER BY "
+                "posts.header LIMIT ? OFFSET ?",
+                (2, 3, 0),
+            ),
+        ]
+
+
+class TestAliasedResidentFields:
+    @pytest.fixture()
+    def schema(self):
+        user_node = QueryableNode("User", query=select(UserDB), memory_resident=MemoryResidency())
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header == "Post 001"),
+            extra={"user": user_node},
+        )
+        return SchemaBuilder().add_root_list("posts", post_node).build()
+
+    def test_aliased_fields_of_resident_records(self, schema, executor):
+        result = executor(
+            schema,
+            """
+            query {
+                posts {
+                    user { name: registrationDate registrationDate: name }
+                    owner: user { n: name name }
+                }
+            }
+            """,
+        )
+        assert not result.errors
+        assert result.data == {
+            "posts": [
+                {
+                    "user": {"name": "2000-01-01", "registrationDate": "user1"},
+                    "owner": {"n": "user1", "name": "user1"},
+                }
+            ]
+        }
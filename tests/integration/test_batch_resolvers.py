@@ -0,0 +1,132 @@
+import pytest
+from sqlalchemy import select
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import BatchResolver, Link, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class _Scorer:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, records):
+        self.batches.append(records)
+        return [record["id"] * 10 + len(record["name"]) for record in records]
+
+
+class TestBatchResolvers:
+    @pytest.fixture()
+    def scorer(self):
+        return _Scorer()
+
+    @pytest.fixture()
+    def schema(self, scorer):
+        return self._build_schema(scorer)
+
+    @classmethod
+    def _build_schema(cls, scorer, max_rows=None):
+        user_node = QueryableNode(
+            "User",
+            query=select(UserDB.id, UserDB.name),
+            extra={"score": BatchResolver(scorer, int, requires=[UserDB.id, UserDB.name])},
+        )
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB)
+            .where(PostDB.header.in_(["Post 001", "Post 002", "Post 076"]))
+            .order_by(PostDB.header),
+            extra={"user": user_node},
+        )
+        return (
+            SchemaBuilder(max_rows=max_rows)
+            .add_root_list("users", user_node)
+            .add_root_list("posts", post_node)
+            .build()
+        )
+
+    def test_function_is_called_once_per_level(self, schema, scorer, executor, query_watcher):
+        result = executor(schema, "query { users { name score } }")
+        assert not result.errors
+        assert result.data == {
+            "users": [{"name": "user1", "score": 15}, {"name": "user2", "score": 25}]
+        }
+        assert scorer.batches == [[{"id": 1, "name": "user1"}, {"id": 2, "name": "user2"}]]
+        assert query_watcher.executed_queries == ["SELECT users.name, users.id AS __id FROM users"]
+
+    def test_required_columns_are_not_selected_without_field(
+        self, schema, scorer, executor, query_watcher
+    ):
+        result = executor(schema, "query { users { name } }")
+        assert not result.errors
+        assert scorer.batches == []
+        assert query_watcher.executed_queries == ["SELECT users.name FROM users"]
+
+    def test_records_of_joined_objects(self, schema, scorer, executor, query_watcher):
+        result = executor(schema, "query { posts { header user { s: score } } }")
+        assert not result.errors
+        assert result.data == {
+            "posts": [
+                {"header": "Post 001", "user": {"s": 15}},
+                {"header": "Post 002", "user": {"s": 15}},
+                {"header": "Post 076", "user": {"s": 25}},
+            ]
+        }
+        assert len(scorer.batches) == 1
+        assert query_watcher.executed_queries == [
+            "SELECT posts.header, users.id AS __e1___id, users.name AS __e1___name FROM posts "
+            "JOIN users ON posts.user_id = users.id WHERE posts.header IN (?, ?, ?) ORDER BY "
+            "posts.header"
+        ]
+
+    def test_records_of_truncated_list(self, scorer, executor):
+        result = executor(
+            self._build_schema(scorer, max_rows=10),
+            "query { users(limit: 1) { score } posts(limit: 2) { user { score } } }",
+        )
+        assert not result.errors
+        assert result.extensions["truncated"] == [
+            {"path": ["users"], "limit": 1},
+            {"path": ["posts"], "limit": 2},
+        ]
+        # additional rows fetched to detect truncation are not part of the batches
+        assert [len(batch) for batch in scorer.batches] == [1, 2]
+
+    def test_records_of_truncated_nested_lists(self, executor):
+        lengths = []
+
+        def measure(records):
+            lengths.append(len(records))
+            return [len(record["header"]) for record in records]
+
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).order_by(PostDB.header),
+            extra={"length": BatchResolver(measure, int, requires=[PostDB.header])},
+        )
+        user_node = QueryableNode("User", query=select(UserDB), extra={"posts": Link(post_node)})
+        schema = SchemaBuilder(max_rows=10).add_root_list("users", user_node).build()
+        result = executor(schema, "query { users { posts(limit: 2) { length } } }")
+        assert not result.errors
+        assert [len(user["posts"]) for user in result.data["users"]] == [2, 2]
+        assert lengths == [2, 2]
+
+    def test_number_of_values_is_checked(self, executor):
+        user_node = QueryableNode(
+            "User",
+            query=select(UserDB),
+            extra={"score": BatchResolver(lambda records: [], int, requires=[UserDB.id])},
+        )
+        schema = SchemaBuilder().add_root_list("users", user_node).build()
+        result = executor(schema, "query { users { score } }")
+        assert result.errors[0].message == "Batch resolver returned 0 values for 2 records"
+
+    def test_required_expression(self):
+        user_node = QueryableNode(
+            "User",
+            query=select(UserDB),
+            extra={"score": BatchResolver(len, int, requires=[UserDB.id + 1])},
+        )
+        with pytest.raises(GQLBuilderException, match="Invalid required columns"):
+            SchemaBuilder().add_root_list("users", user_node)
@@ -0,0 +1,159 @@
+import pytest
+from sqlalchemy import (
+    Column,
+    ForeignKeyConstraint,
+    Integer,
+    MetaData,
+    String,
+    Table,
+    insert,
+    select,
+)
+from sqlalchemy.orm import Session
+
+from sqlgraphql.model import Link, LinkStrategy, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+
+metadata = MetaData()
+
+regions = Table(
+    "regions",
+    metadata,
+    Column("country", String(2), primary_key=True),
+    Column("code", String(2), primary_key=True),
+    Column("name", String(200), nullable=False),
+)
+
+stores = Table(
+    "stores",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("region_code", String(2)),
+    Column("country", String(2), nullable=False),
+    # columns are intentionally not in order of referenced primary key
+    ForeignKeyConstraint(["region_code", "country"], [regions.c.code, regions.c.country]),
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tables(database_engine):
+    metadata.create_all(bind=database_engine)
+    with Session(bind=database_engine, future=True) as session:
+        session.execute(
+            insert(regions),
+            [
+                {"country": "US", "code": "NY", "name": "New York"},
+                {"country": "US", "code": "CA", "name": "California"},
+                {"country": "CA", "code": "NY", "name": "Nowhere Yonder"},
+            ],
+        )
+        session.execute(
+            insert(stores),
+            [
+                {"id": 1, "name": "Store 1", "region_code": "NY", "country": "US"},
+                {"id": 2, "name": "Store 2", "region_code": "NY", "country": "CA"},
+                {"id": 3, "name": "Store 3", "region_code": "CA", "country": "US"},
+                {"id": 4, "name": "Store 4", "region_code": None, "country": "US"},
+            ],
+        )
+        session.commit()
+    yield
+    metadata.drop_all(bind=database_engine)
+
+
+def _build_schema(strategy=LinkStrategy.JOIN, pageable=False):
+    region_node = QueryableNode("Region", query=select(regions).order_by(regions.c.name))
+    store_node = QueryableNode(
+        "Store",
+        query=select(stores).order_by(stores.c.id),
+        extra={"region": Link(region_node, strategy=strategy)},
+    )
+    region_node.define_field("stores", Link(store_node, pageable=pageable))
+    return (
+        SchemaBuilder()
+        .add_root_list("stores", store_node)
+        .add_root_list("regions", region_node)
+        .build()
+    )
+
+
+_STORES = {
+    "stores": [
+        {"name": "Store 1", "region": {"name": "New York"}},
+        {"name": "Store 2", "region": {"name": "Nowhere Yonder"}},
+        {"name": "Store 3", "region": {"name": "California"}},
+        {"name": "Store 4", "region": None},
+    ]
+}
+
+
+class TestCompositeKeys:
+    def test_joined_link(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { stores { name region { name } } }")
+        assert not result.errors
+        assert result.data == _STORES
+        assert query_watcher.executed_queries == [
+            "SELECT stores.name, regions.country IS NOT NULL AS __e1_, regions.name AS "
+            "__e1_name FROM stores LEFT OUTER JOIN regions ON stores.region_code = regions.code "
+            "AND stores.country = regions.country ORDER BY stores.id"
+        ]
+
+    def test_list_link(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { regions { name stores { name } } }")
+        assert not result.errors
+        assert result.data == {
+            "regions": [
+                {"name": "California", "stores": [{"name": "Store 3"}]},
+                {"name": "New York", "stores": [{"name": "Store 1"}]},
+                {"name": "Nowhere Yonder", "stores": [{"name": "Store 2"}]},
+            ]
+        }
+        assert query_watcher.executed_queries_with_args[1] == (
+            "SELECT stores.name FROM stores WHERE stores.region_code = ? AND stores.country = ? "
+            "ORDER BY stores.id",
+            ("CA", "US"),
+        )
+
+    def test_batched_link(self, executor, query_watcher):
+        result = executor(
+            _build_schema(LinkStrategy.BATCH), "query { stores { name region { name } } }"
+        )
+        assert not result.errors
+        assert result.data == _STORES
+        assert query_watcher.executed_queries_with_args[1] == (
+            "SELECT regions.name, regions.code AS __link_0, regions.country AS __link_1 FROM "
+            "regions WHERE (regions.code, regions.country) IN (VALUES (?, ?), (?, ?), (?, ?)) "
+            "ORDER BY regions.name",
+            ("NY", "US", "NY", "CA", "CA", "US"),
+        )
+
+    def test_batched_link_without_row_values(
+        self, executor, query_watcher, monkeypatch, database_engine
+    ):
+        monkeypatch.setattr(database_engine.dialect.dbapi, "sqlite_version_info", (3, 14, 0))
+        result = executor(
+            _build_schema(LinkStrategy.BATCH), "query { stores { name region { name } } }"
+        )
+        assert not result.errors
+        assert result.data == _STORES
+        assert query_watcher.executed_queries_with_args[1] == (
+            "SELECT regions.name, regions.code AS __link_0, regions.country AS __link_1 FROM "
+            "regions WHERE regions.code = ? AND regions.country = ? OR regions.code = ? AND "
+            "regions.country = ? OR regions.code = ? AND regions.country = ? ORDER BY "
+            "regions.name",
+            ("NY", "US", "NY", "CA", "CA", "US"),
+        )
+
+    def test_paged_link(self, executor, query_watcher):
+        result = executor(
+            _build_schema(pageable=True),
+            "query { regions { name stores { nodes { name } } } }",
+        )
+        assert not result.errors
+        assert [region["stores"]["nodes"] for region in result.data["regions"]] == [
+            [{"name": "Store 3"}],
+            [{"name": "Store 1"}],
+            [{"name": "Store 2"}],
+        ]
+        assert len(query_watcher.executed_queries) == 2
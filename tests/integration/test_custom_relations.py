@@ -0,0 +1,334 @@
+import pytest
+from sqlalchemy import Column, Integer, MetaData, String, Table, and_, insert, select
+from sqlalchemy.orm import Session
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import Link, LinkStrategy, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+metadata = MetaData()
+
+categories = Table(
+    "categories",
+    metadata,
+    Column("code", String(10), primary_key=True),
+    Column("name", String(200), nullable=False),
+)
+
+price_bands = Table(
+    "price_bands",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("min_price", Integer, nullable=False),
+    Column("max_price", Integer, nullable=False),
+)
+
+# there are no foreign keys, relations are defined by links
+products = Table(
+    "products",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("category_code", String(10)),
+    Column("price", Integer, nullable=False),
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tables(database_engine):
+    metadata.create_all(bind=database_engine)
+    with Session(bind=database_engine, future=True) as session:
+        session.execute(
+            insert(categories),
+            [{"code": "food", "name": "Food"}, {"code": "tools", "name": "Tools"}],
+        )
+        session.execute(
+            insert(price_bands),
+            [
+                {"id": 1, "name": "Cheap", "min_price": 0, "max_price": 10},
+                {"id": 2, "name": "Regular", "min_price": 10, "max_price": 100},
+                {"id": 3, "name": "Premium", "min_price": 100, "max_price": 1000},
+            ],
+        )
+        session.execute(
+            insert(products),
+            [
+                {"id": 1, "name": "Apple", "category_code": "food", "price": 1},
+                {"id": 2, "name": "Hammer", "category_code": "tools", "price": 25},
+                {"id": 3, "name": "Cheese", "category_code": "food", "price": 12},
+                {"id": 4, "name": "Gift card", "category_code": None, "price": 5000},
+            ],
+        )
+        session.commit()
+    yield
+    metadata.drop_all(bind=database_engine)
+
+
+_BAND_CONDITION = and_(
+    products.c.price >= price_bands.c.min_price, products.c.price < price_bands.c.max_price
+)
+
+
+def _build_schema(strategy=LinkStrategy.JOIN, pageable=False):
+    category_node = QueryableNode("Category", query=select(categories))
+    band_node = QueryableNode("PriceBand", query=select(price_bands).order_by(price_bands.c.id))
+    product_node = QueryableNode(
+        "Product",
+        query=select(products).order_by(products.c.id),
+        extra={
+            "category": Link(category_node, on=[(products.c.category_code, categories.c.code)]),
+            "band": Link(band_node, on=_BAND_CONDITION, kind="single", strategy=strategy),
+        },
+    )
+    category_node.define_field(
+        "products", Link(product_node, on=[(categories.c.code, products.c.category_code)])
+    )
+    band_node.define_field(
+        "products", Link(product_node, on=_BAND_CONDITION, kind="multiple", pageable=pageable)
+    )
+    return (
+        SchemaBuilder()
+        .add_root_list("products", product_node)
+        .add_root_list("categories", category_node)
+        .add_root_list("bands", band_node)
+        .build()
+    )
+
+
+_PRODUCT_BANDS = {
+    "products": [
+        {"name": "Apple", "band": {"name": "Cheap"}},
+        {"name": "Hammer", "band": {"name": "Regular"}},
+        {"name": "Cheese", "band": {"name": "Regular"}},
+        {"name": "Gift card", "band": None},
+    ]
+}
+
+
+def _build_same_product_schema(strategy, links=("same",)):
+    # node doesn't select column its nested link is joined by
+    category_node = QueryableNode("Category", query=select(categories))
+    same_node = QueryableNode(
+        "SameProduct",
+        query=select(products.c.id, products.c.name),
+        extra={
+            "category": Link(
+                category_node,
+                on=[(products.c.category_code, categories.c.code)],
+                strategy=strategy,
+            )
+        },
+    )
+    product_node = QueryableNode(
+        "Product",
+        query=select(products).order_by(products.c.id),
+        extra={name: Link(same_node, on=[(products.c.id, products.c.id)]) for name in links},
+    )
+    return SchemaBuilder().add_root_list("products", product_node).build()
+
+
+_PRODUCT_CATEGORIES = [
+    {"category": {"name": "Food"}},
+    {"category": {"name": "Tools"}},
+    {"category": {"name": "Food"}},
+    {"category": None},
+]
+
+
+class TestColumnPairs:
+    def test_single_link(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { products { name category { name } } }")
+        assert not result.errors
+        assert result.data == {
+            "products": [
+                {"name": "Apple", "category": {"name": "Food"}},
+                {"name": "Hammer", "category": {"name": "Tools"}},
+                {"name": "Cheese", "category": {"name": "Food"}},
+                {"name": "Gift card", "category": None},
+            ]
+        }
+        assert query_watcher.executed_queries == [
+            "SELECT products.name, categories.code IS NOT NULL AS __e1_, categories.name AS "
+            "__e1_name FROM products LEFT OUTER JOIN categories ON products.category_code = "
+            "categories.code ORDER BY products.id"
+        ]
+
+    def test_aliased_joined_links(self, executor):
+        # node doesn't select joined column
+        category_node = QueryableNode("Category", query=select(categories.c.name))
+        product_node = QueryableNode(
+            "Product",
+            query=select(products).order_by(products.c.id),
+            extra={
+                "category": Link(category_node, on=[(products.c.category_code, categories.c.code)])
+            },
+        )
+        schema = SchemaBuilder().add_root_list("products", product_node).build()
+        result = executor(
+            schema, "query { products { a: category { name } b: category { name } } }"
+        )
+        assert not result.errors
+        assert [product["a"] for product in result.data["products"]] == [
+            {"name": "Food"},
+            {"name": "Tools"},
+            {"name": "Food"},
+            None,
+        ]
+        assert all(product["a"] == product["b"] for product in result.data["products"])
+
+    @pytest.mark.parametrize("strategy", [LinkStrategy.JOIN, LinkStrategy.BATCH])
+    def test_aliased_links_with_nested_link(self, executor, strategy):
+        result = executor(
+            _build_same_product_schema(strategy),
+            "query { products { a: same { name } b: same { category { name } } } }",
+        )
+        assert not result.errors
+        assert [product["b"] for product in result.data["products"]] == _PRODUCT_CATEGORIES
+
+    @pytest.mark.parametrize("strategy", [LinkStrategy.JOIN, LinkStrategy.BATCH])
+    def test_links_to_the_same_table_with_nested_link(self, executor, strategy):
+        result = executor(
+            _build_same_product_schema(strategy, ("same", "twin")),
+            "query { products { same { name } twin { category { name } } } }",
+        )
+        assert not result.errors
+        assert [product["twin"] for product in result.data["products"]] == _PRODUCT_CATEGORIES
+
+    def test_list_link(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { categories { name products { name } } }")
+        assert not result.errors
+        assert result.data == {
+            "categories": [
+                {"name": "Food", "products": [{"name": "Apple"}, {"name": "Cheese"}]},
+                {"name": "Tools", "products": [{"name": "Hammer"}]},
+            ]
+        }
+        assert query_watcher.executed_queries_with_args[1] == (
+            "SELECT products.name FROM products WHERE products.category_code = ? "
+            "ORDER BY products.id",
+            ("food",),
+        )
+
+    def test_mapped_attributes(self):
+        user_node = QueryableNode("User", query=select(UserDB))
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB),
+            extra={"author": Link(user_node, on=[(PostDB.user_id, UserDB.id)])},
+        )
+        schema = SchemaBuilder().add_root_list("posts", post_node).build()
+        assert str(schema.get_type("Post").fields["author"].type) == "User"
+
+    def test_columns_of_other_tables(self):
+        category_node = QueryableNode("Category", query=select(categories))
+        product_node = QueryableNode(
+            "Product",
+            query=select(products),
+            extra={"category": Link(category_node, on=[(price_bands.c.id, categories.c.code)])},
+        )
+        with pytest.raises(GQLBuilderException, match="Invalid relation of member 'category'"):
+            SchemaBuilder().add_root_list("products", product_node).build()
+
+
+class TestJoinCondition:
+    def test_joined_link(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { products { name band { name } } }")
+        assert not result.errors
+        assert result.data == _PRODUCT_BANDS
+        assert query_watcher.executed_queries == [
+            "SELECT products.name, price_bands.id IS NOT NULL AS __e1_, price_bands.name AS "
+            "__e1_name FROM products LEFT OUTER JOIN price_bands ON products.price >= "
+            "price_bands.min_price AND products.price < price_bands.max_price ORDER BY "
+            "products.id"
+        ]
+
+    def test_aliased_joined_links(self, executor):
+        # node doesn't select columns of join condition
+        band_node = QueryableNode("PriceBand", query=select(price_bands.c.id, price_bands.c.name))
+        product_node = QueryableNode(
+            "Product",
+            query=select(products).order_by(products.c.id),
+            extra={"band": Link(band_node, on=_BAND_CONDITION, kind="single")},
+        )
+        schema = SchemaBuilder().add_root_list("products", product_node).build()
+        result = executor(schema, "query { products { a: band { name } b: band { id } } }")
+        assert not result.errors
+        assert result.data == {
+            "products": [
+                {"a": {"name": "Cheap"}, "b": {"id": 1}},
+                {"a": {"name": "Regular"}, "b": {"id": 2}},
+                {"a": {"name": "Regular"}, "b": {"id": 2}},
+                {"a": None, "b": None},
+            ]
+        }
+
+    def test_batched_link(self, executor, query_watcher):
+        result = executor(
+            _build_schema(LinkStrategy.BATCH), "query { products { name band { name } } }"
+        )
+        assert not result.errors
+        assert result.data == _PRODUCT_BANDS
+        assert query_watcher.executed_queries_with_args[1:] == [
+            (
+                "SELECT price_bands.name, anon_1.key_0 AS __link_0 FROM price_bands JOIN "
+                "(SELECT ? AS key_0 UNION ALL SELECT ? AS key_0 UNION ALL SELECT ? AS key_0 "
+                "UNION ALL SELECT ? AS key_0) AS anon_1 ON anon_1.key_0 >= price_bands.min_price "
+                "AND anon_1.key_0 < price_bands.max_price ORDER BY price_bands.id",
+                (1, 25, 12, 5000),
+            )
+        ]
+
+    def test_list_link(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { bands { name products { name } } }")
+        assert not result.errors
+        assert result.data == {
+            "bands": [
+                {"name": "Cheap", "products": [{"name": "Apple"}]},
+                {"name": "Regular", "products": [{"name": "Hammer"}, {"name": "Cheese"}]},
+                {"name": "Premium", "products": []},
+            ]
+        }
+        assert query_watcher.executed_queries_with_args[:2] == [
+            (
+                "SELECT price_bands.name, price_bands.min_price AS __min_price, "
+                "price_bands.max_price AS __max_price FROM price_bands ORDER BY price_bands.id",
+                (),
+            ),
+            (
+                "SELECT products.name FROM products WHERE products.price >= ? AND "
+                "products.price < ? ORDER BY products.id",
+                (0, 10),
+            ),
+        ]
+
+    def test_paged_link(self, executor, query_watcher):
+        result = executor(
+            _build_schema(pageable=True),
+            "query { bands { name products { nodes { name } pageInfo { totalCount } } } }",
+        )
+        assert not result.errors
+        assert [band["products"] for band in result.data["bands"]] == [
+            {"nodes": [{"name": "Apple"}], "pageInfo": {"totalCount": 1}},
+            {"nodes": [{"name": "Hammer"}, {"name": "Cheese"}], "pageInfo": {"totalCount": 2}},
+            {"nodes": [], "pageInfo": {"totalCount": 0}},
+        ]
+
+    def test_kind_is_required(self):
+        band_node = QueryableNode("PriceBand", query=select(price_bands))
+        product_node = QueryableNode(
+            "Product", query=select(products), extra={"band": Link(band_node, on=_BAND_CONDITION)}
+        )
+        with pytest.raises(GQLBuilderException, match="Kind of link with join condition"):
+            SchemaBuilder().add_root_list("products", product_node).build()
+
+    def test_kind_without_relation(self):
+        category_node = QueryableNode("Category", query=select(categories))
+        product_node = QueryableNode(
+            "Product",
+            query=select(products),
+            extra={"category": Link(category_node, kind="single")},
+        )
+        with pytest.raises(GQLBuilderException, match="'category'"):
+            SchemaBuilder().add_root_list("products", product_node).build()
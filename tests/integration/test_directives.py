@@ -0,0 +1,57 @@
+import pytest
+from sqlalchemy import select
+
+from sqlgraphql.model import QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestSkipInclude:
+    _QUERY = """
+        query ($withUser: Boolean!, $skipBody: Boolean!) {
+            posts {
+                header
+                body @skip(if: $skipBody)
+                user @include(if: $withUser) { name }
+                ... @include(if: $withUser) { userId }
+                ...PostBody @skip(if: $skipBody)
+            }
+        }
+
+        fragment PostBody on Post { id }
+    """
+
+    @pytest.fixture()
+    def schema(self):
+        user_node = QueryableNode("User", query=select(UserDB))
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header == "Post 001"),
+            extra={"user": user_node},
+        )
+        return SchemaBuilder().add_root_list("posts", post_node).build()
+
+    def test_excluded_fields_are_not_selected(self, schema, executor, query_watcher):
+        result = executor(schema, self._QUERY, {"withUser": False, "skipBody": True})
+        assert not result.errors
+        assert result.data == {"posts": [{"header": "Post 001"}]}
+        assert query_watcher.executed_queries == [
+            "SELECT posts.header FROM posts WHERE posts.header = ?"
+        ]
+
+    def test_included_fields_are_selected(self, schema, executor, query_watcher):
+        result = executor(schema, self._QUERY, {"withUser": True, "skipBody": False})
+        assert not result.errors
+        assert result.data["posts"][0]["user"] == {"name": "user1"}
+        assert query_watcher.executed_queries == [
+            'SELECT posts.header, posts.body, users.name AS __e1_name, posts.user_id AS "userId", '
+            "posts.id FROM posts JOIN users ON posts.user_id = users.id WHERE posts.header = ?"
+        ]
+
+    def test_reused_context(self, schema, executor):
+        context = {}
+        executor(schema, self._QUERY, {"withUser": False, "skipBody": True}, context)
+        result = executor(schema, self._QUERY, {"withUser": True, "skipBody": False}, context)
+        assert not result.errors
+        assert result.data["posts"][0]["body"] is not None
+        assert result.data["posts"][0]["user"] == {"name": "user1"}
@@ -0,0 +1,103 @@
+import pytest
+from graphql import print_schema
+from sqlalchemy import func, select
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import Expression, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+def _user_node():
+    user_node = QueryableNode("User", query=select(UserDB))
+    user_node.define_field("upper_name", Expression(func.upper(UserDB.name), str, required=True))
+    user_node.define_field(
+        "registration_day", Expression(func.strftime("%d", UserDB.registration_date), str)
+    )
+    # type is determined by SQL type of the expression
+    user_node.define_field("scaled_id", Expression(UserDB.id * 10))
+    return user_node
+
+
+class TestExpressionFields:
+    @pytest.fixture()
+    def schema(self):
+        user_node = _user_node()
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 076"])),
+            extra={"user": user_node, "owner": user_node},
+        )
+        return (
+            SchemaBuilder()
+            .add_root_list("users", user_node, sortable=True, filterable=True)
+            .add_root_list("posts", post_node)
+            .build()
+        )
+
+    def test_gql_schema(self, schema):
+        printed = print_schema(schema)
+        assert "  upperName: String!\n  registrationDay: String\n  scaledId: Int\n" in printed
+        assert "  upperName: SortDirection\n" in printed
+
+    def test_expression_is_selected_only_if_requested(self, schema, executor, query_watcher):
+        result = executor(schema, "query { users { name upperName } }")
+        assert not result.errors
+        assert result.data == {
+            "users": [
+                {"name": "user1", "upperName": "USER1"},
+                {"name": "user2", "upperName": "USER2"},
+            ]
+        }
+        assert query_watcher.executed_queries == [
+            'SELECT users.name, upper(users.name) AS "upperName" FROM users'
+        ]
+
+        executor(schema, "query { users { name } }")
+        assert query_watcher.executed_queries[1] == "SELECT users.name FROM users"
+
+    def test_filter_and_sort(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            """
+            query {
+                users(filter: [{upperName: {in: ["USER1", "USER2"]}}], sort: [{upperName: desc}]) {
+                    name
+                }
+            }
+            """,
+        )
+        assert not result.errors
+        assert result.data == {"users": [{"name": "user2"}, {"name": "user1"}]}
+        assert query_watcher.executed_queries == [
+            "SELECT users.name FROM users WHERE upper(users.name) IN (?, ?) ORDER BY "
+            "upper(users.name) DESC"
+        ]
+
+    def test_expression_of_linked_objects(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            "query { posts { user { upperName } owner { registrationDay } } }",
+        )
+        assert not result.errors
+        assert result.data == {
+            "posts": [
+                {"user": {"upperName": "USER1"}, "owner": {"registrationDay": "01"}},
+                {"user": {"upperName": "USER2"}, "owner": {"registrationDay": "02"}},
+            ]
+        }
+        # the second link is joined via subquery, expression is evaluated over its columns
+        assert query_watcher.executed_queries == [
+            'SELECT upper(users.name) AS "__e1_upperName", strftime(?, '
+            'anon_1.registration_date) AS "__e2_registrationDay" FROM posts JOIN users ON '
+            "posts.user_id = users.id JOIN (SELECT users.id AS id, users.name AS name, "
+            "users.registration_date AS registration_date FROM users) AS anon_1 ON "
+            "posts.user_id = anon_1.id WHERE posts.header IN (?, ?)"
+        ]
+
+    def test_name_of_selected_column(self):
+        user_node = QueryableNode(
+            "User", query=select(UserDB), extra={"name": Expression(func.upper(UserDB.name))}
+        )
+        with pytest.raises(GQLBuilderException, match="already selected by query"):
+            SchemaBuilder().add_root_list("users", user_node)
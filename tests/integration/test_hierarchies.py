@@ -0,0 +1,198 @@
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.orm import Session
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import Link, LinkHierarchy, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+metadata = MetaData()
+
+categories = Table(
+    "hierarchy_categories",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("parent_id", ForeignKey("hierarchy_categories.id")),
+    Column("name", String(200), nullable=False),
+)
+
+# hierarchy with cycle (both records are parents of each other)
+cyclic_categories = Table(
+    "cyclic_categories",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("parent_id", ForeignKey("cyclic_categories.id")),
+    Column("name", String(200), nullable=False),
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tables(database_engine):
+    metadata.create_all(bind=database_engine)
+    with Session(bind=database_engine, future=True) as session:
+        session.execute(
+            insert(categories),
+            [
+                {"id": 1, "parent_id": None, "name": "All"},
+                {"id": 2, "parent_id": 1, "name": "Food"},
+                {"id": 3, "parent_id": 1, "name": "Tools"},
+                {"id": 4, "parent_id": 2, "name": "Fruit"},
+                {"id": 5, "parent_id": 2, "name": "Dairy"},
+                {"id": 6, "parent_id": 4, "name": "Apple"},
+            ],
+        )
+        session.execute(
+            insert(cyclic_categories),
+            [{"id": 1, "parent_id": 2, "name": "A"}, {"id": 2, "parent_id": 1, "name": "B"}],
+        )
+        session.commit()
+    yield
+    metadata.drop_all(bind=database_engine)
+
+
+def _build_schema(**link_options):
+    category_node = QueryableNode("Category", query=select(categories).order_by(categories.c.name))
+    category_node.define_field(
+        "descendants",
+        Link(category_node, hierarchy=LinkHierarchy.DESCENDANTS, **link_options),
+    )
+    category_node.define_field(
+        "ancestors", Link(category_node, hierarchy=LinkHierarchy.ANCESTORS, **link_options)
+    )
+    return SchemaBuilder().add_root_list("categories", category_node).build()
+
+
+def _names(records):
+    return [record["name"] for record in records]
+
+
+class TestDescendants:
+    def test_whole_subtree_is_loaded_by_single_query(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { categories { name descendants { name } } }")
+        assert not result.errors
+        assert {
+            category["name"]: _names(category["descendants"])
+            for category in result.data["categories"]
+        } == {
+            "All": ["Food", "Tools", "Dairy", "Fruit", "Apple"],
+            "Apple": [],
+            "Dairy": [],
+            "Food": ["Dairy", "Fruit", "Apple"],
+            "Fruit": ["Apple"],
+            "Tools": [],
+        }
+        assert query_watcher.executed_queries_with_args[1] == (
+            "WITH RECURSIVE hierarchy(root_0, pk_0, next_0, depth) AS (SELECT "
+            "hierarchy_categories.parent_id AS root_0, hierarchy_categories.id AS pk_0, "
+            "hierarchy_categories.id AS next_0, ? AS depth FROM hierarchy_categories WHERE "
+            "hierarchy_categories.parent_id IN (?, ?, ?, ?, ?, ?) UNION ALL SELECT "
+            "hierarchy.root_0 AS root_0, hierarchy_categories.id AS pk_0, "
+            "hierarchy_categories.id AS next_0, hierarchy.depth + ? AS depth FROM "
+            "hierarchy_categories JOIN hierarchy ON hierarchy_categories.parent_id = "
+            "hierarchy.next_0 WHERE hierarchy.depth < ?) SELECT hierarchy_categories.name, "
+            "hierarchy.root_0 AS __link_0, hierarchy.depth AS __depth FROM hierarchy_categories "
+            "JOIN hierarchy ON hierarchy_categories.id = hierarchy.pk_0 ORDER BY __depth, "
+            "hierarchy_categories.name",
+            (1, 1, 6, 5, 2, 4, 3, 1, 100),
+        )
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_depth(self, executor, query_watcher):
+        result = executor(
+            _build_schema(),
+            "query { categories { name descendants(depth: 1) { name } } }",
+        )
+        assert not result.errors
+        assert _names(result.data["categories"][0]["descendants"]) == ["Food", "Tools"]
+        assert "WHERE hierarchy.depth < ?" in query_watcher.executed_queries[1]
+
+    def test_invalid_depth(self, executor):
+        result = executor(
+            _build_schema(), "query { categories { descendants(depth: 0) { name } } }"
+        )
+        assert result.errors[0].message == "Requested depth should be at least 1, got 0"
+
+    def test_depth_over_max_depth(self, executor):
+        result = executor(
+            _build_schema(max_depth=2),
+            "query { categories { descendants(depth: 3) { name } } }",
+        )
+        assert result.errors[0].message == "Requested depth 3, but at most 2 levels are allowed"
+
+    def test_cycle_is_bounded_by_max_depth(self, executor):
+        category_node = QueryableNode(
+            "Category", query=select(cyclic_categories).order_by(cyclic_categories.c.id)
+        )
+        category_node.define_field(
+            "descendants",
+            Link(category_node, hierarchy=LinkHierarchy.DESCENDANTS, max_depth=4),
+        )
+        schema = SchemaBuilder().add_root_list("categories", category_node).build()
+        result = executor(schema, "query { categories { name descendants { name } } }")
+        assert not result.errors
+        assert _names(result.data["categories"][0]["descendants"]) == ["B", "A", "B", "A"]
+
+    def test_limit_applies_to_each_parent(self, executor):
+        result = executor(
+            _build_schema(default_limit=2), "query { categories { name descendants { name } } }"
+        )
+        assert not result.errors
+        assert _names(result.data["categories"][0]["descendants"]) == ["Food", "Tools"]
+        assert result.extensions == {
+            "truncated": [
+                {"path": ["categories", 0, "descendants"], "limit": 2},
+                {"path": ["categories", 3, "descendants"], "limit": 2},
+            ]
+        }
+
+
+class TestAncestors:
+    def test_path_to_root(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { categories { name ancestors { name } } }")
+        assert not result.errors
+        assert {
+            category["name"]: _names(category["ancestors"])
+            for category in result.data["categories"]
+        } == {
+            "All": [],
+            "Apple": ["Fruit", "Food", "All"],
+            "Dairy": ["Food", "All"],
+            "Food": ["All"],
+            "Fruit": ["Food", "All"],
+            "Tools": ["All"],
+        }
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_depth(self, executor):
+        result = executor(
+            _build_schema(), "query { categories { name ancestors(depth: 2) { name } } }"
+        )
+        assert not result.errors
+        assert _names(result.data["categories"][1]["ancestors"]) == ["Fruit", "Food"]
+
+
+class TestInvalidHierarchies:
+    def test_relation_to_other_table(self):
+        user_node = QueryableNode("User", query=select(UserDB))
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB),
+            extra={"users": Link(user_node, hierarchy=LinkHierarchy.ANCESTORS)},
+        )
+        with pytest.raises(GQLBuilderException, match="single self-referencing relationship"):
+            SchemaBuilder().add_root_list("posts", post_node).build()
+
+    def test_pageable_hierarchy(self):
+        with pytest.raises(GQLBuilderException, match="cannot be pageable"):
+            _build_schema(pageable=True)
+
+    def test_invalid_max_depth(self):
+        with pytest.raises(GQLBuilderException, match="Max depth should be at least 1"):
+            _build_schema(max_depth=0)
+
+    def test_max_depth_of_other_link(self):
+        category_node = QueryableNode("Category", query=select(categories))
+        category_node.define_field("parent", Link(category_node, max_depth=2))
+        with pytest.raises(GQLBuilderException, match="defines max depth"):
+            SchemaBuilder().add_root_list("categories", category_node).build()
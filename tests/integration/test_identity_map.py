@@ -0,0 +1,189 @@
+import pytest
+from sqlalchemy import select
+
+from sqlgraphql.model import Link, LinkStrategy, QueryableNode
+from sqlgraphql.relay import to_global_id
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestIdentityMap:
+    _POSTS_QUERY = (
+        "SELECT posts.header, users.id AS __e1_id, users.name AS __e1_name, posts.id AS __id "
+        "FROM posts JOIN users ON posts.user_id = users.id WHERE posts.header IN (?, ?)"
+    )
+
+    @pytest.fixture()
+    def create_schema(self):
+        def create_schema(identity_map=True):
+            user_node = QueryableNode("User", query=select(UserDB), implements_node=True)
+            post_node = QueryableNode(
+                "Post",
+                query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 002"])),
+                extra={"user": user_node},
+            )
+            return (
+                SchemaBuilder(node_id_field="nodeId", identity_map=identity_map)
+                .add_root_list("posts", post_node)
+                .add_root_single("user", user_node)
+                .build()
+            )
+
+        return create_schema
+
+    def test_materialized_entities_are_reused(self, create_schema, executor, query_watcher):
+        result = executor(
+            create_schema(),
+            "query { posts { header user { id name } } user(id: 1) { id name } }",
+        )
+        assert not result.errors
+        assert result.data == {
+            "posts": [
+                {"header": "Post 001", "user": {"id": 1, "name": "user1"}},
+                {"header": "Post 002", "user": {"id": 1, "name": "user1"}},
+            ],
+            "user": {"id": 1, "name": "user1"},
+        }
+        assert query_watcher.executed_queries == [self._POSTS_QUERY]
+
+    def test_identity_map_is_opt_in(self, create_schema, executor, query_watcher):
+        result = executor(
+            create_schema(identity_map=False),
+            "query { posts { header user { id name } } user(id: 1) { id name } }",
+        )
+        assert not result.errors
+        assert query_watcher.executed_queries == [
+            "SELECT posts.header, users.id AS __e1_id, users.name AS __e1_name FROM posts JOIN "
+            "users ON posts.user_id = users.id WHERE posts.header IN (?, ?)",
+            "SELECT users.id, users.name FROM users WHERE users.id = ? LIMIT ? OFFSET ?",
+        ]
+
+    def test_entities_are_not_shared_by_executions(self, create_schema, executor, query_watcher):
+        schema = create_schema()
+        context = {}
+        executor(schema, "query { posts { header user { id name } } }", context=context)
+        result = executor(schema, "query { user(id: 1) { id name } }", context=context)
+        assert not result.errors
+        assert result.data == {"user": {"id": 1, "name": "user1"}}
+        assert query_watcher.executed_queries[1:] == [
+            "SELECT users.id, users.name FROM users WHERE users.id = ? LIMIT ? OFFSET ?"
+        ]
+
+    def test_only_missing_entities_are_loaded(self, create_schema, executor, query_watcher):
+        result = executor(
+            create_schema(),
+            """
+            query {
+                posts { user { name } }
+                a: user(id: 1) { name }
+                b: user(id: 2) { name }
+            }
+            """,
+        )
+        assert not result.errors
+        assert result.data == {
+            "posts": [{"user": {"name": "user1"}}, {"user": {"name": "user1"}}],
+            "a": {"name": "user1"},
+            "b": {"name": "user2"},
+        }
+        assert query_watcher.executed_queries_with_args == [
+            (
+                "SELECT users.name AS __e1_name, posts.id AS __id, users.id AS __e1___id FROM "
+                "posts JOIN users ON posts.user_id = users.id WHERE posts.header IN (?, ?)",
+                ("Post 001", "Post 002"),
+            ),
+            (
+                "SELECT users.name, users.id AS __id FROM users WHERE users.id = ? "
+                "LIMIT ? OFFSET ?",
+                (2, 1, 0),
+            ),
+        ]
+
+    def test_entities_without_requested_columns_are_loaded(
+        self, create_schema, executor, query_watcher
+    ):
+        result = executor(
+            create_schema(),
+            "query { posts { user { name } } user(id: 1) { name registrationDate } }",
+        )
+        assert not result.errors
+        assert result.data["user"] == {"name": "user1", "registrationDate": "2000-01-01"}
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_lookups_reuse_each_other(self, create_schema, executor, query_watcher):
+        result = executor(
+            create_schema(),
+            """
+            query ($id: ID!) {
+                a: user(id: 2) { nodeId name registrationDate }
+                b: user(id: 2) { name }
+                node(id: $id) { ... on User { name } }
+            }
+            """,
+            {"id": to_global_id("User", [2])},
+        )
+        assert not result.errors
+        assert result.data == {
+            "a": {
+                "nodeId": to_global_id("User", [2]),
+                "name": "user2",
+                "registrationDate": "2000-01-02",
+            },
+            "b": {"name": "user2"},
+            "node": {"name": "user2"},
+        }
+        assert query_watcher.executed_queries == [
+            "SELECT users.id AS __id, users.name, users.registration_date AS "
+            '"registrationDate" FROM users WHERE users.id = ? LIMIT ? OFFSET ?'
+        ]
+
+
+class TestBatchedLinks:
+    _AUTHORS_QUERY = (
+        "SELECT users.name, users.id AS __id, users.id AS __link_0 FROM users WHERE users.id IN"
+    )
+
+    @pytest.fixture()
+    def schema(self):
+        user_node = QueryableNode("User", query=select(UserDB))
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 076"])),
+            extra={"author": Link(user_node, strategy=LinkStrategy.BATCH)},
+        )
+        user_node.define_field("posts", Link(post_node))
+        return (
+            SchemaBuilder(identity_map=True)
+            .add_root_list("users", user_node)
+            .add_root_list("posts", post_node)
+            .add_root_single("user", user_node)
+            .build()
+        )
+
+    def test_nested_batch_reuses_materialized_entities(self, schema, executor, query_watcher):
+        result = executor(schema, "query { users { name posts { header author { name } } } }")
+        assert not result.errors
+        assert result.data == {
+            "users": [
+                {"name": "user1", "posts": [{"header": "Post 001", "author": {"name": "user1"}}]},
+                {"name": "user2", "posts": [{"header": "Post 076", "author": {"name": "user2"}}]},
+            ]
+        }
+        assert len(query_watcher.executed_queries) == 3
+        assert not any(
+            query.startswith(self._AUTHORS_QUERY) for query in query_watcher.executed_queries
+        )
+
+    def test_only_missing_entities_are_loaded(self, schema, executor, query_watcher):
+        result = executor(
+            schema, "query { user(id: 1) { name } posts { header author { name } } }"
+        )
+        assert not result.errors
+        assert result.data["posts"] == [
+            {"header": "Post 001", "author": {"name": "user1"}},
+            {"header": "Post 076", "author": {"name": "user2"}},
+        ]
+        assert query_watcher.executed_queries_with_args[-1] == (
+            f"{self._AUTHORS_QUERY} (?)",
+            (2,),
+        )
@@ -0,0 +1,134 @@
+import pytest
+from sqlalchemy import select
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import Link, LinkStrategy, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+_POSTS = ["Post 001", "Post 002", "Post 076"]
+
+
+def _build_schema(strategy, post_rows=None, user_rows=None):
+    user_node = QueryableNode("User", query=select(UserDB), estimated_rows=user_rows)
+    post_node = QueryableNode(
+        "Post",
+        query=select(PostDB).where(PostDB.header.in_(_POSTS)).order_by(PostDB.header),
+        extra={"user": Link(user_node, strategy=strategy)},
+        estimated_rows=post_rows,
+    )
+    return SchemaBuilder().add_root_list("posts", post_node).build()
+
+
+_EXPECTED = {
+    "posts": [
+        {"header": "Post 001", "user": {"name": "user1"}},
+        {"header": "Post 002", "user": {"name": "user1"}},
+        {"header": "Post 076", "user": {"name": "user2"}},
+    ]
+}
+
+_JOINED_QUERY = (
+    "SELECT posts.header, posts.user_id AS __user_id, users.name AS __e1_name FROM posts "
+    "JOIN users ON posts.user_id = users.id WHERE posts.header IN (?, ?, ?) ORDER BY posts.header"
+)
+
+_BATCHED_QUERIES = [
+    (
+        "SELECT posts.header, posts.user_id AS __user_id FROM posts "
+        "WHERE posts.header IN (?, ?, ?) ORDER BY posts.header",
+        tuple(_POSTS),
+    ),
+    (
+        "SELECT users.name, users.id AS __link_0 FROM users WHERE users.id IN (?, ?)",
+        (1, 2),
+    ),
+]
+
+
+class TestBatchStrategy:
+    def test_linked_records_are_loaded_by_keys(self, executor, query_watcher):
+        result = executor(
+            _build_schema(LinkStrategy.BATCH), "query { posts { header user { name } } }"
+        )
+        assert not result.errors
+        assert result.data == _EXPECTED
+        assert query_watcher.executed_queries_with_args == _BATCHED_QUERIES
+
+    def test_aliases_are_loaded_separately(self, executor, query_watcher):
+        result = executor(
+            _build_schema(LinkStrategy.BATCH),
+            "query { posts { user { name } owner: user { id } } }",
+        )
+        assert not result.errors
+        assert result.data["posts"][2] == {"user": {"name": "user2"}, "owner": {"id": 2}}
+        assert query_watcher.executed_queries[1:] == [
+            "SELECT users.name, users.id AS __link_0 FROM users WHERE users.id IN (?, ?)",
+            "SELECT users.id, users.id AS __link_0 FROM users WHERE users.id IN (?, ?)",
+        ]
+
+    def test_link_columns_are_selected_once(self, executor, query_watcher):
+        result = executor(
+            _build_schema(LinkStrategy.BATCH),
+            "query { posts { userId user { id } owner: userId } }",
+        )
+        assert not result.errors
+        assert result.data["posts"][2] == {"userId": 2, "user": {"id": 2}, "owner": 2}
+        assert query_watcher.executed_queries == [
+            'SELECT posts.user_id AS "userId" FROM posts WHERE posts.header IN (?, ?, ?) ORDER '
+            "BY posts.header",
+            "SELECT users.id, users.id AS __link_0 FROM users WHERE users.id IN (?, ?)",
+        ]
+
+    def test_strategy_of_multiple_link(self):
+        post_node = QueryableNode("Post", query=select(PostDB))
+        user_node = QueryableNode(
+            "User",
+            query=select(UserDB),
+            extra={"posts": Link(post_node, strategy=LinkStrategy.BATCH)},
+        )
+        with pytest.raises(GQLBuilderException, match="defines loading strategy"):
+            SchemaBuilder().add_root_list("users", user_node).build()
+
+
+class TestAutoStrategy:
+    def test_join_without_statistics(self, executor, query_watcher):
+        result = executor(
+            _build_schema(LinkStrategy.AUTO), "query { posts { header user { name } } }"
+        )
+        assert not result.errors
+        assert result.data == _EXPECTED
+        assert query_watcher.executed_queries == [_JOINED_QUERY]
+
+    def test_batch_for_many_parents_of_few_records(self, executor, query_watcher):
+        result = executor(
+            _build_schema(LinkStrategy.AUTO, post_rows=10000, user_rows=10),
+            "query { posts { header user { name } } }",
+        )
+        assert not result.errors
+        assert result.data == _EXPECTED
+        assert query_watcher.executed_queries_with_args == _BATCHED_QUERIES
+
+    def test_observed_results_replace_estimates(self, executor, query_watcher):
+        schema = _build_schema(LinkStrategy.AUTO, post_rows=10000, user_rows=10)
+        query = "query { posts { header user { name } } }"
+        assert executor(schema, query).data == _EXPECTED
+
+        # only 3 parents were observed, joining is cheaper
+        assert executor(schema, query).data == _EXPECTED
+        assert query_watcher.executed_queries[2:] == [_JOINED_QUERY]
+
+    def test_missing_joined_record(self, executor, query_watcher):
+        user_node = QueryableNode("User", query=select(UserDB).where(UserDB.id == 2))
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header.in_(_POSTS)).order_by(PostDB.header),
+            extra={"user": Link(user_node, strategy=LinkStrategy.AUTO)},
+        )
+        schema = SchemaBuilder().add_root_list("posts", post_node).build()
+        result = executor(schema, "query { posts { user { name } } }")
+        assert not result.errors
+        assert result.data == {
+            "posts": [{"user": None}, {"user": None}, {"user": {"name": "user2"}}]
+        }
+        assert len(query_watcher.executed_queries) == 1
@@ -0,0 +1,147 @@
+import pytest
+from sqlalchemy import Column, ForeignKey, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.orm import Session
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import Link, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+
+metadata = MetaData()
+
+students = Table(
+    "students",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+)
+
+courses = Table(
+    "courses",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String(200), nullable=False),
+)
+
+enrollments = Table(
+    "enrollments",
+    metadata,
+    Column("student_id", ForeignKey(students.c.id), primary_key=True),
+    Column("course_id", ForeignKey(courses.c.id), primary_key=True),
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tables(database_engine):
+    metadata.create_all(bind=database_engine)
+    with Session(bind=database_engine, future=True) as session:
+        session.execute(
+            insert(students),
+            [{"id": 1, "name": "Ann"}, {"id": 2, "name": "Bob"}, {"id": 3, "name": "Cid"}],
+        )
+        session.execute(
+            insert(courses),
+            [{"id": 1, "title": "Math"}, {"id": 2, "title": "Art"}, {"id": 3, "title": "History"}],
+        )
+        session.execute(
+            insert(enrollments),
+            [
+                {"student_id": 1, "course_id": 1},
+                {"student_id": 1, "course_id": 2},
+                {"student_id": 2, "course_id": 1},
+            ],
+        )
+        session.commit()
+    yield
+    metadata.drop_all(bind=database_engine)
+
+
+def _build_schema(**link_options):
+    course_node = QueryableNode("Course", query=select(courses).order_by(courses.c.title))
+    student_node = QueryableNode(
+        "Student",
+        query=select(students).order_by(students.c.id),
+        extra={"courses": Link(course_node, **link_options)},
+    )
+    course_node.define_field("students", Link(student_node, through=enrollments))
+    return (
+        SchemaBuilder()
+        .add_root_list("students", student_node)
+        .add_root_list("courses", course_node)
+        .build()
+    )
+
+
+class TestManyToMany:
+    def test_association_table_is_detected(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { students { name courses { title } } }")
+        assert not result.errors
+        assert result.data == {
+            "students": [
+                {"name": "Ann", "courses": [{"title": "Art"}, {"title": "Math"}]},
+                {"name": "Bob", "courses": [{"title": "Math"}]},
+                {"name": "Cid", "courses": []},
+            ]
+        }
+        assert query_watcher.executed_queries_with_args == [
+            ("SELECT students.name, students.id AS __id FROM students ORDER BY students.id", ()),
+            (
+                "SELECT courses.title, enrollments.student_id AS __link_0 FROM courses JOIN "
+                "enrollments ON enrollments.course_id = courses.id WHERE enrollments.student_id "
+                "IN (?, ?, ?) ORDER BY courses.title",
+                (1, 2, 3),
+            ),
+        ]
+
+    def test_explicit_association_table(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { courses { title students { name } } }")
+        assert not result.errors
+        assert result.data == {
+            "courses": [
+                {"title": "Art", "students": [{"name": "Ann"}]},
+                {"title": "History", "students": []},
+                {"title": "Math", "students": [{"name": "Ann"}, {"name": "Bob"}]},
+            ]
+        }
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_limit_applies_to_each_parent(self, executor, query_watcher):
+        result = executor(
+            _build_schema(default_limit=1), "query { students { name courses { title } } }"
+        )
+        assert not result.errors
+        assert result.data == {
+            "students": [
+                {"name": "Ann", "courses": [{"title": "Art"}]},
+                {"name": "Bob", "courses": [{"title": "Math"}]},
+                {"name": "Cid", "courses": []},
+            ]
+        }
+        assert result.extensions == {
+            "truncated": [{"path": ["students", 0, "courses"], "limit": 1}]
+        }
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_paged_link(self, executor, query_watcher):
+        result = executor(
+            _build_schema(pageable=True),
+            "query { students { name courses { nodes { title } pageInfo { totalCount } } } }",
+        )
+        assert not result.errors
+        assert result.data["students"][0] == {
+            "name": "Ann",
+            "courses": {
+                "nodes": [{"title": "Art"}, {"title": "Math"}],
+                "pageInfo": {"totalCount": 2},
+            },
+        }
+        assert result.data["students"][2]["courses"]["nodes"] == []
+
+    def test_table_without_relation_to_both_nodes(self):
+        course_node = QueryableNode("Course", query=select(courses))
+        student_node = QueryableNode(
+            "Student",
+            query=select(students),
+            extra={"courses": Link(course_node, through=students)},
+        )
+        with pytest.raises(GQLBuilderException, match="Failed to determine implicit relation"):
+            SchemaBuilder().add_root_list("students", student_node).build()
@@ -0,0 +1,207 @@
+import pytest
+from graphql import print_schema
+from sqlalchemy import select
+
+from sqlgraphql.cache import ResultCache
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import MemoryResidency, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestMemoryResidentNode:
+    @pytest.fixture()
+    def cache(self):
+        return ResultCache()
+
+    @pytest.fixture()
+    def schema(self, cache):
+        user_node = QueryableNode(
+            "User", query=select(UserDB), memory_resident=MemoryResidency(ttl=300)
+        )
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 100"])),
+            extra={"user": user_node},
+        )
+        return SchemaBuilder(result_cache=cache).add_root_list("posts", post_node).build()
+
+    def test_gql_schema_is_as_expected(self, schema):
+        assert print_schema(schema) == (
+            "type Query {\n"
+            "  posts: [Post]\n"
+            "}\n"
+            "\n"
+            "type Post {\n"
+            "  id: ID!\n"
+            "  userId: Int!\n"
+            "  header: String!\n"
+            "  body: String!\n"
+            "  user: User!\n"
+            "}\n"
+            "\n"
+            "type User {\n"
+            "  id: Int!\n"
+            "  name: String!\n"
+            "  registrationDate: Date!\n"
+            "}\n"
+            "\n"
+            '"""Date scalar type represents date in ISO format (YYYY-MM-DD)."""\n'
+            "scalar Date"
+        )
+
+    def test_linked_records_are_resolved_from_memory(self, schema, executor, query_watcher):
+        query = "query { posts { header user { name registrationDate } } }"
+        first = executor(schema, query)
+        second = executor(schema, query)
+
+        assert not first.errors
+        assert (
+            first.data
+            == second.data
+            == {
+                "posts": [
+                    {
+                        "header": "Post 001",
+                        "user": {"name": "user1", "registrationDate": "2000-01-01"},
+                    },
+                    {
+                        "header": "Post 100",
+                        "user": {"name": "user2", "registrationDate": "2000-01-02"},
+                    },
+                ]
+            }
+        )
+        assert query_watcher.executed_queries == [
+            "SELECT posts.header, posts.user_id AS __user_id FROM posts "
+            "WHERE posts.header IN (?, ?)",
+            "SELECT users.id, users.name, users.registration_date AS "
+            '"registrationDate", users.id AS __key_0 FROM users',
+            "SELECT posts.header, posts.user_id AS __user_id FROM posts "
+            "WHERE posts.header IN (?, ?)",
+        ]
+
+    def test_records_are_reloaded_after_invalidation(self, schema, executor, query_watcher, cache):
+        query = "query { posts { user { name } } }"
+        executor(schema, query)
+        cache.invalidate(UserDB.__table__)
+        result = executor(schema, query)
+
+        assert not result.errors
+        assert result.data == {"posts": [{"user": {"name": "user1"}}, {"user": {"name": "user2"}}]}
+        assert (
+            query_watcher.executed_queries.count(
+                "SELECT users.id, users.name, users.registration_date AS "
+                '"registrationDate", users.id AS __key_0 FROM users'
+            )
+            == 2
+        )
+
+    def test_resident_node_cannot_link_to_regular_node(self):
+        user_node = QueryableNode("User", query=select(UserDB))
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB),
+            extra={"user": user_node},
+            memory_resident=MemoryResidency(),
+        )
+        with pytest.raises(GQLBuilderException) as exc_info:
+            SchemaBuilder().add_root_list("posts", post_node).build()
+
+        assert str(exc_info.value) == (
+            "Member 'user' in memory-resident node 'Post' links to node 'User', which is not"
+            " memory-resident."
+        )
+
+
+class TestSharedSnapshot:
+    _USERS_QUERY = (
+        "SELECT users.id, users.name, users.registration_date AS "
+        '"registrationDate", users.id AS __key_0 FROM users'
+    )
+
+    @pytest.fixture()
+    def create_schema(self, tmp_path):
+        def create_schema():
+            cache = ResultCache()
+            user_node = QueryableNode(
+                "User",
+                query=select(UserDB),
+                memory_resident=MemoryResidency(ttl=300, snapshot_dir=tmp_path),
+            )
+            post_node = QueryableNode(
+                "Post",
+                query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 100"])),
+                extra={"user": user_node},
+            )
+            return (
+                SchemaBuilder(result_cache=cache).add_root_list("posts", post_node).build(),
+                cache,
+            )
+
+        return create_schema
+
+    @pytest.fixture()
+    def rename_user(self, session_factory):
+        def rename_user(name):
+            with session_factory.begin() as session:
+                session.get(UserDB, 2).name = name
+
+        yield rename_user
+        rename_user("user2")
+
+    def test_records_are_shared_by_processes(
+        self, create_schema, executor, query_watcher, tmp_path
+    ):
+        query = "query { posts { header user { id name registrationDate } } }"
+        first_schema, _ = create_schema()
+        first = executor(first_schema, query)
+        # other process (or restarted one) maps the same snapshot
+        second_schema, _ = create_schema()
+        second = executor(second_schema, query)
+
+        assert not first.errors
+        assert (
+            first.data
+            == second.data
+            == {
+                "posts": [
+                    {
+                        "header": "Post 001",
+                        "user": {"id": 1, "name": "user1", "registrationDate": "2000-01-01"},
+                    },
+                    {
+                        "header": "Post 100",
+                        "user": {"id": 2, "name": "user2", "registrationDate": "2000-01-02"},
+                    },
+                ]
+            }
+        )
+        assert query_watcher.executed_queries.count(self._USERS_QUERY) == 1
+        assert [path.name for path in tmp_path.iterdir()] == ["User_id"]
+
+    def test_replaced_snapshot_is_used_by_other_processes(
+        self, create_schema, executor, query_watcher, rename_user
+    ):
+        query = "query { posts { user { name } } }"
+        first_schema, first_cache = create_schema()
+        second_schema, _ = create_schema()
+        executor(first_schema, query)
+        executor(second_schema, query)
+
+        rename_user("renamed")
+        first_cache.invalidate(UserDB.__table__)
+        first = executor(first_schema, query)
+        second = executor(second_schema, query)
+
+        assert (
+            first.data
+            == second.data
+            == {"posts": [{"user": {"name": "user1"}}, {"user": {"name": "renamed"}}]}
+        )
+        assert query_watcher.executed_queries.count(self._USERS_QUERY) == 2
+
+    def test_ttl_is_required(self, tmp_path):
+        # snapshot could be reused by restarted process forever
+        with pytest.raises(ValueError, match="TTL of memory-resident records is required"):
+            MemoryResidency(snapshot_dir=tmp_path)
@@ -76,10 +76,34 @@ class TestN1Selection:
             ]
         }
         assert query_watcher.executed_queries == [
-            "SELECT posts.header, users.id IS NOT NULL AS __e1_, users.id AS __e1_id, "
-            'users.name AS __e1_name, users.registration_date AS "__e1_registrationDate" '
-            "FROM posts LEFT OUTER JOIN users ON posts.user_id = users.id ORDER BY "
-            "posts.header"
+            "SELECT posts.header, users.id AS __e1_id, users.name AS __e1_name, "
+            'users.registration_date AS "__e1_registrationDate" FROM posts JOIN users ON '
+            "posts.user_id = users.id ORDER BY posts.header"
+        ]
+
+    def test_occurrences_of_relation_are_merged(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            """
+            query {
+                posts {
+                    user { id }
+                    ...PostUser
+                    ... on Post { user { name } }
+                }
+            }
+
+            fragment PostUser on Post { header user { id name } }
+            """,
+        )
+        assert not result.errors
+        assert result.data["posts"][0] == {
+            "user": {"id": 1, "name": "user1"},
+            "header": "Post 001",
+        }
+        assert query_watcher.executed_queries == [
+            "SELECT users.id AS __e1_id, users.name AS __e1_name, posts.header FROM posts JOIN "
+            "users ON posts.user_id = users.id ORDER BY posts.header"
         ]
 
 
@@ -155,13 +179,66 @@ class TestN1SelectionWithNonTrivialRemote:
         assert query_watcher.executed_queries_with_args == [
             (
                 (
-                    "SELECT posts.header, anon_1.__e1_, anon_1.id AS __e1_id, anon_1.name AS "
-                    '__e1_name, anon_1.registration_date AS "__e1_registrationDate" FROM posts '
-                    "LEFT OUTER JOIN (SELECT users.id AS id, users.name AS name, "
-                    "users.registration_date AS registration_date, ? AS __e1_ FROM users WHERE "
-                    "users.registration_date > ?) AS anon_1 ON posts.user_id = anon_1.id ORDER "
-                    "BY posts.header"
+                    "SELECT posts.header, users.id IS NOT NULL AS __e1_, users.id AS __e1_id, "
+                    'users.name AS __e1_name, users.registration_date AS "__e1_registrationDate" '
+                    "FROM posts LEFT OUTER JOIN users ON posts.user_id = users.id AND "
+                    "users.registration_date > ? ORDER BY posts.header"
                 ),
-                (1, "2000-01-01"),
+                ("2000-01-01",),
             )
         ]
+
+    def test_select_sibling_relations(self, executor, query_watcher):
+        user_node = QueryableNode("User", query=select(UserDB))
+        author_node = QueryableNode(
+            "Author",
+            query=(select(UserDB).where(UserDB.registration_date > datetime.date(2000, 1, 1))),
+        )
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 100"])),
+            extra={"user": user_node, "author": author_node},
+        )
+        schema = SchemaBuilder().add_root_list("posts", post_node).build()
+
+        result = executor(schema, "query { posts { user { name } author { name } } }")
+        assert not result.errors
+        assert result.data == {
+            "posts": [
+                {"user": {"name": "user1"}, "author": None},
+                {"user": {"name": "user2"}, "author": {"name": "user2"}},
+            ]
+        }
+        assert query_watcher.executed_queries == [
+            "SELECT users.name AS __e1_name, anon_1.__e2_, anon_1.name AS __e2_name FROM posts "
+            "JOIN users ON posts.user_id = users.id LEFT OUTER JOIN (SELECT users.id AS id, "
+            "users.name AS name, "
+            "users.registration_date AS registration_date, ? AS __e2_ FROM users WHERE "
+            "users.registration_date > ?) AS anon_1 ON posts.user_id = anon_1.id WHERE "
+            "posts.header IN (?, ?)"
+        ]
+
+    def test_filter_with_subquery_is_not_merged(self, executor, query_watcher):
+        user_node = QueryableNode(
+            "User",
+            query=select(UserDB).where(
+                UserDB.id.in_(select(PostDB.user_id).where(PostDB.header == "Post 100"))
+            ),
+        )
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB).where(PostDB.header.in_(["Post 001", "Post 100"])),
+            extra={"user": user_node},
+        )
+        schema = SchemaBuilder().add_root_list("posts", post_node).build()
+
+        result = executor(schema, "query { posts { user { name } } }")
+        assert not result.errors
+        assert result.data == {"posts": [{"user": None}, {"user": {"name": "user2"}}]}
+        assert query_watcher.executed_queries == [
+            "SELECT anon_1.__e1_, anon_1.name AS __e1_name FROM posts LEFT OUTER JOIN (SELECT "
+            "users.id AS id, users.name AS name, users.registration_date AS registration_date, "
+            "? AS __e1_ FROM users WHERE users.id IN (SELECT posts.user_id FROM posts WHERE "
+            "posts.header = ?)) AS anon_1 ON posts.user_id = anon_1.id WHERE posts.header IN "
+            "(?, ?)"
+        ]
@@ -0,0 +1,148 @@
+import pytest
+from graphql import print_schema
+from sqlalchemy import select
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import QueryableNode
+from sqlgraphql.relay import from_global_id, to_global_id
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestNodeInterface:
+    @pytest.fixture()
+    def schema(self):
+        user_node = QueryableNode("User", query=select(UserDB), implements_node=True)
+        post_node = QueryableNode(
+            "Post",
+            query=select(PostDB.id, PostDB.header).order_by(PostDB.header),
+            implements_node=True,
+        )
+        return (
+            SchemaBuilder(node_id_field="nodeId")
+            .add_root_list("users", user_node)
+            .add_root_list("posts", post_node)
+            .build()
+        )
+
+    @pytest.fixture()
+    def post_ids(self, session_factory):
+        with session_factory() as session:
+            return session.scalars(
+                select(PostDB.id).where(PostDB.header.in_(["Post 001", "Post 002"]))
+            ).all()
+
+    def test_gql_schema_is_as_expected(self, schema):
+        assert print_schema(schema) == (
+            "type Query {\n"
+            "  users: [User]\n"
+            "  posts: [Post]\n"
+            "  node(id: ID!): Node\n"
+            "  nodes(ids: [ID!]!): [Node]!\n"
+            "}\n"
+            "\n"
+            "type User implements Node {\n"
+            "  nodeId: ID!\n"
+            "  id: Int!\n"
+            "  name: String!\n"
+            "  registrationDate: Date!\n"
+            "}\n"
+            "\n"
+            "interface Node {\n"
+            "  nodeId: ID!\n"
+            "}\n"
+            "\n"
+            '"""Date scalar type represents date in ISO format (YYYY-MM-DD)."""\n'
+            "scalar Date\n"
+            "\n"
+            "type Post implements Node {\n"
+            "  nodeId: ID!\n"
+            "  id: ID!\n"
+            "  header: String!\n"
+            "}"
+        )
+
+    def test_global_ids_are_selected(self, schema, executor, query_watcher):
+        result = executor(schema, "query { users { nodeId name } }")
+        assert not result.errors
+        assert result.data == {
+            "users": [
+                {"nodeId": to_global_id("User", [1]), "name": "user1"},
+                {"nodeId": to_global_id("User", [2]), "name": "user2"},
+            ]
+        }
+        assert from_global_id(result.data["users"][1]["nodeId"]) == ("User", [2])
+        assert query_watcher.executed_queries == ["SELECT users.id AS __id, users.name FROM users"]
+
+    def test_select_node(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            "query ($id: ID!) { node(id: $id) { nodeId ... on User { name } } }",
+            {"id": to_global_id("User", [2])},
+        )
+        assert not result.errors
+        assert result.data == {"node": {"nodeId": to_global_id("User", [2]), "name": "user2"}}
+        assert query_watcher.executed_queries_with_args == [
+            (
+                "SELECT users.id AS __id, users.name FROM users WHERE users.id = ? "
+                "LIMIT ? OFFSET ?",
+                (2, 1, 0),
+            )
+        ]
+
+    def test_nodes_are_loaded_by_type(self, schema, executor, post_ids, query_watcher):
+        ids = [
+            to_global_id("Post", [post_ids[1]]),
+            to_global_id("User", [1]),
+            to_global_id("Unknown", [1]),
+            to_global_id("User", [3]),
+            to_global_id("Post", [post_ids[0]]),
+            to_global_id("User", [2]),
+        ]
+        result = executor(
+            schema,
+            """
+            query ($ids: [ID!]!) {
+                nodes(ids: $ids) {
+                    __typename
+                    ... on User { name }
+                    ...PostFields
+                }
+            }
+
+            fragment PostFields on Post { header }
+            """,
+            {"ids": ids},
+        )
+        assert not result.errors
+        headers = sorted(["Post 001", "Post 002"])
+        assert result.data == {
+            "nodes": [
+                {"__typename": "Post", "header": headers[1]},
+                {"__typename": "User", "name": "user1"},
+                None,
+                None,
+                {"__typename": "Post", "header": headers[0]},
+                {"__typename": "User", "name": "user2"},
+            ]
+        }
+        assert query_watcher.executed_queries == [
+            "SELECT posts.header, posts.id AS __lookup_0 FROM posts "
+            "WHERE posts.id IN (?, ?) ORDER BY posts.header",
+            "SELECT users.name, users.id AS __lookup_0 FROM users WHERE users.id IN (?, ?, ?)",
+        ]
+
+    def test_invalid_global_id(self, schema, executor):
+        result = executor(schema, 'query { node(id: "invalid") { nodeId } }')
+        assert result.data == {"node": None}
+        assert [error.message for error in result.errors] == ["Invalid global ID 'invalid'."]
+
+    def test_global_id_conflicts_with_column(self):
+        user_node = QueryableNode("User", query=select(UserDB), implements_node=True)
+        with pytest.raises(GQLBuilderException) as exc_info:
+            SchemaBuilder().add_root_list("users", user_node)
+
+        assert str(exc_info.value) == (
+            "Member 'id' in node 'User' conflicts with global ID field of Node interface."
+            " Rename the member or global ID field."
+        )
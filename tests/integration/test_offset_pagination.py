@@ -2,9 +2,9 @@ import pytest
 from graphql import print_schema
 from sqlalchemy import select
 
-from sqlgraphql.model import QueryableNode
+from sqlgraphql.model import Link, QueryableNode
 from sqlgraphql.schema import SchemaBuilder
-from tests.integration.conftest import PostDB
+from tests.integration.conftest import PostDB, UserDB
 
 
 class TestOffsetPagination:
@@ -115,6 +115,16 @@ class TestOffsetPagination:
             ("SELECT count(*) AS count_1 FROM posts", ())
         ]
 
+    def test_aliased_nodes(self, schema, executor, query_watcher):
+        result = executor(
+            schema, "query { posts(pageSize: 2) { a: nodes { header } b: nodes { body } } }"
+        )
+        assert not result.errors
+        posts = result.data["posts"]
+        assert [node["header"] for node in posts["a"]] == ["Post 001", "Post 002"]
+        assert len(posts["b"]) == 2 and all(node["body"] for node in posts["b"])
+        assert len(query_watcher.executed_queries) == 1
+
     def test_custom_page_index_and_size(self, schema, executor, query_watcher):
         result = executor(
             schema,
@@ -145,3 +155,178 @@ class TestOffsetPagination:
             ("SELECT posts.header FROM posts ORDER BY posts.header LIMIT ? OFFSET ?", (6, 30)),
             ("SELECT count(*) AS count_1 FROM posts", ()),
         ]
+
+
+class TestOffsetPaginatedLink:
+    @pytest.fixture()
+    def schema(self):
+        post_node = QueryableNode("Post", query=select(PostDB).order_by(PostDB.header))
+        user_node = QueryableNode(
+            "User", query=select(UserDB), extra={"posts": Link(post_node, pageable=True)}
+        )
+        return SchemaBuilder().add_root_list("users", user_node).build()
+
+    def test_gql_schema_is_as_expected(self, schema):
+        assert print_schema(schema) == (
+            "type Query {\n"
+            "  users: [User]\n"
+            "}\n"
+            "\n"
+            "type User {\n"
+            "  id: Int!\n"
+            "  name: String!\n"
+            "  registrationDate: Date!\n"
+            "  posts(page: Int, pageSize: Int): PostPagedObject!\n"
+            "}\n"
+            "\n"
+            '"""Date scalar type represents date in ISO format (YYYY-MM-DD)."""\n'
+            "scalar Date\n"
+            "\n"
+            "type PostPagedObject {\n"
+            "  nodes: [Post!]!\n"
+            "  pageInfo: OffsetPageInfo!\n"
+            "}\n"
+            "\n"
+            "type Post {\n"
+            "  id: ID!\n"
+            "  userId: Int!\n"
+            "  header: String!\n"
+            "  body: String!\n"
+            "}\n"
+            "\n"
+            "type OffsetPageInfo {\n"
+            "  page: Int!\n"
+            "  pageSize: Int!\n"
+            "  totalCount: Int!\n"
+            "  totalPages: Int!\n"
+            "}"
+        )
+
+    def test_paged_link(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            """
+            query {
+                users {
+                    name
+                    posts(page: 1, pageSize: 20) {
+                        nodes {
+                            header
+                        }
+                        pageInfo {
+                            page
+                            pageSize
+                            totalCount
+                            totalPages
+                        }
+                    }
+                }
+            }
+            """,
+        )
+        assert not result.errors
+        assert result.data == {
+            "users": [
+                {
+                    "name": "user1",
+                    "posts": {
+                        "nodes": [{"header": f"Post {i:03}"} for i in range(21, 41)],
+                        "pageInfo": {
+                            "page": 1,
+                            "pageSize": 20,
+                            "totalCount": 75,
+                            "totalPages": 4,
+                        },
+                    },
+                },
+                {
+                    "name": "user2",
+                    "posts": {
+                        "nodes": [{"header": f"Post {i:03}"} for i in range(96, 101)],
+                        "pageInfo": {
+                            "page": 1,
+                            "pageSize": 20,
+                            "totalCount": 25,
+                            "totalPages": 2,
+                        },
+                    },
+                },
+            ]
+        }
+        assert query_watcher.executed_queries_with_args == [
+            ("SELECT users.name, users.id AS __id FROM users", ()),
+            (
+                "SELECT anon_1.header, anon_1.__link_0 FROM (SELECT posts.header AS header, "
+                "posts.user_id AS __link_0, row_number() OVER (PARTITION BY posts.user_id "
+                "ORDER BY posts.header, posts.id) AS __row_number FROM posts "
+                "WHERE posts.user_id IN (?, ?)) AS anon_1 "
+                "WHERE anon_1.__row_number > ? AND anon_1.__row_number <= ? "
+                "ORDER BY anon_1.__link_0, anon_1.__row_number",
+                (1, 2, 20, 40),
+            ),
+            (
+                "SELECT posts.user_id, count(*) AS count_1 FROM posts "
+                "WHERE posts.user_id IN (?, ?) GROUP BY posts.user_id",
+                (1, 2),
+            ),
+        ]
+
+    def test_aliased_nodes(self, schema, executor):
+        result = executor(
+            schema,
+            "query { users { posts(pageSize: 2) { a: nodes { header } b: nodes { body } } } }",
+        )
+        assert not result.errors
+        posts = result.data["users"][0]["posts"]
+        assert [node["header"] for node in posts["a"]] == ["Post 001", "Post 002"]
+        assert len(posts["b"]) == 2 and all(node["body"] for node in posts["b"])
+
+    def test_page_info_only(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            """
+            query {
+                users {
+                    posts {
+                        pageInfo {
+                            totalCount
+                        }
+                    }
+                }
+            }
+            """,
+        )
+        assert not result.errors
+        assert result.data == {
+            "users": [
+                {"posts": {"pageInfo": {"totalCount": 75}}},
+                {"posts": {"pageInfo": {"totalCount": 25}}},
+            ]
+        }
+        assert query_watcher.executed_queries_with_args == [
+            ("SELECT users.id AS __id FROM users", ()),
+            (
+                "SELECT posts.user_id, count(*) AS count_1 FROM posts "
+                "WHERE posts.user_id IN (?, ?) GROUP BY posts.user_id",
+                (1, 2),
+            ),
+        ]
+
+    def test_pages_of_unordered_node_are_ordered_by_primary_key(self, executor, query_watcher):
+        post_node = QueryableNode("Post", query=select(PostDB))
+        user_node = QueryableNode(
+            "User", query=select(UserDB), extra={"posts": Link(post_node, pageable=True)}
+        )
+        schema = SchemaBuilder().add_root_list("users", user_node).build()
+        all_posts = executor(schema, "query { users { posts(pageSize: 100) { nodes { id } } } }")
+        ids = sorted(post["id"] for post in all_posts.data["users"][0]["posts"]["nodes"])
+
+        result = executor(
+            schema, "query { users { posts(page: 1, pageSize: 2) { nodes { id } } } }"
+        )
+        assert not result.errors
+        assert [post["id"] for post in result.data["users"][0]["posts"]["nodes"]] == ids[2:4]
+        assert (
+            "row_number() OVER (PARTITION BY posts.user_id ORDER BY posts.id)"
+            in query_watcher.executed_queries[-1]
+        )
@@ -0,0 +1,180 @@
+import datetime
+
+import pytest
+from graphql import print_schema
+from sqlalchemy import Column, Date, ForeignKey, Integer, MetaData, String, Table, insert, select
+from sqlalchemy.orm import Session
+
+from sqlgraphql.cache import MemoryCacheBackend, ResultCache
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import PolymorphicNode, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import UserDB
+
+metadata = MetaData()
+
+articles = Table(
+    "articles",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("title", String(200), nullable=False),
+    Column("author_id", ForeignKey(UserDB.id), nullable=False),
+    Column("published", Date, nullable=False),
+)
+
+videos = Table(
+    "videos",
+    metadata,
+    Column("id", Integer, primary_key=True),
+    Column("url", String(200), nullable=False),
+    Column("duration", Integer, nullable=False),
+    Column("published", Date, nullable=False),
+)
+
+
+@pytest.fixture(scope="module", autouse=True)
+def tables(database_engine):
+    metadata.create_all(bind=database_engine)
+    with Session(bind=database_engine, future=True) as session:
+        session.execute(
+            insert(articles),
+            [
+                {
+                    "id": 1,
+                    "title": "First",
+                    "author_id": 1,
+                    "published": datetime.date(2020, 1, 1),
+                },
+                {
+                    "id": 2,
+                    "title": "Third",
+                    "author_id": 2,
+                    "published": datetime.date(2020, 3, 1),
+                },
+            ],
+        )
+        session.execute(
+            insert(videos),
+            [{"id": 1, "url": "v1", "duration": 60, "published": datetime.date(2020, 2, 1)}],
+        )
+        session.commit()
+    yield
+    metadata.drop_all(bind=database_engine)
+
+
+def _build_schema(
+    descending=False, cache_ttl=None, result_cache=None, identity_map=False, **options
+):
+    user_node = QueryableNode("User", query=select(UserDB))
+    article_node = QueryableNode(
+        "Article",
+        query=select(articles.c.title, articles.c.author_id, articles.c.published),
+        extra={"author": user_node},
+        cache_ttl=cache_ttl,
+    )
+    video_node = QueryableNode("Video", query=select(videos), cache_ttl=cache_ttl)
+    feed = PolymorphicNode(
+        "FeedItem", [article_node, video_node], order_by=["published"], descending=descending
+    )
+    return (
+        SchemaBuilder(result_cache=result_cache, identity_map=identity_map)
+        .add_root_union("feed", feed, **options)
+        .add_root_single("user", user_node)
+        .build()
+    )
+
+
+class TestPolymorphicNodes:
+    def test_gql_schema(self):
+        schema = print_schema(_build_schema())
+        assert "union FeedItem = Article | Video" in schema
+        assert "feed: [FeedItem!]" in schema
+
+    def test_items_are_loaded_by_single_query(self, executor, query_watcher):
+        result = executor(
+            _build_schema(),
+            """
+            query {
+                feed {
+                    __typename
+                    ... on Article { title author { name } }
+                    ... on Video { url }
+                }
+            }
+            """,
+        )
+        assert not result.errors
+        assert result.data == {
+            "feed": [
+                {"__typename": "Article", "title": "First", "author": {"name": "user1"}},
+                {"__typename": "Video", "url": "v1"},
+                {"__typename": "Article", "title": "Third", "author": {"name": "user2"}},
+            ]
+        }
+        assert query_watcher.executed_queries == [
+            "SELECT anon_1.__type, anon_1.__m0_title, anon_1.__m0___e1_name, anon_1.__m1_url "
+            "FROM (SELECT ? AS __type, articles.title AS __m0_title, users.name AS "
+            "__m0___e1_name, NULL AS __m1_url, articles.published AS __order_0 FROM articles "
+            "JOIN users ON articles.author_id = users.id UNION ALL SELECT ? AS __type, NULL AS "
+            "__m0_title, NULL AS __m0___e1_name, videos.url AS __m1_url, videos.published AS "
+            "__order_0 FROM videos) AS anon_1 ORDER BY anon_1.__order_0"
+        ]
+
+    def test_fragments_of_other_types_are_not_selected(self, executor, query_watcher):
+        result = executor(_build_schema(), "query { feed { ... on Video { duration } } }")
+        assert not result.errors
+        assert result.data == {"feed": [{}, {"duration": 60}, {}]}
+        assert query_watcher.executed_queries == [
+            "SELECT anon_1.__type, anon_1.__m1_duration FROM (SELECT ? AS __type, NULL AS "
+            "__m1_duration, articles.published AS __order_0 FROM articles UNION ALL SELECT ? "
+            "AS __type, videos.duration AS __m1_duration, videos.published AS __order_0 FROM "
+            "videos) AS anon_1 ORDER BY anon_1.__order_0"
+        ]
+
+    def test_limit(self, executor):
+        result = executor(
+            _build_schema(default_limit=2), "query { feed { ... on Article { title } } }"
+        )
+        assert not result.errors
+        assert result.data == {"feed": [{"title": "First"}, {}]}
+        assert result.extensions == {"truncated": [{"path": ["feed"], "limit": 2}]}
+
+    def test_descending_order(self, executor, query_watcher):
+        result = executor(
+            _build_schema(descending=True), "query { feed { ... on Article { title } } }"
+        )
+        assert not result.errors
+        assert result.data == {"feed": [{"title": "Third"}, {}, {"title": "First"}]}
+        assert query_watcher.executed_queries[0].endswith("ORDER BY anon_1.__order_0 DESC")
+
+    def test_result_is_served_from_cache(self, executor, query_watcher):
+        schema = _build_schema(cache_ttl=60, result_cache=ResultCache(MemoryCacheBackend()))
+        first = executor(schema, "query { feed { ... on Video { url } } }")
+        second = executor(schema, "query { feed { ... on Video { url } } }")
+        assert not first.errors
+        assert first.data == second.data == {"feed": [{}, {"url": "v1"}, {}]}
+        assert len(query_watcher.executed_queries) == 1
+
+    def test_members_without_ttl_are_not_cached(self, executor, query_watcher):
+        schema = _build_schema(result_cache=ResultCache(MemoryCacheBackend()))
+        executor(schema, "query { feed { ... on Video { url } } }")
+        executor(schema, "query { feed { ... on Video { url } } }")
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_materialized_entities_are_reused(self, executor, query_watcher):
+        result = executor(
+            _build_schema(identity_map=True),
+            "query { feed { ... on Article { author { id name } } } user(id: 2) { id name } }",
+        )
+        assert not result.errors
+        assert result.data["user"] == {"id": 2, "name": "user2"}
+        assert len(query_watcher.executed_queries) == 1
+
+    def test_order_column_is_required(self):
+        feed = PolymorphicNode(
+            "FeedItem",
+            [QueryableNode("Video", query=select(videos.c.url))],
+            order_by=["published"],
+        )
+        with pytest.raises(GQLBuilderException, match="does not select column 'published'"):
+            SchemaBuilder().add_root_union("feed", feed)
@@ -0,0 +1,84 @@
+import pytest
+from graphql import graphql_sync
+from sqlalchemy import select
+
+from sqlgraphql.model import Link, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestQueryCost:
+    @pytest.fixture()
+    def schema(self):
+        user_node = QueryableNode("User", query=select(UserDB), estimated_rows=10)
+        post_node = QueryableNode(
+            "Post", query=select(PostDB).order_by(PostDB.header), extra={"user": user_node}
+        )
+        user_node.define_field("posts", Link(post_node, estimated_rows=40, max_rows=50))
+        return (
+            SchemaBuilder(max_query_cost=1000)
+            .add_root_list("users", user_node)
+            .add_root_list("posts", post_node, pageable=True)
+            .build()
+        )
+
+    def test_cost_is_reported(self, schema, executor, query_watcher):
+        result = executor(schema, "query { users { name posts { header } } }")
+        assert not result.errors
+        assert result.extensions["queryCost"] == {"estimated": 421, "maximum": 1000}
+        assert len(query_watcher.executed_queries) == 3
+
+    def test_limit_bounds_cardinality(self, schema, executor, query_watcher):
+        result = executor(schema, "query { users { posts(limit: 5) { header user { name } } } }")
+        assert not result.errors
+        assert result.extensions["queryCost"] == {"estimated": 161, "maximum": 1000}
+
+    def test_page_size_bounds_cardinality(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            """
+            query {
+                posts(pageSize: 30) {
+                    nodes {
+                        header
+                        user {
+                            name
+                            posts {
+                                header
+                            }
+                        }
+                    }
+                    pageInfo {
+                        totalCount
+                    }
+                }
+            }
+            """,
+        )
+        assert result.data is None
+        assert result.extensions == {"queryCost": {"estimated": 1353, "maximum": 1000}}
+        assert query_watcher.executed_queries == []
+
+    def test_expensive_query_is_rejected(self, schema, executor, query_watcher):
+        result = executor(schema, "query { users { name posts { header user { name } } } }")
+        assert result.data is None
+        assert [error.message for error in result.errors] == [
+            "Estimated query cost 1221 exceeds maximum allowed cost 1000."
+        ]
+        assert result.extensions == {"queryCost": {"estimated": 1221, "maximum": 1000}}
+        assert query_watcher.executed_queries == []
+
+    def test_cost_is_checked_without_execution_context(
+        self, schema, session_factory, query_watcher
+    ):
+        with session_factory.begin() as session:
+            result = graphql_sync(
+                schema,
+                "query { users { name posts { header user { name } } } }",
+                context_value={"db_session": session},
+            )
+        assert result.data == {"users": None}
+        assert [error.message for error in result.errors] == [
+            "Estimated query cost 1221 exceeds maximum allowed cost 1000."
+        ]
+        assert query_watcher.executed_queries == []
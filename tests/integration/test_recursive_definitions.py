@@ -107,10 +107,9 @@ class TestRecursiveDefinitions:
         }
         assert query_watcher.executed_queries_with_args == [
             (
-                "SELECT posts.header, users.id IS NOT NULL AS __e1_, users.name AS "
-                "__e1_name, users.id AS __e1___id FROM posts LEFT OUTER JOIN users ON "
-                "posts.user_id = users.id WHERE posts.header IN (?, ?, ?, ?) ORDER BY "
-                "posts.header",
+                "SELECT posts.header, users.name AS __e1_name, users.id AS __e1___id FROM "
+                "posts JOIN users ON posts.user_id = users.id WHERE posts.header IN "
+                "(?, ?, ?, ?) ORDER BY posts.header",
                 ("Post 001", "Post 002", "Post 003", "Post 076"),
             ),
             (
@@ -0,0 +1,255 @@
+import datetime
+
+import pytest
+from graphql import graphql_sync
+from sqlalchemy import create_engine, select, update
+from sqlalchemy.orm import Session, sessionmaker
+
+from sqlgraphql.cache import MemoryCacheBackend, ResultCache, SQLiteCacheBackend
+from sqlgraphql.model import QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from sqlgraphql.types import TypedResolveContext
+from tests.integration.conftest import Base, PostDB, UserDB
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestResultCache:
+    @pytest.fixture()
+    def clock(self):
+        return _Clock()
+
+    @pytest.fixture()
+    def cache(self, clock):
+        return ResultCache(MemoryCacheBackend(max_entries=2), clock=clock)
+
+    @pytest.fixture()
+    def schema(self, cache):
+        user_node = QueryableNode("User", query=select(UserDB), cache_ttl=60)
+        post_node = QueryableNode(
+            "Post", query=select(PostDB).order_by(PostDB.header), extra={"user": user_node}
+        )
+        return (
+            SchemaBuilder(result_cache=cache)
+            .add_root_list("users", user_node)
+            .add_root_list("posts", post_node)
+            .build()
+        )
+
+    def test_result_is_served_from_cache(self, schema, executor, query_watcher):
+        first = executor(schema, "query { users { name } }")
+        second = executor(schema, "query { users { name } }")
+        assert not first.errors
+        assert first.data == second.data == {"users": [{"name": "user1"}, {"name": "user2"}]}
+        assert query_watcher.executed_queries == ["SELECT users.name FROM users"]
+
+    def test_nodes_without_ttl_are_not_cached(self, schema, executor, query_watcher, cache):
+        executor(schema, "query { posts { header } }")
+        executor(schema, "query { posts { header } }")
+        assert len(query_watcher.executed_queries) == 2
+        assert len(cache) == 0
+
+    def test_entry_expires(self, schema, executor, query_watcher, clock):
+        executor(schema, "query { users { name } }")
+        clock.now = 59
+        executor(schema, "query { users { name } }")
+        clock.now = 60
+        executor(schema, "query { users { name } }")
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_invalidation_by_table(self, schema, executor, query_watcher, cache):
+        executor(schema, "query { users { name } }")
+        cache.invalidate("posts")
+        executor(schema, "query { users { name } }")
+        cache.invalidate(UserDB.__table__)
+        executor(schema, "query { users { name } }")
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_least_recently_used_entry_is_evicted(self, schema, executor, query_watcher):
+        executor(schema, "query { users { name } }")
+        executor(schema, "query { users { id } }")
+        executor(schema, "query { users { name } }")
+        executor(schema, "query { users { registrationDate } }")
+        executor(schema, "query { users { name } }")
+        executor(schema, "query { users { id } }")
+        assert query_watcher.executed_queries == [
+            "SELECT users.name FROM users",
+            "SELECT users.id FROM users",
+            'SELECT users.registration_date AS "registrationDate" FROM users',
+            "SELECT users.id FROM users",
+        ]
+
+
+class TestSQLiteCacheBackend:
+    @pytest.fixture()
+    def cache_path(self, tmp_path):
+        return tmp_path / "cache.sqlite"
+
+    @pytest.fixture()
+    def create_schema(self, cache_path):
+        backends = []
+
+        def create_schema(max_size=64 * 1024):
+            backend = SQLiteCacheBackend(cache_path, max_size=max_size)
+            backends.append(backend)
+            cache = ResultCache(backend)
+            user_node = QueryableNode("User", query=select(UserDB), cache_ttl=60)
+            return (
+                SchemaBuilder(result_cache=cache).add_root_list("users", user_node).build(),
+                cache,
+            )
+
+        yield create_schema
+        for backend in backends:
+            backend.close()
+
+    def test_cache_survives_restart(self, create_schema, executor, query_watcher):
+        schema, _ = create_schema()
+        first = executor(schema, "query { users { name } }")
+
+        # new process with cold memory
+        schema, cache = create_schema()
+        second = executor(schema, "query { users { name } }")
+
+        assert not first.errors
+        assert first.data == second.data == {"users": [{"name": "user1"}, {"name": "user2"}]}
+        assert query_watcher.executed_queries == ["SELECT users.name FROM users"]
+        assert len(cache) == 1
+
+    def test_invalidation_is_shared(self, create_schema, executor, query_watcher):
+        first_schema, first_cache = create_schema()
+        second_schema, second_cache = create_schema()
+        executor(first_schema, "query { users { name } }")
+        second_cache.invalidate(UserDB.__table__)
+        executor(first_schema, "query { users { name } }")
+        executor(second_schema, "query { users { name } }")
+        assert len(query_watcher.executed_queries) == 2
+
+    def test_least_recently_used_entry_is_evicted(self, create_schema, executor, query_watcher):
+        # room for single entry only
+        schema, cache = create_schema(max_size=300)
+        executor(schema, "query { users { name } }")
+        executor(schema, "query { users { id } }")
+        executor(schema, "query { users { id } }")
+        executor(schema, "query { users { name } }")
+        assert len(cache) == 1
+        assert query_watcher.executed_queries == [
+            "SELECT users.name FROM users",
+            "SELECT users.id FROM users",
+            "SELECT users.name FROM users",
+        ]
+
+
+class TestResultCacheInvalidation:
+    @pytest.fixture()
+    def cache(self):
+        return ResultCache()
+
+    @pytest.fixture()
+    def schema(self, cache):
+        user_node = QueryableNode("User", query=select(UserDB), cache_ttl=60)
+        return SchemaBuilder(result_cache=cache).add_root_list("users", user_node).build()
+
+    @pytest.fixture()
+    def tracked_session_factory(self, database_engine, cache):
+        session_factory = sessionmaker(bind=database_engine)
+        cache.track_session(session_factory)
+        return session_factory
+
+    @classmethod
+    def _execute(cls, schema, session):
+        result = graphql_sync(
+            schema,
+            "query { users { name } }",
+            context_value=TypedResolveContext(db_session=session),
+        )
+        assert not result.errors
+        return result.data
+
+    def test_flush_invalidates_cache(self, schema, tracked_session_factory, query_watcher):
+        with tracked_session_factory() as session:
+            assert self._execute(schema, session) == {
+                "users": [{"name": "user1"}, {"name": "user2"}]
+            }
+
+        with tracked_session_factory() as session:
+            user = session.get(UserDB, 1)
+            user.name = "renamed"
+            session.flush()
+            # session sees its own modifications
+            assert self._execute(schema, session) == {
+                "users": [{"name": "renamed"}, {"name": "user2"}]
+            }
+            assert self._execute(schema, session) == {
+                "users": [{"name": "renamed"}, {"name": "user2"}]
+            }
+            session.rollback()
+
+        with tracked_session_factory() as session:
+            # uncommitted data was not cached
+            assert self._execute(schema, session) == {
+                "users": [{"name": "user1"}, {"name": "user2"}]
+            }
+            assert self._execute(schema, session) == {
+                "users": [{"name": "user1"}, {"name": "user2"}]
+            }
+
+        assert query_watcher.executed_queries.count("SELECT users.name FROM users") == 4
+
+    def test_commit_invalidates_cache(self, schema, tracked_session_factory, cache):
+        with tracked_session_factory() as session:
+            self._execute(schema, session)
+            assert len(cache) == 1
+
+            user = session.get(UserDB, 2)
+            user.name = "renamed"
+            session.commit()
+            assert len(cache) == 0
+
+            assert self._execute(schema, session) == {
+                "users": [{"name": "user1"}, {"name": "renamed"}]
+            }
+
+            user.name = "user2"
+            session.commit()
+            assert self._execute(schema, session) == {
+                "users": [{"name": "user1"}, {"name": "user2"}]
+            }
+
+    def test_results_are_not_shared_by_databases(self, schema, session_factory, cache, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path.joinpath('other.db')}")
+        Base.metadata.create_all(bind=engine)
+        with Session(engine) as session:
+            session.add(UserDB(name="other", registration_date=datetime.date(2000, 1, 1)))
+            session.commit()
+
+        with session_factory() as session:
+            assert self._execute(schema, session) == {
+                "users": [{"name": "user1"}, {"name": "user2"}]
+            }
+        with Session(engine) as session:
+            assert self._execute(schema, session) == {"users": [{"name": "other"}]}
+        assert len(cache) == 2
+
+    def test_dml_invalidates_cache(self, schema, database_engine, cache):
+        engine = create_engine(database_engine.url)
+        cache.track_engine(engine)
+        with Session(engine) as session:
+            self._execute(schema, session)
+            assert len(cache) == 1
+
+            session.execute(update(UserDB).where(UserDB.id == 2).values(name="user2"))
+            assert len(cache) == 0
+            self._execute(schema, session)
+            assert len(cache) == 0
+            session.commit()
+
+            self._execute(schema, session)
+            assert len(cache) == 1
+        engine.dispose()
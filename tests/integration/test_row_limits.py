@@ -0,0 +1,158 @@
+import pytest
+from graphql import print_schema
+from sqlalchemy import select
+
+from sqlgraphql.model import Link, QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestRootListLimits:
+    @pytest.fixture()
+    def schema(self):
+        post_node = QueryableNode("Post", query=select(PostDB).order_by(PostDB.header))
+        return (
+            SchemaBuilder(max_rows=30)
+            .add_root_list("posts", post_node, default_limit=10)
+            .add_root_list("pagedPosts", post_node, pageable=True)
+            .build()
+        )
+
+    def test_gql_schema_is_as_expected(self, schema):
+        assert print_schema(schema) == (
+            "type Query {\n"
+            "  posts(limit: Int): [Post]\n"
+            "  pagedPosts(page: Int, pageSize: Int): PostPagedObject!\n"
+            "}\n"
+            "\n"
+            "type Post {\n"
+            "  id: ID!\n"
+            "  userId: Int!\n"
+            "  header: String!\n"
+            "  body: String!\n"
+            "}\n"
+            "\n"
+            "type PostPagedObject {\n"
+            "  nodes: [Post!]!\n"
+            "  pageInfo: OffsetPageInfo!\n"
+            "}\n"
+            "\n"
+            "type OffsetPageInfo {\n"
+            "  page: Int!\n"
+            "  pageSize: Int!\n"
+            "  totalCount: Int!\n"
+            "  totalPages: Int!\n"
+            "}"
+        )
+
+    def test_default_limit_truncates_result(self, schema, executor, query_watcher):
+        result = executor(schema, "query { posts { header } }")
+        assert not result.errors
+        assert result.data == {"posts": [{"header": f"Post {i:03}"} for i in range(1, 11)]}
+        assert result.extensions == {"truncated": [{"path": ["posts"], "limit": 10}]}
+        assert query_watcher.executed_queries_with_args == [
+            ("SELECT posts.header FROM posts ORDER BY posts.header LIMIT ? OFFSET ?", (11, 0))
+        ]
+
+    def test_truncation_is_not_reported_by_other_executions(self, schema, executor):
+        context = {}
+        executor(schema, "query { posts { header } }", context=context)
+        result = executor(
+            schema, "query { pagedPosts(pageSize: 2) { nodes { header } } }", context=context
+        )
+        assert not result.errors
+        assert result.extensions is None
+
+    def test_explicit_limit(self, schema, executor, query_watcher):
+        result = executor(
+            schema, "query { posts(limit: 30) { header } latest: posts(limit: 2) { id } }"
+        )
+        assert not result.errors
+        assert len(result.data["posts"]) == 30
+        assert result.extensions == {
+            "truncated": [{"path": ["posts"], "limit": 30}, {"path": ["latest"], "limit": 2}]
+        }
+
+    def test_limit_above_max_rows_is_rejected(self, schema, executor, query_watcher):
+        result = executor(schema, "query { posts(limit: 31) { header } }")
+        assert result.data == {"posts": None}
+        assert [error.message for error in result.errors] == [
+            "Requested 31 rows, but at most 30 rows are allowed"
+        ]
+        assert query_watcher.executed_queries == []
+
+    def test_page_size_above_max_rows_is_rejected(self, schema, executor, query_watcher):
+        result = executor(schema, "query { pagedPosts(pageSize: 31) { nodes { header } } }")
+        assert result.data is None
+        assert [error.message for error in result.errors] == [
+            "Requested 31 rows, but at most 30 rows are allowed"
+        ]
+        assert query_watcher.executed_queries == []
+
+    def test_default_page_size_is_capped(self, schema, executor, query_watcher):
+        result = executor(schema, "query { pagedPosts { pageInfo { pageSize } } }")
+        assert not result.errors
+        assert result.data == {"pagedPosts": {"pageInfo": {"pageSize": 30}}}
+
+
+class TestLinkLimits:
+    @pytest.fixture()
+    def schema(self):
+        post_node = QueryableNode("Post", query=select(PostDB).order_by(PostDB.header))
+        user_node = QueryableNode(
+            "User", query=select(UserDB), extra={"posts": Link(post_node, max_rows=3)}
+        )
+        return SchemaBuilder().add_root_list("users", user_node).build()
+
+    def test_gql_schema_is_as_expected(self, schema):
+        assert print_schema(schema) == (
+            "type Query {\n"
+            "  users: [User]\n"
+            "}\n"
+            "\n"
+            "type User {\n"
+            "  id: Int!\n"
+            "  name: String!\n"
+            "  registrationDate: Date!\n"
+            "  posts(limit: Int): [Post!]\n"
+            "}\n"
+            "\n"
+            '"""Date scalar type represents date in ISO format (YYYY-MM-DD)."""\n'
+            "scalar Date\n"
+            "\n"
+            "type Post {\n"
+            "  id: ID!\n"
+            "  userId: Int!\n"
+            "  header: String!\n"
+            "  body: String!\n"
+            "}"
+        )
+
+    def test_link_is_limited(self, schema, executor, query_watcher):
+        result = executor(schema, "query { users { name posts { header } } }")
+        assert not result.errors
+        assert result.data == {
+            "users": [
+                {"name": "user1", "posts": [{"header": f"Post {i:03}"} for i in range(1, 4)]},
+                {"name": "user2", "posts": [{"header": f"Post {i:03}"} for i in range(76, 79)]},
+            ]
+        }
+        assert result.extensions == {
+            "truncated": [
+                {"path": ["users", 0, "posts"], "limit": 3},
+                {"path": ["users", 1, "posts"], "limit": 3},
+            ]
+        }
+        assert query_watcher.executed_queries_with_args == [
+            ("SELECT users.name, users.id AS __id FROM users", ()),
+            (
+                "SELECT posts.header FROM posts WHERE posts.user_id = ? "
+                "ORDER BY posts.header LIMIT ? OFFSET ?",
+                (1, 4, 0),
+            ),
+            (
+                "SELECT posts.header FROM posts WHERE posts.user_id = ? "
+                "ORDER BY posts.header LIMIT ? OFFSET ?",
+                (2, 4, 0),
+            ),
+        ]
@@ -0,0 +1,155 @@
+import pytest
+from graphql import print_schema
+from sqlalchemy import select
+
+from sqlgraphql.exceptions import GQLBuilderException
+from sqlgraphql.model import QueryableNode
+from sqlgraphql.schema import SchemaBuilder
+from tests.integration.conftest import PostDB, UserDB
+
+
+class TestSingleSelection:
+    @pytest.fixture()
+    def schema(self):
+        user_node = QueryableNode("User", query=select(UserDB))
+        post_node = QueryableNode("Post", query=select(PostDB), extra={"user": user_node})
+        return (
+            SchemaBuilder()
+            .add_root_single("user", user_node)
+            .add_root_single("post", post_node)
+            .build()
+        )
+
+    def test_gql_schema_is_as_expected(self, schema):
+        assert print_schema(schema) == (
+            "type Query {\n"
+            "  user(id: Int!): User\n"
+            "  post(id: ID!): Post\n"
+            "}\n"
+            "\n"
+            "type User {\n"
+            "  id: Int!\n"
+            "  name: String!\n"
+            "  registrationDate: Date!\n"
+            "}\n"
+            "\n"
+            '"""Date scalar type represents date in ISO format (YYYY-MM-DD)."""\n'
+            "scalar Date\n"
+            "\n"
+            "type Post {\n"
+            "  id: ID!\n"
+            "  userId: Int!\n"
+            "  header: String!\n"
+            "  body: String!\n"
+            "  user: User!\n"
+            "}"
+        )
+
+    def test_select_single(self, schema, executor, query_watcher):
+        result = executor(schema, "query { user(id: 2) { id name } }")
+        assert not result.errors
+        assert result.data == {"user": {"id": 2, "name": "user2"}}
+        assert query_watcher.executed_queries_with_args == [
+            (
+                "SELECT users.id, users.name FROM users WHERE users.id = ? LIMIT ? OFFSET ?",
+                (2, 1, 0),
+            )
+        ]
+
+    def test_missing_record(self, schema, executor):
+        result = executor(schema, "query { user(id: 3) { id name } }")
+        assert not result.errors
+        assert result.data == {"user": None}
+
+    def test_aliased_lookups_are_coalesced(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            """
+            query ($id: Int!) {
+                a: user(id: 1) { name }
+                b: user(id: $id) { name }
+                c: user(id: 3) { name }
+                d: user(id: 1) { id }
+            }
+            """,
+            {"id": 2},
+        )
+        assert not result.errors
+        assert result.data == {
+            "a": {"name": "user1"},
+            "b": {"name": "user2"},
+            "c": None,
+            "d": {"id": 1},
+        }
+        assert query_watcher.executed_queries_with_args == [
+            (
+                "SELECT users.name, users.id AS __lookup_0 FROM users WHERE users.id IN (?, ?, ?)",
+                (1, 2, 3),
+            ),
+            ("SELECT users.id FROM users WHERE users.id = ? LIMIT ? OFFSET ?", (1, 1, 0)),
+        ]
+
+    def test_merged_lookups(self, schema, executor, query_watcher):
+        result = executor(schema, "query { user(id: 1) { name } user(id: 1) { id } }")
+        assert not result.errors
+        assert result.data == {"user": {"name": "user1", "id": 1}}
+        assert query_watcher.executed_queries_with_args == [
+            (
+                "SELECT users.name, users.id FROM users WHERE users.id = ? LIMIT ? OFFSET ?",
+                (1, 1, 0),
+            )
+        ]
+
+    def test_merged_lookup_is_coalesced_with_aliased_ones(self, schema, executor, query_watcher):
+        result = executor(
+            schema,
+            """
+            query {
+                a: user(id: 1) { name }
+                b: user(id: 2) { name }
+                a: user(id: 1) { id }
+                c: user(id: 2) { name }
+                c: user(id: 2) { id }
+            }
+            """,
+        )
+        assert not result.errors
+        assert result.data == {
+            "a": {"name": "user1", "id": 1},
+            "b": {"name": "user2"},
+            "c": {"name": "user2", "id": 2},
+        }
+        assert query_watcher.executed_queries_with_args == [
+            (
+                "SELECT users.name, users.id, users.id AS __lookup_0 FROM users "
+                "WHERE users.id IN (?, ?)",
+                (1, 2),
+            ),
+            ("SELECT users.name FROM users WHERE users.id = ? LIMIT ? OFFSET ?", (2, 1, 0)),
+        ]
+
+    def test_lookups_are_not_shared_by_executions(self, schema, executor):
+        context = {}
+        executor(schema, "query { user(id: 1) { name } }", context=context)
+        result = executor(schema, "query { user(id: 2) { name } }", context=context)
+        assert not result.errors
+        assert result.data == {"user": {"name": "user2"}}
+
+    def test_select_by_uuid(self, schema, executor, session_factory):
+        with session_factory() as session:
+            post_id = session.scalars(select(PostDB.id).where(PostDB.header == "Post 001")).one()
+
+        result = executor(
+            schema,
+            "query ($id: ID!) { post(id: $id) { header user { name } } }",
+            {"id": str(post_id)},
+        )
+        assert not result.errors
+        assert result.data == {"post": {"header": "Post 001", "user": {"name": "user1"}}}
+
+    def test_primary_key_has_to_be_selected(self):
+        user_node = QueryableNode("User", query=select(UserDB.name))
+        with pytest.raises(GQLBuilderException) as exc_info:
+            SchemaBuilder().add_root_single("user", user_node)
+
+        assert str(exc_info.value) == "Primary key column 'id' is not selected by node 'User'."